@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.algo.points_lists import ScheffeNetwork, SimplexCentroid, TypeIIIPlan, lattice_size
+from conftest import check_design
+
+HEXAGON = [(70, 20, 10), (40, 10, 50), (10, 40, 50), (10, 60, 30), (30, 60, 10), (70, 20, 10)][:-1]
+LOWER, UPPER = (0.1, 0.1, 0.05), (0.7, 0.6, 0.5)
+
+
+@pytest.mark.benchmark(group="design:ScheffeNetwork")
+@pytest.mark.parametrize("k, m", [(3, 2), (3, 10), (3, 30), (5, 6), (8, 6), (8, 10)])
+def bench_scheffe_network(benchmark, k, m):
+    points = benchmark(ScheffeNetwork().__getitem__, (k, m))
+    check_design(points, k, n_points=lattice_size(k, m))
+    benchmark.extra_info["n_points"] = len(points)
+
+
+@pytest.mark.benchmark(group="design:SimplexCentroid")
+@pytest.mark.parametrize("k, m", [(3, 2), (5, 4), (8, 7), (12, 11)])
+def bench_simplex_centroid(benchmark, k, m):
+    points = benchmark(SimplexCentroid().__getitem__, (k, m))
+    check_design(points, k)
+    benchmark.extra_info["n_points"] = len(points)
+
+
+@pytest.mark.benchmark(group="design:fedorov_exchange")
+@pytest.mark.parametrize("criterion", ["D", "I", "A"])
+@pytest.mark.parametrize("m", [5, 10, 20])
+def bench_fedorov_exchange(benchmark, m, criterion):
+    plan = TypeIIIPlan(HEXAGON, criterion=criterion)
+    candidates = [tuple(p) for p in ScheffeNetwork()[3, m]]
+    benchmark.extra_info["n_candidates"] = len(candidates)
+
+    def run():
+        return plan.fedorov_exchange(candidates, n_points=10, seed=0)
+
+    selected = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert len(set(map(int, selected))) == 10 and all(0 <= i < len(candidates) for i in selected)
+
+
+@pytest.mark.benchmark(group="design:ScheffeNetwork:chunks")
+@pytest.mark.parametrize("k, m", [(8, 10), (8, 20)])
+def bench_scheffe_network_chunks(benchmark, k, m):
+    """Parcours complet du réseau par blocs, sans le matérialiser."""
+    def run():
+        return sum(len(chunk) for chunk in ScheffeNetwork().iter_chunks((k, m)))
+
+    benchmark.extra_info["n_points"] = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert benchmark.extra_info["n_points"] == lattice_size(k, m)
+
+
+@pytest.mark.benchmark(group="design:cache")
+@pytest.mark.parametrize("source", ["memory", "disk"])
+def bench_design_cache_hit(benchmark, tmp_path, source):
+    """Relecture d'un plan Type III depuis le cache (LRU mémoire ou fichier .npz)."""
+    from src.algo.design_cache import DesignCache
+    cache = DesignCache(directory=str(tmp_path))
+    plan = TypeIIIPlan(HEXAGON)
+    key = cache.key("Type III", 3, bounds=(LOWER, UPPER), n_points=10, seed=0, degree=plan.degree)
+    cache.get(key, lambda: plan[3, 10], persist=True)
+
+    def run():
+        if source == "disk":
+            cache.clear()
+        return cache.get(key, lambda: plan[3, 10], persist=True)
+
+    check_design(benchmark(run), 3, n_points=10, lower=LOWER, upper=UPPER)
+
+
+@pytest.mark.benchmark(group="design:coordinate_exchange")
+@pytest.mark.parametrize("criterion", ["D", "I"])
+@pytest.mark.parametrize("k, degree", [(3, 1), (3, 2), (5, 2)])
+def bench_coordinate_exchange(benchmark, k, degree, criterion):
+    from src.algo.points_lists import ContinuousOptimalPlan
+    lower = np.full(k, 0.05)
+    upper = np.full(k, 0.6)
+    plan = ContinuousOptimalPlan(lower, upper, criterion=criterion, degree=degree)
+    design = benchmark.pedantic(plan.__getitem__, args=((k, 0),), rounds=3, iterations=1)
+    check_design(design, k, lower=lower, upper=upper)
+    benchmark.extra_info["n_points"] = len(design)
@@ -0,0 +1,201 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.algo.interpolator import LinearInterpolator, QuadraticInterpolator, RBFInterpolator
+from src.algo.points_lists import ScheffeNetwork, SimplexCentroidGrowth
+from conftest import check_design, check_fit, check_values, random_mixtures, smooth_response
+
+# (classe, nombre de points) : Linear et Quadratic ont un nombre de points imposé
+FITS = [
+    (LinearInterpolator, 3),
+    (QuadraticInterpolator, 7),
+    (RBFInterpolator, 10),
+    (RBFInterpolator, 50),
+    (RBFInterpolator, 200),
+]
+
+
+def training_set(cls, n):
+    if cls is QuadraticInterpolator:
+        points = np.array(SimplexCentroidGrowth()[3, 0], dtype=float)
+    elif cls is LinearInterpolator:
+        points = np.eye(3)
+    else:
+        points = random_mixtures(n)
+    return points, smooth_response(points)
+
+
+@pytest.mark.benchmark(group="interpolator:fit")
+@pytest.mark.parametrize("cls, n", FITS, ids=lambda v: getattr(v, "__name__", v))
+def bench_fit(benchmark, cls, n):
+    points, scores = training_set(cls, n)
+    check_fit(benchmark(cls, points, scores), points, scores)
+
+
+@pytest.mark.benchmark(group="interpolator:grid")
+@pytest.mark.parametrize("resolution", [20, 50, 100])
+@pytest.mark.parametrize("cls, n", FITS, ids=lambda v: getattr(v, "__name__", v))
+def bench_grid_evaluation(benchmark, cls, n, resolution):
+    points, scores = training_set(cls, n)
+    interpolator = cls(points, scores)
+    grid = np.array(ScheffeNetwork()[3, resolution], dtype=float)
+    benchmark.extra_info["n_cells"] = len(grid)
+
+    def run():
+        return [interpolator(p) for p in grid]
+
+    check_values(benchmark.pedantic(run, rounds=3, iterations=1), len(grid))
+
+
+@pytest.mark.benchmark(group="interpolator:predict")
+@pytest.mark.parametrize("resolution", [20, 50, 100])
+@pytest.mark.parametrize("cls, n", FITS, ids=lambda v: getattr(v, "__name__", v))
+def bench_grid_predict(benchmark, cls, n, resolution):
+    """Même grille que bench_grid_evaluation, évaluée en un seul appel vectorisé."""
+    points, scores = training_set(cls, n)
+    interpolator = cls(points, scores)
+    grid = np.array(ScheffeNetwork()[3, resolution], dtype=float)
+    benchmark.extra_info["n_cells"] = len(grid)
+    check_values(benchmark.pedantic(interpolator.predict, args=(grid,), rounds=3, iterations=1), len(grid))
+
+
+@pytest.mark.benchmark(group="interpolator:predict_chunked")
+@pytest.mark.parametrize("workers", [1, None], ids=["1 thread", "tous les coeurs"])
+def bench_grid_predict_chunked(benchmark, workers):
+    """Grille fine (200 000 points) évaluée par blocs de 4 Mo, sur un ou plusieurs threads."""
+    points, scores = training_set(RBFInterpolator, 200)
+    interpolator = RBFInterpolator(points, scores)
+    grid = random_mixtures(200000, seed=1)
+    values = benchmark.pedantic(
+        interpolator.predict_chunked, args=(grid,), kwargs={"chunk_bytes": 4 * 2 ** 20, "max_workers": workers},
+        rounds=3, iterations=1,
+    )
+    check_values(values, len(grid))
+    assert np.allclose(values[:1000], interpolator.predict(grid[:1000]))
+
+
+@pytest.mark.benchmark(group="interpolator:refine_mesh")
+@pytest.mark.parametrize("max_depth", [0, 2, 3])
+def bench_refine_mesh(benchmark, max_depth):
+    """Maillage adaptatif de la heatmap (max_depth=0 : maillage uniforme initial)."""
+    from src.algo.refinement import refine_mesh
+    points, scores = training_set(RBFInterpolator, 50)
+    interpolator = RBFInterpolator(points, scores)
+    mesh = benchmark.pedantic(refine_mesh, args=(interpolator.predict,), kwargs={"max_depth": max_depth},
+                              rounds=3, iterations=1)
+    benchmark.extra_info["n_evaluations"] = mesh.n_evaluations
+    check_values(mesh.values, len(mesh.values))
+    assert mesh.n_evaluations >= len(mesh.values) > 0
+
+
+@pytest.mark.benchmark(group="surface:analysis")
+@pytest.mark.parametrize("n_levels", [5, 20])
+def bench_iso_lines(benchmark, n_levels):
+    """Isolignes (marching triangles vectorisé) sur un maillage déjà évalué."""
+    from src.algo.refinement import refine_mesh
+    from src.algo.surface import iso_lines
+    points, scores = training_set(RBFInterpolator, 50)
+    mesh = refine_mesh(RBFInterpolator(points, scores).predict)
+    xy = mesh.cartesian(100)
+    segments, _ = benchmark(iso_lines, xy, mesh.triangles, mesh.values, n_levels)
+    benchmark.extra_info["n_segments"] = len(segments)
+    assert len(segments) > 0 and np.isfinite(segments).all()
+
+
+@pytest.mark.benchmark(group="surface:analysis")
+def bench_find_optimum(benchmark):
+    """Optimum contraint multi-départs d'un modèle RBF."""
+    from src.algo.surface import find_optimum
+    points, scores = training_set(RBFInterpolator, 50)
+    interpolator = RBFInterpolator(points, scores)
+    lower, upper = np.array([0.1, 0.1, 0.05]), np.array([0.7, 0.6, 0.5])
+    composition, value = benchmark.pedantic(find_optimum, args=(interpolator.predict, lower, upper), kwargs={"seed": 0},
+                                            rounds=3, iterations=1)
+    check_design(composition[None], 3, lower=lower, upper=upper)
+    # Pas moins bon que le meilleur point mesuré du domaine
+    inside = np.all((points >= lower) & (points <= upper), axis=1)
+    assert value >= interpolator.predict(points[inside]).max() - 1e-6
+
+
+@pytest.mark.benchmark(group="interpolator:multi_response")
+@pytest.mark.parametrize("n_responses", [1, 5, 20])
+def bench_fit_multi_response(benchmark, n_responses):
+    """Ajustement RBF de plusieurs réponses : une seule résolution avec un second membre (N, M)."""
+    points, scores = training_set(RBFInterpolator, 200)
+    responses = scores[:, None] * np.linspace(1.0, 2.0, n_responses)
+    check_fit(benchmark(RBFInterpolator, points, responses), points, responses)
+
+
+@pytest.mark.benchmark(group="interpolator:multi_response")
+def bench_desirability_grid(benchmark):
+    """Désirabilité globale de 5 réponses, prédictions et désirabilité sur une grille de 5 151 points."""
+    from src.algo.desirability import Desirability
+    from src.algo.simplex import lattice_counts
+    points, scores = training_set(RBFInterpolator, 50)
+    responses = scores[:, None] * np.linspace(1.0, 2.0, 5)
+    interpolator = RBFInterpolator(points, responses)
+    desirability = Desirability.from_data(responses, goals=["max", "min", "target", "max", "min"])
+    grid = lattice_counts(3, 100) / 100
+    values = check_values(benchmark(lambda: desirability(interpolator.predict(grid))), len(grid))
+    assert ((values >= 0) & (values <= 1)).all()
+
+
+@pytest.mark.benchmark(group="surface:export")
+@pytest.mark.parametrize("extension", [".csv", ".npz"])
+def bench_export_grid(benchmark, tmp_path, extension):
+    """Export par blocs d'une grille de 45 451 points (compositions et réponse RBF prédite)."""
+    from src.algo.grid_export import export_table, lattice_blocks
+    from src.algo.simplex import lattice_size
+    points, scores = training_set(RBFInterpolator, 50)
+    interpolator = RBFInterpolator(points, scores)
+    level = 300
+
+    def blocks():
+        for block in lattice_blocks(level, block_size=16384):
+            yield np.column_stack((block, interpolator.predict(block)))
+
+    path = str(tmp_path / f"grid{extension}")
+    n_rows = benchmark.pedantic(lambda: export_table(path, ["a", "b", "c", "score"], blocks(), n_rows=lattice_size(3, level)),
+                                rounds=3, iterations=1)
+    assert n_rows == lattice_size(3, level) and os.path.getsize(path) > 0
+
+
+@pytest.mark.benchmark(group="surface:grid_store")
+@pytest.mark.parametrize("reuse", [False, True], ids=["evaluation", "relecture"])
+def bench_grid_store(benchmark, tmp_path, reuse):
+    """Grille de 500 000 points conservée sur disque : première évaluation, puis relecture sans réévaluer."""
+    from src.algo.grid_export import lattice_blocks
+    from src.algo.grid_store import GridStore
+    from src.algo.simplex import lattice_size
+    points, scores = training_set(RBFInterpolator, 50)
+    interpolator = RBFInterpolator(points, scores)
+    level = 1000
+
+    def blocks():
+        for block in lattice_blocks(level):
+            yield np.column_stack((block, interpolator.predict(block)))
+
+    def run():
+        key = "grid" if reuse else f"grid-{len(list(tmp_path.iterdir()))}"
+        store = GridStore.cached(key, ["a", "b", "c", "score"], lattice_size(3, level), blocks,
+                                 directory=str(tmp_path), max_stores=100)
+        return sum(float(np.nansum(block[:, 3])) for block in store.blocks())
+
+    if reuse:
+        run()
+    total = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert np.isfinite(total) and total != 0
+
+
+@pytest.mark.benchmark(group="interpolator:replicates")
+@pytest.mark.parametrize("replicates", [1, 5, 20])
+def bench_fit_replicates(benchmark, replicates):
+    """Ajustement RBF sur 50 compositions mesurées `replicates` fois : le coût suit le nombre de compositions."""
+    points = np.repeat(random_mixtures(50), replicates, axis=0)
+    rng = np.random.default_rng(0)
+    scores = smooth_response(points) + rng.normal(0, 0.01, len(points))
+    benchmark.extra_info["n_observations"] = len(points)
+    model = check_fit(benchmark(RBFInterpolator, points, scores), points, scores)
+    assert len(model.groups) == 50 and (model.groups.counts == replicates).all()
@@ -0,0 +1,13 @@
+import pytest
+
+import import_time
+
+
+@pytest.mark.benchmark(group="startup")
+def bench_startup_import(benchmark):
+    """Temps d'import du module de démarrage dans un interpréteur neuf."""
+    modules = benchmark.pedantic(import_time.measure, kwargs={"repeat": 1}, rounds=3, iterations=1)
+    report = import_time.build_report(modules)
+    benchmark.extra_info["import_ms"] = report["total_ms"]
+    benchmark.extra_info["footprint_mb"] = report["footprint_mb"]
+    assert report["lazy_modules_loaded"] == []
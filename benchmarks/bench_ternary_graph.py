@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from src.algo.interpolator import RBFInterpolator
+from conftest import check_values, random_mixtures, smooth_response
+
+
+@pytest.mark.benchmark(group="graph:draw_constraints_overlay")
+def bench_draw_constraints_overlay(benchmark, graph, parameters):
+    graph.parameters = parameters
+    graph.initialize_graph()
+    benchmark(graph.draw_constraints_overlay)
+    from src.algo.constraints import feasible_vertices
+    lower, upper = (np.asarray(bounds, dtype=float) / 100 for bounds in graph.slice_bounds())
+    assert len(feasible_vertices(lower, upper)) == 6  # Le polygone mesuré est bien l'hexagone attendu
+
+
+@pytest.mark.benchmark(group="graph:update_graph")
+@pytest.mark.parametrize("n", [10, 100, 500])
+def bench_update_graph(benchmark, graph, parameters, n):
+    graph.parameters = parameters
+    graph.points = [tuple(p) for p in random_mixtures(n)]
+    graph.scores = list(smooth_response(graph.points))
+    benchmark.pedantic(graph.update_graph, rounds=3, iterations=1)
+    assert len(graph.point_tree().data) == n
+
+
+@pytest.mark.benchmark(group="graph:interpolate")
+@pytest.mark.parametrize("n", [10, 50])
+def bench_interpolate(benchmark, graph, parameters, n):
+    graph.parameters = parameters
+    graph.points = [tuple(p) for p in random_mixtures(n)]
+    graph.scores = list(smooth_response(graph.points))
+    values = benchmark.pedantic(graph.interpolate, args=(RBFInterpolator,), rounds=3, iterations=1)
+    assert values is not None and graph.mesh is not None
+    assert np.all(np.atleast_1d(graph.R2_score) > 0.9)
+
+
+@pytest.mark.benchmark(group="graph:pick")
+@pytest.mark.parametrize("n", [100, 10000])
+def bench_find_closest_point(benchmark, graph, n):
+    """Sélection d'un point au clic (arbre k-d déjà construit)."""
+    graph.points = [tuple(p) for p in random_mixtures(n)]
+    expected = graph.find_closest_point_index(50.0, 30.0)
+    index = benchmark(graph.find_closest_point_index, 50.0, 30.0)
+    assert index == expected and (index is None or 0 <= index < n)
+
+
+@pytest.mark.benchmark(group="graph:hover")
+def bench_hover(benchmark, graph, parameters):
+    """Lecture au survol : valeur interpolée sur le maillage déjà évalué, sans appel au modèle."""
+    graph.parameters = parameters
+    graph.points = [tuple(p) for p in random_mixtures(50)]
+    graph.scores = list(smooth_response(graph.points))
+    graph.interpolate(RBFInterpolator)
+    graph.show_hover(50.0, 30.0)
+    benchmark(graph.show_hover, 50.0, 30.0)
+    assert "Score : " in graph.hover_label.text()  # Valeur de la surface lue sur le maillage
+
+
+@pytest.mark.benchmark(group="graph:point_labels")
+@pytest.mark.parametrize("n", [500, 5000])
+def bench_draw_point_labels(benchmark, graph, n):
+    """Numéros de points après un zoom : seuls les numéros visibles et assez espacés sont dessinés."""
+    graph.points = [tuple(p) for p in random_mixtures(n)]
+    graph.scores = [(0.0,)] * n
+    graph.update_graph()
+    benchmark(graph.draw_point_labels)
+    assert 0 < len(graph._labels) == len(graph.visible_label_indices()) <= n
+
+
+@pytest.mark.benchmark(group="io:watch")
+@pytest.mark.parametrize("appended", [True, False], ids=["lignes ajoutées", "fichier relu"])
+def bench_watch_poll(benchmark, tmp_path, appended):
+    """Fichier de mesures de 100 000 lignes surveillé : lecture des 10 lignes ajoutées, ou relecture complète."""
+    from src.algo.watch import CsvTail, parse_measurements
+    path = tmp_path / "mesures.csv"
+    rows = (100 * random_mixtures(100000)).round(2)
+    with open(path, "w") as file:
+        file.write("A,B,C,Score\n")
+        file.writelines(f"{a},{b},{c},1.0\n" for a, b, c in rows)
+    tail = CsvTail(str(path))
+    tail.read()
+
+    def run():
+        if appended:
+            with open(path, "a") as file:
+                file.writelines(f"{a},{b},{c},2.0\n" for a, b, c in rows[:10])
+        else:
+            tail.reset()
+        new_rows = tail.read()
+        return parse_measurements(tail.header, new_rows, 3, ["Score"])
+
+    compositions, responses, skipped = benchmark.pedantic(run, rounds=5, iterations=1)
+    assert skipped == 0 and len(compositions) == len(responses) == (10 if appended else len(rows))
+    check_values(responses[:, 0], len(responses))
+
+
+@pytest.mark.benchmark(group="graph:undo")
+@pytest.mark.parametrize("cached", [True, False], ids=["ajustement en cache", "réajustement"])
+def bench_undo(benchmark, graph, parameters, cached):
+    """Retour à l'état précédant une suppression : modèle et maillage repris du cache, ou réajustés."""
+    graph.parameters = parameters
+    graph.points = [tuple(p) for p in random_mixtures(50)]
+    graph.scores = [(score,) for score in smooth_response(graph.points)]
+    graph.interpolate(RBFInterpolator)
+    before = graph.snapshot("Suppression du point 1")
+    graph.delete_point(0)
+
+    def run():
+        if not cached:
+            graph.fits.clear()
+        if graph.restore(before):
+            return
+        graph.interpolate(RBFInterpolator)
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
+    assert len(graph.points) == 50 and graph.model is not None and len(graph.model.points) == 50
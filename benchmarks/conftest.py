@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Rendu hors écran : aucun affichage n'est nécessaire pour les benchmarks
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def parameters():
+    """Paramètres de contraintes produisant un polygone à 6 sommets."""
+    return {
+        "component_1": {"min": 10.0, "max": 70.0, "name": "A"},
+        "component_2": {"min": 10.0, "max": 60.0, "name": "B"},
+        "component_3": {"min": 5.0, "max": 50.0, "name": "C"},
+        "total_mass": None,
+    }
+
+
+@pytest.fixture(params=["matplotlib", "pyqtgraph"])
+def graph(qapp, request):
+    """Graphe ternaire, pour chacun des moteurs de rendu."""
+    from src.interface.ui.main_window import ternary_graph_class
+    widget = ternary_graph_class(request.param)()
+    widget.resize(800, 800)
+    yield widget
+    widget.deleteLater()
+
+
+def random_mixtures(n, k=3, seed=0):
+    """Tire n mélanges uniformément dans le simplexe à k composants."""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(k), size=n)
+
+
+def smooth_response(points):
+    """Réponse régulière utilisée comme score synthétique."""
+    points = np.asarray(points)
+    return np.sin(3 * points[:, 0]) + points[:, 1] * points[:, 2] * 4
+
+
+# Vérifications rapides des résultats mesurés : un benchmark d'un plan vide ou d'un modèle
+# cassé doit échouer au lieu de mesurer un résultat faux.
+
+def check_design(points, k, n_points=None, lower=None, upper=None):
+    """Plan de forme (N, k), non vide, aux proportions finies de somme 1, dans les bornes éventuelles."""
+    points = np.asarray(points, dtype=float)
+    assert points.ndim == 2 and points.shape[1] == k and len(points) > 0, f"forme inattendue {points.shape}"
+    if n_points is not None:
+        assert len(points) == n_points, f"{len(points)} points au lieu de {n_points}"
+    assert np.isfinite(points).all()
+    assert np.allclose(points.sum(axis=1), 1.0)
+    lower = np.zeros(k) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.ones(k) if upper is None else np.asarray(upper, dtype=float)
+    assert (points >= lower - 1e-9).all() and (points <= upper + 1e-9).all(), "points hors des bornes"
+    return points
+
+
+def check_values(values, n, n_responses=None):
+    """Prédictions finies de forme (n,), ou (n, n_responses) pour des réponses en colonnes."""
+    values = np.asarray(values, dtype=float)
+    expected = (n,) if n_responses is None else (n, n_responses)
+    assert values.shape == expected, f"forme {values.shape} au lieu de {expected}"
+    assert np.isfinite(values).all()
+    return values
+
+
+def check_fit(model, points, scores, min_r2=0.9):
+    """Modèle ajusté qui reproduit ses points d'apprentissage (R² de chaque réponse au moins `min_r2`)."""
+    scores = np.asarray(scores, dtype=float)
+    check_values(model.predict(points), len(points), None if scores.ndim == 1 else scores.shape[1])
+    assert np.all(np.atleast_1d(model.R2_score()) >= min_r2), "ajustement dégradé"
+    return model
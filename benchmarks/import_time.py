@@ -0,0 +1,173 @@
+"""
+Rapport de temps d'import au démarrage (basé sur ``python -X importtime``).
+
+Usage :
+    python benchmarks/import_time.py                       # affiche le rapport
+    python benchmarks/import_time.py --output report.json  # enregistre le rapport
+    python benchmarks/import_time.py --compare base.json   # échoue en cas de régression
+
+Le rapport contient le temps cumulé d'import du module de démarrage, les modules
+les plus coûteux, la liste des modules lourds qui ne doivent pas être chargés
+au démarrage (ils sont importés à la première utilisation), l'empreinte disque
+des paquets chargés (approximation de la taille de l'exécutable PyInstaller) et
+le coût d'import des modules lourds évités.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module importé par main.py avant l'affichage de la fenêtre
+STARTUP_MODULE = "src.interface.ui.main_window"
+
+# Modules lourds qui doivent rester chargés à la demande
+LAZY_MODULES = [
+    "sklearn",
+    "scipy.interpolate",
+    "scipy.spatial",
+]
+
+
+def measure(module=STARTUP_MODULE, repeat=3):
+    """
+    Mesure le temps d'import d'un module dans un interpréteur neuf.
+
+    Retourne le meilleur des ``repeat`` essais (en microsecondes) ainsi que le
+    détail par module de cet essai.
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = parse_importtime(result.stderr)
+        if best is None or modules[module]["cumulative_us"] < best[module]["cumulative_us"]:
+            best = modules
+    return best
+
+
+def parse_importtime(output):
+    """Analyse la sortie de ``-X importtime`` en un dictionnaire {module: temps}."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        }
+    return modules
+
+
+def package_size(name):
+    """Taille sur disque (en octets) d'un paquet de premier niveau, 0 s'il est introuvable."""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return 0
+    if spec is None or spec.origin in (None, "built-in", "frozen"):
+        return 0
+    if not spec.submodule_search_locations:
+        return os.path.getsize(spec.origin)
+    size = 0
+    for location in spec.submodule_search_locations:
+        for dirpath, _, filenames in os.walk(location):
+            size += sum(os.path.getsize(os.path.join(dirpath, f)) for f in filenames)
+    return size
+
+
+def footprint(modules):
+    """Empreinte disque (en Mo) des paquets tiers de premier niveau chargés."""
+    stdlib = sys.stdlib_module_names
+    packages = {name.split(".")[0] for name in modules}
+    packages = {name for name in packages if name not in stdlib and not name.startswith("_") and name != "src"}
+    return {name: package_size(name) / 1e6 for name in sorted(packages)}
+
+
+def build_report(modules, module=STARTUP_MODULE, top=15):
+    """Construit le rapport JSON à partir des temps par module."""
+    slowest = sorted(modules.items(), key=lambda item: item[1]["self_us"], reverse=True)[:top]
+    packages = footprint(modules)
+    return {
+        "python": sys.version.split()[0],
+        "module": module,
+        "total_ms": modules[module]["cumulative_us"] / 1000,
+        "slowest_self_ms": {name: t["self_us"] / 1000 for name, t in slowest},
+        "lazy_modules_loaded": [name for name in LAZY_MODULES if name in modules],
+        "footprint_mb": sum(packages.values()),
+        "packages_mb": packages,
+    }
+
+
+def avoided_costs(repeat=1):
+    """Temps d'import (en ms) de chaque module lourd évité au démarrage, s'il est installé."""
+    costs = {}
+    for name in LAZY_MODULES:
+        if importlib.util.find_spec(name.split(".")[0]) is None:
+            continue
+        costs[name] = measure(name, repeat)[name]["cumulative_us"] / 1000
+    return costs
+
+
+def compare(report, baseline, tolerance=0.2):
+    """
+    Compare un rapport à une référence.
+
+    Retourne la liste des régressions : temps total dépassant la référence de plus
+    de ``tolerance`` (en proportion), empreinte disque en hausse de plus de
+    ``tolerance`` ou module lourd chargé au démarrage.
+    """
+    regressions = []
+    if report["total_ms"] > baseline["total_ms"] * (1 + tolerance):
+        regressions.append(
+            f"Temps d'import : {report['total_ms']:.1f} ms (référence {baseline['total_ms']:.1f} ms)"
+        )
+    if report["footprint_mb"] > baseline.get("footprint_mb", float("inf")) * (1 + tolerance):
+        regressions.append(
+            f"Empreinte disque : {report['footprint_mb']:.1f} Mo (référence {baseline['footprint_mb']:.1f} Mo)"
+        )
+    for name in report["lazy_modules_loaded"]:
+        regressions.append(f"Module chargé au démarrage : {name}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default=STARTUP_MODULE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Fichier JSON où enregistrer le rapport")
+    parser.add_argument("--compare", help="Rapport JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--avoided", action="store_true", help="Mesurer aussi le coût des modules lourds évités")
+    args = parser.parse_args()
+
+    report = build_report(measure(args.module, args.repeat), args.module)
+    if args.avoided:
+        report["avoided_import_ms"] = avoided_costs()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION : {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,61 @@
+import argparse
+import multiprocessing
+import os
 import sys
-from PyQt5.QtWidgets import QApplication
-from src.interface.ui.main_window import MainWindow
+from PyQt5.QtWidgets import QApplication, QSplashScreen
+from PyQt5.QtGui import QPixmap, QColor
+from PyQt5.QtCore import Qt
+
+
+def create_splash():
+    """Crée un écran de démarrage léger (sans image) affiché pendant le chargement."""
+    pixmap = QPixmap(420, 160)
+    pixmap.fill(QColor("#1e1e1e"))
+    splash = QSplashScreen(pixmap, Qt.WindowStaysOnTopHint)
+    splash.setFont(QApplication.font())
+    return splash
+
+
+def show_progress(app, splash, message):
+    """Affiche un message d'avancement sur l'écran de démarrage."""
+    splash.showMessage(f"MixPlan\n\n{message}", Qt.AlignCenter, QColor("white"))
+    app.processEvents()
+
+
+def parse_arguments(argv):
+    """Options de la ligne de commande (les options Qt restantes sont laissées à QApplication)."""
+    parser = argparse.ArgumentParser(description="MixPlan : plans de mélange et graphes ternaires")
+    parser.add_argument(
+        "--backend", choices=("matplotlib", "pyqtgraph"),
+        default=os.environ.get("MIXPLAN_BACKEND", "matplotlib"),
+        help="Moteur de rendu du graphe ternaire (défaut : matplotlib, ou la variable MIXPLAN_BACKEND)",
+    )
+    return parser.parse_known_args(argv[1:])
+
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    # `python main.py serve` : service JSON local, sans interface graphique
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from src.service import main as serve
+        return serve(sys.argv[2:])
+
+    arguments, qt_arguments = parse_arguments(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_arguments)
+    splash = create_splash()
+    splash.show()
+    show_progress(app, splash, "Chargement de l'interface...")
+
+    # Import différé : matplotlib et les composants ne sont chargés qu'une fois
+    # l'écran de démarrage affiché.
+    from src.interface.ui.main_window import MainWindow
+
+    show_progress(app, splash, "Initialisation de la fenêtre...")
+    window = MainWindow(backend=arguments.backend)
     window.show()
+    splash.finish(window)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Nécessaire pour le pool de processus du service dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,112 @@
+from itertools import product
+import numpy as np
+from src.algo.simplex import simplex_to_cartesian
+
+__all__ = [
+    "effective_bounds",
+    "is_feasible",
+    "feasible_vertices",
+    "polytope_edges",
+    "order_polygon",
+]
+
+
+def effective_bounds(lower, upper):
+    """
+    Tighten lower/upper bounds of a mixture region {sum(x) = 1, lower <= x <= upper}.
+
+    A component cannot exceed 1 minus the other lower bounds, and cannot go below
+    1 minus the other upper bounds.
+
+    Parameters:
+        lower, upper (array-like): (k,) bounds, as proportions
+
+    Returns:
+        Tuple[ndarray, ndarray]: tightened (lower, upper)
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    real_lower = np.maximum(lower, 1.0 - (upper.sum() - upper))
+    real_upper = np.minimum(upper, 1.0 - (lower.sum() - lower))
+    return real_lower, real_upper
+
+
+def is_feasible(points, lower, upper, tol=1e-9):
+    """
+    Vectorized membership test of mixtures in the constrained region.
+
+    Parameters:
+        points (array-like): (N, k) compositions
+
+    Returns:
+        ndarray: (N,) booleans
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    return np.all((points >= np.asarray(lower) - tol) & (points <= np.asarray(upper) + tol), axis=1)
+
+
+def feasible_vertices(lower, upper, tol=1e-9):
+    """
+    Vertices of the constrained mixture polytope (k-1 dimensional).
+
+    Each vertex has k-1 components at one of their bounds, the last one being given by
+    the mixture constraint. All k * 2^(k-1) such candidates are built at once and the
+    feasible ones are kept.
+
+    Parameters:
+        lower, upper (array-like): (k,) bounds, as proportions
+
+    Returns:
+        ndarray: (V, k) unique vertices, empty if the region is infeasible
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    k = len(lower)
+    choices = np.array(list(product((0, 1), repeat=k - 1)), dtype=bool)  # (2^(k-1), k-1)
+    candidates = []
+    for free in range(k):
+        others = [i for i in range(k) if i != free]
+        block = np.empty((len(choices), k))
+        block[:, others] = np.where(choices, upper[others], lower[others])
+        block[:, free] = 1.0 - block[:, others].sum(axis=1)
+        candidates.append(block)
+    candidates = np.concatenate(candidates)
+    vertices = candidates[is_feasible(candidates, lower, upper, tol)]
+    if len(vertices) == 0:
+        return np.empty((0, k))
+    _, unique = np.unique(np.round(vertices, 9), axis=0, return_index=True)
+    return vertices[np.sort(unique)]
+
+
+def polytope_edges(vertices, lower, upper, tol=1e-9):
+    """
+    Edges of the constrained polytope.
+
+    Two vertices are adjacent when they share at least k-2 active bounds.
+
+    Returns:
+        ndarray: (E, 2) vertex index pairs
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    k = vertices.shape[1]
+    active = np.concatenate([
+        np.isclose(vertices, lower, atol=tol),
+        np.isclose(vertices, upper, atol=tol),
+    ], axis=1).astype(int)
+    shared = active @ active.T
+    i, j = np.triu_indices(len(vertices), k=1)
+    keep = shared[i, j] >= k - 2
+    return np.column_stack((i[keep], j[keep]))
+
+
+def order_polygon(vertices):
+    """
+    Order the vertices of a 3-component (2D) region along its boundary.
+
+    Returns:
+        ndarray: vertices sorted by angle around their centroid
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    cartesian = simplex_to_cartesian(vertices)
+    centered = cartesian - cartesian.mean(axis=0)
+    return vertices[np.argsort(np.arctan2(centered[:, 1], centered[:, 0]))]
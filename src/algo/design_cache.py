@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+__all__ = [
+    "DesignCache",
+    "design_cache",
+    "user_cache_dir",
+]
+
+# Bump when a design algorithm changes, so that stale designs stored on disk are ignored
+CACHE_VERSION = 1
+
+
+def user_cache_dir(app_name="MixPlan"):
+    """
+    Per-user cache directory of the application.
+
+    The MIXPLAN_CACHE_DIR environment variable overrides the platform default
+    (%LOCALAPPDATA% on Windows, ~/Library/Caches on macOS, $XDG_CACHE_HOME or ~/.cache elsewhere).
+    """
+    override = os.environ.get("MIXPLAN_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, app_name)
+
+
+class DesignCache:
+    """
+    Memoized mixture designs.
+
+    Designs are keyed by (design type, k, order, constraint bounds, n_points, seed).
+    Recently used designs are kept in an in-memory LRU; persistent ones (expensive searches
+    such as D-optimal designs) are also stored as .npz files in `directory`, so that they
+    are reopened instantly in later sessions.
+
+    Parameters:
+        directory (str, optional): on-disk store (default: "designs" in the user cache dir)
+        max_entries (int): size of the in-memory LRU
+    """
+
+    def __init__(self, directory=None, max_entries=64):
+        self.directory = directory or os.path.join(user_cache_dir(), "designs")
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(design, k, order=None, bounds=None, n_points=None, seed=None, degree=None):
+        """
+        Normalized cache key. Bounds are rounded so that float noise from the inputs does
+        not create distinct entries. Optimal designs depend on the degree of the model they
+        are optimized for, which is part of their key.
+        """
+        if bounds is not None:
+            bounds = tuple(tuple(np.round(np.asarray(b, dtype=float), 9).tolist()) for b in bounds)
+        return (str(design), int(k), order, bounds, n_points, seed, None if degree is None else int(degree))
+
+    def path(self, key):
+        """Location of a design in the on-disk store."""
+        digest = hashlib.sha1(repr((CACHE_VERSION,) + key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key[0].replace(' ', '_')}-{digest[:16]}.npz")
+
+    def get(self, key, compute, persist=False):
+        """
+        Return the design stored under `key`, computing it with `compute()` on a miss.
+
+        Parameters:
+            key (tuple): key built with `DesignCache.key`
+            compute (callable): returns the (N, k) design
+            persist (bool): also read/write the on-disk store
+
+        Returns:
+            ndarray: (N, k) design (read-only, shared between callers)
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        points = self._load(key) if persist else None
+        if points is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            points = np.array(compute(), dtype=float)
+            if persist:
+                self._save(key, points)
+        points.setflags(write=False)
+
+        with self._lock:
+            self._memory[key] = points
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return points
+
+    def _load(self, key):
+        try:
+            with np.load(self.path(key)) as data:
+                return data["points"]
+        except (OSError, KeyError, ValueError):
+            # Missing or unreadable file: the design is computed again
+            return None
+
+    def _save(self, key, points):
+        path = self.path(key)
+        temporary = path + ".tmp.npz"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez(temporary, points=points, key=np.array(repr(key)))
+            os.replace(temporary, path)
+        except OSError:
+            # Read-only or full disk: the design stays cached in memory only
+            pass
+
+    def clear(self, disk=False):
+        """Empty the in-memory LRU, and the on-disk store if `disk` is True."""
+        with self._lock:
+            self._memory.clear()
+        if disk and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+
+design_cache = DesignCache()
@@ -0,0 +1,117 @@
+import numpy as np
+
+__all__ = [
+    "GOALS",
+    "Desirability",
+]
+
+# Goal of each response: maximize, minimize, or reach a target value
+GOALS = ("max", "min", "target")
+
+
+class Desirability:
+    """
+    Derringer-Suich desirability of several responses.
+
+    Each response y_j is mapped to an individual desirability d_j in [0, 1]:
+        max:    d = ((y - low) / (high - low)) ** s        (0 below low, 1 above high)
+        min:    d = ((high - y) / (high - low)) ** s       (1 below low, 0 above high)
+        target: d = ((y - low) / (target - low)) ** s      for low <= y <= target
+                d = ((high - y) / (high - target)) ** s    for target <= y <= high
+                (0 outside [low, high])
+    The overall desirability is the weighted geometric mean
+        D = (prod d_j ** r_j) ** (1 / sum r_j)
+    which is 0 as soon as one response is unacceptable.
+
+    Every response is processed at once on (P, M) predictions, so the overall surface is
+    computed in a few array operations on the same grid as the responses.
+
+    Parameters:
+        goals (sequence of str): (M,) goal of each response, in GOALS
+        low, high (array-like): (M,) acceptable range of each response
+        target (array-like, optional): (M,) target values (used for "target" goals,
+            default: middle of the range)
+        weights (array-like, optional): (M,) exponents s (default 1: linear)
+        importance (array-like, optional): (M,) relative importances r (default 1)
+    """
+
+    def __init__(self, goals, low, high, target=None, weights=None, importance=None):
+        goals = list(goals)
+        unknown = set(goals) - set(GOALS)
+        if unknown:
+            raise ValueError(f"Unknown desirability goals {sorted(unknown)}, expected one of {GOALS}")
+        self.goals = goals
+        m = len(goals)
+        self.low = self._vector(low, m, "low")
+        self.high = self._vector(high, m, "high")
+        if np.any(self.high <= self.low):
+            raise ValueError("Each desirability range must satisfy low < high")
+        self.target = self._vector((self.low + self.high) / 2 if target is None else target, m, "target")
+        if np.any((self.target < self.low) | (self.target > self.high)):
+            raise ValueError("Targets must lie within [low, high]")
+        self.weights = self._vector(1.0 if weights is None else weights, m, "weights")
+        self.importance = self._vector(1.0 if importance is None else importance, m, "importance")
+        if np.any(self.weights <= 0) or np.any(self.importance <= 0):
+            raise ValueError("Weights and importances must be positive")
+        self._codes = np.array([GOALS.index(goal) for goal in goals])
+
+    @staticmethod
+    def _vector(values, m, name):
+        values = np.broadcast_to(np.asarray(values, dtype=float), (m,)).copy()
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f"Desirability {name} must be finite")
+        return values
+
+    @classmethod
+    def from_data(cls, scores, goals=None):
+        """
+        Desirability whose ranges are the observed ranges of the responses.
+
+        Parameters:
+            scores (array-like): (N, M) observed responses
+            goals (sequence of str, optional): (M,) goals (default: maximize every response)
+        """
+        scores = np.atleast_2d(np.asarray(scores, dtype=float).T).T
+        low, high = np.nanmin(scores, axis=0), np.nanmax(scores, axis=0)
+        # Constant responses get a unit range so that the function stays defined
+        flat = ~(high > low)
+        high = np.where(flat, low + 1.0, high)
+        return cls(goals or ["max"] * scores.shape[1], low, high)
+
+    def individual(self, responses):
+        """
+        Individual desirabilities.
+
+        Parameters:
+            responses (array-like): (P, M) response values
+
+        Returns:
+            ndarray: (P, M) desirabilities in [0, 1] (nan where the response is nan)
+        """
+        y = np.asarray(responses, dtype=float)
+        span = self.high - self.low
+        increasing = np.clip((y - self.low) / span, 0.0, 1.0)
+        decreasing = np.clip((self.high - y) / span, 0.0, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            below = np.clip((y - self.low) / (self.target - self.low), 0.0, 1.0)
+            above = np.clip((self.high - y) / (self.high - self.target), 0.0, 1.0)
+        # A target on a bound makes the corresponding side degenerate (0/0): it is 1 at the target
+        below = np.where(self.target == self.low, (y == self.low).astype(float), below)
+        above = np.where(self.target == self.high, (y == self.high).astype(float), above)
+        targeted = np.where(y <= self.target, below, above)
+        d = np.where(self._codes == 0, increasing, np.where(self._codes == 1, decreasing, targeted))
+        d = d ** self.weights
+        return np.where(np.isnan(y), np.nan, d)
+
+    def __call__(self, responses):
+        """
+        Overall desirability.
+
+        Parameters:
+            responses (array-like): (P, M) response values
+
+        Returns:
+            ndarray: (P,) overall desirabilities in [0, 1]
+        """
+        d = np.atleast_2d(self.individual(responses))
+        return np.prod(d ** self.importance, axis=1) ** (1.0 / self.importance.sum())
@@ -0,0 +1,162 @@
+import csv
+import os
+import zipfile
+
+import numpy as np
+from src.algo.simplex import lattice_counts, lattice_size
+
+# pyarrow is optional: it is only imported when a Parquet file is written
+
+__all__ = [
+    "DEFAULT_BLOCK_SIZE",
+    "EXPORT_FORMATS",
+    "lattice_blocks",
+    "write_csv",
+    "write_npz",
+    "write_parquet",
+    "export_table",
+]
+
+DEFAULT_BLOCK_SIZE = 65536
+
+
+def lattice_blocks(level, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Uniform lattice of the ternary diagram (`level` parts per side), in row blocks.
+
+    Only one block of points exists at a time, so very fine grids (level 1400 is about
+    one million points) can be evaluated and written without building the whole grid.
+
+    Yields:
+        ndarray: (B, 3) ternary points (rows sum to 1), at most `block_size` rows
+    """
+    n_points = lattice_size(3, level)
+    for start in range(0, n_points, block_size):
+        yield lattice_counts(3, level, start, min(start + block_size, n_points)) / level
+
+
+def _atomic(write):
+    """Write through a temporary file renamed at the end, so that a failed export leaves no partial file."""
+    def wrapper(path, *args, **kwargs):
+        root, extension = os.path.splitext(path)
+        temporary = f"{root}.tmp{extension}"
+        try:
+            result = write(temporary, *args, **kwargs)
+            os.replace(temporary, path)
+            return result
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+    wrapper.__doc__ = write.__doc__
+    wrapper.__name__ = write.__name__
+    return wrapper
+
+
+@_atomic
+def write_csv(path, columns, blocks, fmt="%.10g", **_):
+    """
+    Write row blocks to a CSV file, one block at a time.
+
+    Parameters:
+        path (str): output file
+        columns (sequence of str): column names
+        blocks (iterable of ndarray): (B, C) float blocks
+        fmt (str): number format
+
+    Returns:
+        int: number of rows written
+    """
+    n_rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerow(columns)
+        for block in blocks:
+            np.savetxt(file, np.asarray(block, dtype=float).reshape(-1, len(columns)), delimiter=",", fmt=fmt)
+            n_rows += len(block)
+    return n_rows
+
+
+@_atomic
+def write_npz(path, columns, blocks, n_rows=None, compress=True):
+    """
+    Write row blocks to a NumPy .npz archive readable with `np.load`.
+
+    The archive holds "columns" (C,) and "data" (n_rows, C). When `n_rows` is known,
+    the .npy header of "data" is written first and the blocks are streamed into the
+    archive, so the table never exists in memory as a whole.
+
+    Parameters:
+        n_rows (int, optional): total number of rows (the blocks are gathered if None)
+        compress (bool): deflate the archive members
+
+    Returns:
+        int: number of rows written
+    """
+    if n_rows is None:
+        blocks = [np.concatenate([np.asarray(block, dtype=float) for block in blocks])]
+        n_rows = len(blocks[0])
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(float)), "fortran_order": False,
+              "shape": (int(n_rows), len(columns))}
+    written = 0
+    with zipfile.ZipFile(path, "w", compression=compression) as archive:
+        with archive.open("columns.npy", "w") as member:
+            np.lib.format.write_array(member, np.array(list(columns)))
+        with archive.open("data.npy", "w", force_zip64=True) as member:
+            np.lib.format.write_array_header_2_0(member, header)
+            for block in blocks:
+                block = np.ascontiguousarray(block, dtype=float).reshape(-1, len(columns))
+                member.write(block.tobytes())
+                written += len(block)
+    if written != n_rows:
+        raise ValueError(f"Expected {n_rows} rows, got {written}")
+    return written
+
+
+@_atomic
+def write_parquet(path, columns, blocks, **_):
+    """
+    Write row blocks to a Parquet file (one row group per block). Requires pyarrow.
+
+    Returns:
+        int: number of rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires the optional pyarrow package") from e
+    writer = None
+    n_rows = 0
+    try:
+        for block in blocks:
+            block = np.asarray(block, dtype=float).reshape(-1, len(columns))
+            table = pa.table({name: block[:, j] for j, name in enumerate(columns)})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            n_rows += len(block)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+EXPORT_FORMATS = {
+    ".csv": write_csv,
+    ".npz": write_npz,
+    ".parquet": write_parquet,
+}
+
+
+def export_table(path, columns, blocks, n_rows=None):
+    """
+    Write row blocks to a table file whose format is given by the extension of `path`
+    (see EXPORT_FORMATS).
+
+    Returns:
+        int: number of rows written
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {extension!r}, expected one of {sorted(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[extension](path, list(columns), blocks, n_rows=n_rows)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+from src.algo.design_cache import user_cache_dir
+from src.algo.grid_export import DEFAULT_BLOCK_SIZE
+
+__all__ = [
+    "GridStore",
+    "fingerprint",
+    "grid_store_dir",
+]
+
+# Bump when the layout of a store changes, so that stores written by older versions are ignored
+STORE_VERSION = 1
+
+
+def grid_store_dir():
+    """Default location of the grid stores: "grids" in the user cache dir."""
+    return os.path.join(user_cache_dir(), "grids")
+
+
+def fingerprint(*parts):
+    """
+    Stable hexadecimal digest of arrays and plain values (for cache keys).
+
+    Arrays are hashed through their dtype, shape and bytes, other values through their repr.
+    """
+    digest = hashlib.sha1(repr(STORE_VERSION).encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part)
+            digest.update(repr((part.dtype.str, part.shape)).encode())
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()[:20]
+
+
+class GridStore:
+    """
+    Evaluated grid stored on disk: a (n_rows, C) float table in a memory-mapped .npy file.
+
+    The table is written block by block and read back through views of the memory map
+    (`rows`, `blocks`, `column`), so that neither writing nor reading needs the whole grid
+    in memory: RAM use stays flat whatever the resolution. A store is a directory holding
+    "data.npy" (readable with `np.load(..., mmap_mode="r")`) and "meta.json" (column names,
+    metadata and whether the table was completely written), so that it can be reopened in a
+    later session.
+
+    Use `GridStore.create` to write a new store, `GridStore.open` to read one and
+    `GridStore.cached` to reuse a store computed earlier for the same key.
+    """
+
+    def __init__(self, directory, columns, data, metadata=None):
+        self.directory = directory
+        self.columns = list(columns)
+        self.data = data
+        self.metadata = dict(metadata or {})
+
+    @property
+    def n_rows(self):
+        return len(self.data)
+
+    @classmethod
+    def create(cls, directory, columns, n_rows, metadata=None):
+        """
+        New store of `n_rows` rows, to be filled with `write` or `fill`.
+
+        Parameters:
+            directory (str): store directory (created, an existing store there is replaced)
+            columns (sequence of str): column names
+            n_rows (int): number of rows
+            metadata (dict, optional): JSON-serializable description of the grid
+        """
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+        store = cls(directory, columns, None, metadata)
+        store._write_meta(complete=False)
+        store.data = np.lib.format.open_memmap(
+            os.path.join(directory, "data.npy"), mode="w+", dtype=float, shape=(int(n_rows), len(store.columns))
+        )
+        return store
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Read-only store written earlier.
+
+        Returns:
+            GridStore: the store, or None if it is missing, incomplete or from another version
+        """
+        try:
+            with open(os.path.join(directory, "meta.json"), encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("version") != STORE_VERSION or not meta.get("complete"):
+                return None
+            data = np.load(os.path.join(directory, "data.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return cls(directory, meta["columns"], data, meta.get("metadata"))
+
+    @classmethod
+    def cached(cls, key, columns, n_rows, blocks, directory=None, metadata=None, max_stores=8):
+        """
+        Store of the grid identified by `key`, computed (and written to disk) only on a miss.
+
+        Parameters:
+            key (str): identifier of the grid, e.g. built with `fingerprint`
+            columns (sequence of str): column names
+            n_rows (int): number of rows
+            blocks (callable): returns an iterable of (B, C) row blocks, only called on a miss
+            directory (str, optional): parent directory of the stores (default: grid_store_dir())
+            max_stores (int): stores kept in `directory`, the least recently used are removed
+
+        Returns:
+            GridStore: read-only store
+        """
+        directory = directory or grid_store_dir()
+        path = os.path.join(directory, key)
+        store = cls.open(path)
+        if store is not None and store.columns == list(columns) and store.n_rows == n_rows:
+            os.utime(os.path.join(path, "meta.json"))  # Most recently used
+            return store
+        store = cls.create(path, columns, n_rows, metadata)
+        store.fill(blocks())
+        cls.prune(directory, max_stores)
+        return cls.open(path)
+
+    @staticmethod
+    def prune(directory, keep):
+        """Remove all but the `keep` most recently used stores of `directory`."""
+        stores = []
+        for name in os.listdir(directory):
+            meta = os.path.join(directory, name, "meta.json")
+            if os.path.isfile(meta):
+                stores.append((os.path.getmtime(meta), os.path.join(directory, name)))
+        for _, path in sorted(stores, reverse=True)[keep:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _write_meta(self, complete):
+        meta = {"version": STORE_VERSION, "columns": self.columns, "metadata": self.metadata, "complete": complete}
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def write(self, start, block):
+        """Write a (B, C) block of rows starting at row `start`."""
+        block = np.asarray(block, dtype=float).reshape(-1, len(self.columns))
+        self.data[start:start + len(block)] = block
+        return start + len(block)
+
+    def fill(self, blocks):
+        """
+        Write consecutive row blocks from the first row, then mark the store complete.
+
+        Each block is flushed to disk once written, so that only the block being written
+        stays in memory.
+        """
+        start = 0
+        for block in blocks:
+            start = self.write(start, block)
+            self.data.flush()
+        if start != self.n_rows:
+            raise ValueError(f"Expected {self.n_rows} rows, got {start}")
+        self._write_meta(complete=True)
+
+    def rows(self, start=0, stop=None):
+        """Rows [start, stop) as a view of the memory map (no copy)."""
+        return self.data[start:stop]
+
+    def blocks(self, block_size=DEFAULT_BLOCK_SIZE):
+        """Iterate over the table in views of `block_size` rows (e.g. for `export_table`)."""
+        for start in range(0, self.n_rows, block_size):
+            yield self.data[start:start + block_size]
+
+    def column(self, name):
+        """Column `name` as a (strided) view of the memory map."""
+        return self.data[:, self.columns.index(name)]
@@ -0,0 +1,138 @@
+from collections import deque
+
+import numpy as np
+from src.algo.grid_store import fingerprint
+
+__all__ = [
+    "Snapshot",
+    "History",
+]
+
+
+class Snapshot:
+    """
+    Immutable state of an experiment: points, responses and the fitted model shown.
+
+    Rows are stored as tuples of tuples. A row is itself an immutable tuple, so consecutive
+    snapshots share every row that an edit did not touch: taking a snapshot costs one
+    reference per row, never a copy of the values.
+
+    Parameters:
+        points (sequence of tuple): compositions (fractions)
+        scores (sequence of tuple): responses of each point
+        response_names (sequence of str): names of the responses
+        model_key (str, optional): ModelCache key of the model fitted on this state, if any
+        display (int or str): surface shown (response index or "desirability")
+        label (str): description of the edit that followed this state (shown by undo/redo)
+    """
+
+    __slots__ = ("points", "scores", "response_names", "model_key", "display", "label", "_key")
+
+    def __init__(self, points, scores, response_names, model_key=None, display=0, label=""):
+        self.points = tuple(map(tuple, points))
+        self.scores = tuple(map(tuple, scores))
+        self.response_names = tuple(response_names)
+        self.model_key = model_key
+        self.display = display
+        self.label = label
+        self._key = None
+
+    @property
+    def key(self):
+        """Fingerprint of the data (computed on first use)."""
+        if self._key is None:
+            self._key = fingerprint(
+                np.array(self.points, dtype=float), np.array(self.scores, dtype=float), self.response_names
+            )
+        return self._key
+
+    def labelled(self, label):
+        """Same state with another label (the rows are shared, not copied)."""
+        snapshot = Snapshot((), (), self.response_names, self.model_key, self.display, label)
+        snapshot.points, snapshot.scores, snapshot._key = self.points, self.scores, self._key
+        return snapshot
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return f"Snapshot({len(self)} points, {self.response_names}, label={self.label!r})"
+
+
+class History:
+    """
+    Undo/redo stacks of snapshots.
+
+    `record` is called with the state *before* an edit; `undo` and `redo` are given the
+    current state, which is pushed on the opposite stack so that the move can be reverted.
+    A new edit clears the redo stack. Edits recorded with the same `group` (e.g. the rows of
+    one import) form a single undo step.
+
+    Parameters:
+        max_entries (int): undo steps kept (the oldest are dropped)
+    """
+
+    def __init__(self, max_entries=100):
+        self.undo_stack = deque(maxlen=max_entries)
+        self.redo_stack = deque(maxlen=max_entries)
+        self._group = None  # Group of the last recorded step, while it can still be extended
+
+    def record(self, snapshot, group=None):
+        """
+        Push the state before an edit.
+
+        Parameters:
+            snapshot (Snapshot): state before the edit, labelled with the edit
+            group (hashable, optional): edits of one operation (e.g. a token of one import);
+                if the previous step was recorded with the same group and nothing was undone
+                since, the edit joins that step instead of adding one
+
+        Returns:
+            bool: True if a new undo step was added
+        """
+        previous = self.undo_stack[-1] if self.undo_stack and not self.redo_stack else None
+        if previous is not None and group is not None and group == self._group:
+            return False
+        # Labels first: the fingerprint of the data is only computed for a repeated edit
+        if previous is not None and previous.label == snapshot.label and previous.key == snapshot.key:
+            return False  # Same state, same edit: nothing to undo in between
+        self.undo_stack.append(snapshot)
+        self.redo_stack.clear()
+        self._group = group
+        return True
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self, current):
+        """
+        State before the last edit, or None.
+
+        Parameters:
+            current (Snapshot): current state, restored by the next `redo`
+        """
+        if not self.undo_stack:
+            return None
+        previous = self.undo_stack.pop()
+        self.redo_stack.append(current.labelled(previous.label))
+        self._group = None
+        return previous
+
+    def redo(self, current):
+        """State after the last undone edit, or None (`current` is restored by the next `undo`)."""
+        if not self.redo_stack:
+            return None
+        following = self.redo_stack.pop()
+        self.undo_stack.append(current.labelled(following.label))
+        self._group = None
+        return following
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._group = None
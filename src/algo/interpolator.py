@@ -1,11 +1,13 @@
 import numpy as np
-from scipy.interpolate import (
-    LinearNDInterpolator,
-    RBFInterpolator as RBF,
-)
-from scipy.spatial import Delaunay
-from sklearn.metrics import r2_score
+from itertools import combinations
 from functools import partial
+from src.algo.metrics import adjusted_r2_score, leverages, mae, press, r2_score, rmse
+from src.algo.parallel import DEFAULT_CHUNK_BYTES, chunk_rows, evaluate_chunked
+from src.algo.replicates import group_replicates
+from src.algo.simplex import simplex_to_cartesian
+
+# Heavy dependencies (scipy.interpolate, scipy.spatial) are imported on first use
+# so that they do not slow down the application startup.
 
 __all__ = [
     "RBFInterpolator",
@@ -17,191 +19,305 @@ __all__ = [
 
 
 class Interpolator:
+    """
+    Base class of the interpolators.
+
+    Points are (N, k) mixtures with any number of components k. `predict` evaluates
+    the model on an (M, k) array at once; calling the interpolator on a single (k,)
+    point returns a float.
+
+    Scores are either (N,) for a single response or (N, R) for R responses. Several
+    responses are fitted together: every subclass solves its linear system once with
+    an (N, R) right-hand side, so that fitting R responses costs barely more than one.
+    Predictions then have shape (M, R).
+
+    Replicates (observations of the same composition) are grouped before fitting: models
+    are fitted on the `groups` means, weighted by the group sizes (see ReplicateGroups), and
+    `lack_of_fit` tests the model against the pure error of the replicates. Groups already
+    computed by the caller (to check the number of distinct compositions) can be passed as
+    `groups` rather than computed again.
+    """
     min_num_points = None
     max_num_points = None
-    def __init__(self, points: np.ndarray, scores: np.ndarray):
-        self.points = points
-        self.scores = scores
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Point counts of the registry entry, read from the class when it is loaded (the class
+        # is the reference, see RegistryEntry.load); a `registry_metadata` of the class body wins
+        cls.registry_metadata = {
+            "min_points": cls.min_points(3), "max_points": cls.max_num_points,
+            **cls.__dict__.get("registry_metadata", {}),
+        }
+
+    def __init__(self, points: np.ndarray, scores: np.ndarray, groups=None):
+        self.points = np.asarray(points, dtype=float)
+        self.scores = np.asarray(scores, dtype=float)
         assert len(points) == len(scores), "Points and scores must have the same length"
         assert len(points) > 0, "Points and scores must not be empty"
-    
-    def update(self, points, scores):
-        self.points = np.array(points)
-        self.scores = np.array(scores)
+        self.groups = groups if groups is not None else group_replicates(self.points, self.scores)
+
+    @classmethod
+    def min_points(cls, k=3):
+        """Minimum number of points needed to fit a model with k components."""
+        return cls.min_num_points
+
+    def update(self, points, scores, groups=None):
+        self.points = np.array(points, dtype=float)
+        self.scores = np.array(scores, dtype=float)
+        self.groups = groups if groups is not None else group_replicates(self.points, self.scores)
         self.recompute()
-    
+
     def append(self, points, scores):
-        self.update(np.concatenate(self.points, np.array(points)), np.concatenate(self.scores, np.array(scores)))
-    
+        self.update(np.concatenate((self.points, np.array(points))), np.concatenate((self.scores, np.array(scores))))
+
     def recompute(self,):
         raise NotImplementedError()
 
-    def __call__(self, *args, **kwds):
+    def predict(self, points):
+        """
+        Evaluate the model on (M, k) points.
+
+        Returns:
+            ndarray: (M,) predicted values, or (M, R) for R responses
+        """
         raise NotImplementedError()
 
+    def prepare(self):
+        """Make the model ready for concurrent `predict` calls (nothing to do for most models)."""
+
+    def predict_chunked(self, points, chunk_bytes=DEFAULT_CHUNK_BYTES, max_workers=None, progress=None):
+        """
+        Evaluate the model on many points (fine grids), in memory-bounded chunks evaluated
+        on a thread pool.
+
+        A chunk of C rows is assumed to need a (C, N) float working array, which is the
+        kernel block of an RBF and bounds the other models.
+
+        Parameters:
+            points (array-like): (M, k) points
+            chunk_bytes (int): memory budget of one chunk
+            max_workers (int, optional): threads used (default: one per core)
+            progress (callable, optional): progress(done, total) after each chunk
+
+        Returns:
+            ndarray: (M,) predicted values, or (M, R) for R responses
+        """
+        self.prepare()
+        rows = chunk_rows(8 * len(self.groups), chunk_bytes)
+        return evaluate_chunked(self.predict, points, rows, max_workers=max_workers, progress=progress)
+
+    def R2_score(self,):
+        # Compute the R2 score of the interpolation on the fitted points (one per response)
+        return r2_score(self.scores, self.predict(self.points))
+
+    def fit_metrics(self):
+        """
+        Goodness of fit on the fitted points (one value per response for each metric).
+
+        Returns:
+            dict: "r2", "adjusted_r2", "rmse", "mae" and "press"; PRESS (leave-one-out) has a
+            closed form for models linear in their coefficients only, and is nan for the others
+        """
+        predictions = self.predict(self.points)
+        r2 = r2_score(self.scores, predictions)
+        terms = self.model_matrix(self.points)
+        if terms is not None:
+            press_value = press(self.scores, predictions, leverages(terms))
+        else:
+            press_value = np.full(np.shape(r2), np.nan) if np.ndim(r2) else float("nan")
+        return {
+            "r2": r2,
+            "adjusted_r2": adjusted_r2_score(self.scores, predictions, self.n_parameters),
+            "rmse": rmse(self.scores, predictions),
+            "mae": mae(self.scores, predictions),
+            "press": press_value,
+        }
+
+    def model_matrix(self, points):
+        """(M, P) model terms of the points for models linear in their coefficients, None for the others."""
+        return None
+
+    @property
+    def n_parameters(self):
+        """Number of fitted coefficients; an interpolating model has one per distinct composition."""
+        return len(self.groups)
+
+    def lack_of_fit(self):
+        """
+        Lack-of-fit F-test against the pure error of the replicates (see ReplicateGroups.lack_of_fit).
+        The test is only defined with replicates and fewer coefficients than distinct compositions.
+        """
+        return self.groups.lack_of_fit(self.predict(self.groups.points), self.n_parameters)
+
+    def weighted_lstsq(self, A):
+        """
+        Least-squares coefficients for the (U, P) model matrix `A` of the group compositions:
+        rows are weighted by the group sizes, which equals the fit on all the observations.
+        """
+        weights = np.sqrt(self.groups.counts)
+        means = self.groups.means
+        return np.linalg.lstsq(A * weights[:, None], means * (weights if means.ndim == 1 else weights[:, None]), rcond=None)[0]
+
+    @property
+    def n_responses(self):
+        """Number of fitted responses (1 for (N,) scores)."""
+        return 1 if self.scores.ndim == 1 else self.scores.shape[1]
+
+    def __call__(self, p):
+        p = np.asarray(p, dtype=float)
+        if p.ndim == 1:
+            value = self.predict(p[None])[0]
+            return float(value) if np.ndim(value) == 0 else value
+        return self.predict(p)
+
 
 class RBFInterpolator(Interpolator):
     min_num_points = 3
     max_num_points = None
-    def __init__(self, points: np.ndarray, scores, lazy_init=False, **kwargs):
-        super().__init__(points, scores)
+    def __init__(self, points: np.ndarray, scores, lazy_init=False, groups=None, **kwargs):
+        super().__init__(points, scores, groups)
+        from scipy.interpolate import RBFInterpolator as RBF
         # init the partial interpolator (all kwargs but no point nor score)
-        self.interpolator = partial(RBF, **kwargs)
+        self.factory = partial(RBF, **kwargs)
+        self.interpolator = None
         self.lazy_init = lazy_init
         if not lazy_init:
             self.recompute()
-    
-    @staticmethod
-    def ternary_to_cartesian(t_points):
-        """
-        Convert ternary coordinates to cartesian coordinates.
-        Vectorized version for efficiency.
-        """
-        total = np.sum(t_points, axis=1, keepdims=True)
-        # Avoid division by zero if total is 0
-        total[total == 0] = 1e-10
-        x = 0.5 * (2 * t_points[:, 1][..., None]+ t_points[:, 2][..., None]) / total
-        y = (np.sqrt(3) / 2) * t_points[:, 2][..., None] / total
-        return np.column_stack((x, y))
-
 
     def recompute(self,):
-        # Convert ternary coordinates to cartesian
-        cartesian_points = self.ternary_to_cartesian(self.points)
+        # Convert mixture coordinates to cartesian (isometric embedding, any k); replicates are
+        # averaged, since duplicate points make the RBF system singular
+        cartesian_points = simplex_to_cartesian(self.groups.points)
+        # A smoothing parameter is scaled per point: means of n replicates are n times more precise
+        smoothing = self.factory.keywords.get("smoothing", 0.0)
+        kwargs = {"smoothing": smoothing / self.groups.counts} if np.ndim(smoothing) == 0 and smoothing else {}
         # Create the RBF interpolator
-        self.interpolator = self.interpolator(cartesian_points, self.scores)
+        self.interpolator = self.factory(cartesian_points, self.groups.means, **kwargs)
         self.lazy_init = False
 
-    def R2_score(self,):
-        # Compute the R2 score of the interpolation
-        cartesian_points = self.ternary_to_cartesian(self.points)
-        return r2_score(self.scores, self.interpolator(cartesian_points))
-    
-    def __call__(self, p):
+    def prepare(self):
+        # Fit now rather than in concurrent predict calls
+        if self.lazy_init:
+            self.recompute()
+
+    def predict(self, points):
         if self.lazy_init:
             self.recompute()
-        # Convert ternary coordinates to cartesian
-        cartesian_point = self.ternary_to_cartesian(p[None])
-        # Compute the interpolated value
-        return float(self.interpolator(cartesian_point))
-    
+        # Compute the interpolated values
+        return self.interpolator(simplex_to_cartesian(points))
+
 
 class LinearNDInterpolator(Interpolator):
     min_num_points = 3
     max_num_points = None
-    def __init__(self, points: np.ndarray, scores: np.ndarray):
-        super().__init__(points, scores)
+    def __init__(self, points: np.ndarray, scores: np.ndarray, groups=None):
+        super().__init__(points, scores, groups)
         self.recompute()
-    
+
     def recompute(self,):
-        # Create the LinearNDInterpolator
-        self.interpolator = LinearNDInterpolator(self.points, self.scores)
-    
-    def __call__(self, p):
-        # Compute the interpolated value
-        return float(self.interpolator(p))
+        from scipy.interpolate import LinearNDInterpolator
+        # Create the LinearNDInterpolator in the (k-1) dimensional mixture space, through the replicate means
+        self.interpolator = LinearNDInterpolator(simplex_to_cartesian(self.groups.points), self.groups.means)
+
+    def predict(self, points):
+        # Compute the interpolated values
+        return self.interpolator(simplex_to_cartesian(points))
 
 
 class DelaunayInterpolator(Interpolator):
     min_num_points = 3
     max_num_points = None
-    def __init__(self, points: np.ndarray, scores: np.ndarray):
-        super().__init__(points, scores)
+    def __init__(self, points: np.ndarray, scores: np.ndarray, groups=None):
+        super().__init__(points, scores, groups)
         self.recompute()
-    
+
     def recompute(self,):
-        # Create the Delaunay triangulation
-        self.triangulation = Delaunay(self.points)
+        from scipy.interpolate import LinearNDInterpolator
+        from scipy.spatial import Delaunay
+        # Create the Delaunay triangulation of the distinct compositions
+        self.triangulation = Delaunay(simplex_to_cartesian(self.groups.points))
         # Create the LinearNDInterpolator
-        self.interpolator = LinearNDInterpolator(self.triangulation, self.scores)
-    
-    def R2_score(self,):
-        # Compute the R2 score of the interpolation
-        return self.interpolator.R2_score()
-    
-    def __call__(self, p):
-        # Compute the interpolated value
-        return float(self.interpolator(p))
+        self.interpolator = LinearNDInterpolator(self.triangulation, self.groups.means)
+
+    def predict(self, points):
+        # Compute the interpolated values
+        return self.interpolator(simplex_to_cartesian(points))
 
 
 class LinearInterpolator(Interpolator):
     """
-    Classic linear interpolation via matrix inversion.
+    Classic linear (Scheffé) interpolation: Y = sum(b_i * X_i).
+    Solved by least squares, which is the matrix inversion when N = k.
     """
     min_num_points = 3
-    max_num_points = 3
-    def __init__(self, points: np.ndarray, scores: np.ndarray):
-        super().__init__(points, scores)
+    max_num_points = None
+    def __init__(self, points: np.ndarray, scores: np.ndarray, groups=None):
+        super().__init__(points, scores, groups)
         self.recompute()
-    
+
+    @classmethod
+    def min_points(cls, k=3):
+        return k
+
+    @property
+    def n_parameters(self):
+        return self.points.shape[1]
+
+    def model_matrix(self, points):
+        return np.asarray(points, dtype=float)
+
     def recompute(self,):
-        points = self.points[:3].T
-        points[-1] += 1e-6  # Avoid division by zero
-        scores = self.scores[:3]
-        # Compute the coefficients of the linear interpolation
-        self.coeffs = np.dot(scores, np.linalg.inv(points))
-    
+        # Compute the coefficients of the linear interpolation (weighted fit on the replicate means)
+        self.coeffs = self.weighted_lstsq(self.model_matrix(self.groups.points))
 
-    def R2_score(self,):
-        # Compute the R2 score of the interpolation
-        predicted_scores = np.dot(self.coeffs, self.points.T)
-        return r2_score(self.scores, predicted_scores)
-    
-    def __call__(self, p):
-        # Compute the interpolated value
-        point = np.array(p).T
-        score = np.dot(self.coeffs, point)
-        return score
+    def predict(self, points):
+        # Compute the interpolated values
+        return np.asarray(points, dtype=float) @ self.coeffs
 
 
 class QuadraticInterpolator(Interpolator):
     """
-    Quadratic interpolation via matrix inversion.
+    Special cubic (Scheffé) interpolation:
+    Y = sum(b_i X_i) + sum(b_ij X_i X_j) + sum(b_ijl X_i X_j X_l).
+    Solved by least squares, which is the matrix inversion when N equals the number of terms.
     """
     min_num_points = 7
-    max_num_points = 7
-    def __init__(self, points: np.ndarray, scores: np.ndarray):
-        super().__init__(points, scores)
+    max_num_points = None
+    def __init__(self, points: np.ndarray, scores: np.ndarray, groups=None):
+        super().__init__(points, scores, groups)
         self.recompute()
-    
+
+    @classmethod
+    def min_points(cls, k=3):
+        return k + len(list(combinations(range(k), 2))) + len(list(combinations(range(k), 3)))
+
     @staticmethod
-    def ternary_to_quadratic(t_points):
+    def mixture_terms(points):
         """
-        Convert ternary coordinates to quadratic coordinates.
-        Vectorized version for efficiency.
+        Convert mixture coordinates to the special cubic model terms
+        (X_i, X_i*X_j, X_i*X_j*X_l). Vectorized version for efficiency.
         """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        k = points.shape[1]
+        pairs = np.array(list(combinations(range(k), 2)))
+        triples = np.array(list(combinations(range(k), 3))).reshape(-1, 3)
         return np.column_stack((
-            t_points[:, 0],
-            t_points[:, 1],
-            t_points[:, 2] + 1e-6,  # Avoid division by zero
-            t_points[:, 0] * t_points[:, 1],
-            t_points[:, 0] * t_points[:, 2],
-            t_points[:, 1] * t_points[:, 2],
-            np.prod(t_points, axis=1),
+            points,
+            points[:, pairs[:, 0]] * points[:, pairs[:, 1]],
+            points[:, triples[:, 0]] * points[:, triples[:, 1]] * points[:, triples[:, 2]],
         ))
-    
-    def recompute(self,):
-        # Quadratic interpolation : Y = c*A
-        # with A = (X1, X2, X3, X1*X2, X1*X3, X2*X3, X1*X2*X3)
-        points = self.points[:7]
-        # Convert ternary coordinates to quadratic coordinates
-        A = self.ternary_to_quadratic(points).T
-        # Convert the scores to a column vector
-        scores = np.array(self.scores[:7]).T
-        # Compute the coefficients of the quadratic interpolation
-        self.coeffs = np.dot(scores, np.linalg.inv(A))
 
-    def R2_score(self,):
-        # Compute the R2 score of the interpolation
-        # Convert the points to quadratic coordinates
-        A = self.ternary_to_quadratic(self.points)
-        # Compute the predicted scores
-        predicted_scores = np.dot(self.coeffs, A.T)
-        # Compute the R2 score
-        return r2_score(self.scores, predicted_scores)
+    @property
+    def n_parameters(self):
+        return self.min_points(self.points.shape[1])
 
-    def __call__(self, p):
-        # Compute the interpolated value
-        point = self.ternary_to_quadratic(np.array(p)[None]).T
-        score = np.dot(self.coeffs, point)
-        return score
\ No newline at end of file
+    def model_matrix(self, points):
+        return self.mixture_terms(points)
+
+    def recompute(self,):
+        # Compute the coefficients of the special cubic interpolation (weighted fit on the replicate means)
+        self.coeffs = self.weighted_lstsq(self.model_matrix(self.groups.points))
+
+    def predict(self, points):
+        # Compute the interpolated values
+        return self.mixture_terms(points) @ self.coeffs
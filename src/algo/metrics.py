@@ -0,0 +1,102 @@
+import numpy as np
+
+__all__ = [
+    "r2_score",
+    "adjusted_r2_score",
+    "rmse",
+    "mae",
+    "press",
+    "leverages",
+]
+
+
+def _as_arrays(y_true, y_pred):
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float).reshape(y_true.shape)
+    if y_true.shape[0] == 0:
+        raise ValueError("y_true and y_pred must not be empty")
+    return y_true, y_pred
+
+
+def r2_score(y_true, y_pred):
+    """
+    Coefficient of determination R².
+
+    Parameters:
+        y_true (array-like): observed values, shape (N,) or (N, M)
+        y_pred (array-like): predicted values, same shape as y_true
+
+    Returns:
+        float or ndarray: R² (one value per column for 2D inputs).
+        As in scikit-learn, a constant y_true gives 1.0 for a perfect fit, 0.0 otherwise.
+    """
+    y_true, y_pred = _as_arrays(y_true, y_pred)
+    ss_res = np.sum((y_true - y_pred) ** 2, axis=0)
+    ss_tot = np.sum((y_true - y_true.mean(axis=0)) ** 2, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(ss_tot > 0, 1.0 - ss_res / ss_tot, np.where(ss_res > 0, 0.0, 1.0))
+    return float(r2) if r2.ndim == 0 else r2
+
+
+def adjusted_r2_score(y_true, y_pred, n_params):
+    """
+    R² adjusted for the number of model parameters.
+
+    Parameters:
+        n_params (int): number of fitted coefficients (Scheffé models have no intercept)
+
+    Returns:
+        float or ndarray: adjusted R², NaN when N <= n_params
+    """
+    n = np.shape(y_true)[0]
+    r2 = r2_score(y_true, y_pred)
+    if n <= n_params:
+        return np.full_like(r2, np.nan) if np.ndim(r2) else float("nan")
+    return 1.0 - (1.0 - r2) * (n - 1) / (n - n_params)
+
+
+def rmse(y_true, y_pred):
+    """Root mean squared error."""
+    y_true, y_pred = _as_arrays(y_true, y_pred)
+    value = np.sqrt(np.mean((y_true - y_pred) ** 2, axis=0))
+    return float(value) if value.ndim == 0 else value
+
+
+def mae(y_true, y_pred):
+    """Mean absolute error."""
+    y_true, y_pred = _as_arrays(y_true, y_pred)
+    value = np.mean(np.abs(y_true - y_pred), axis=0)
+    return float(value) if value.ndim == 0 else value
+
+
+def leverages(X):
+    """
+    Diagonal of the hat matrix H = X (X'X)^-1 X' of a linear model.
+
+    Computed from a thin QR decomposition (h_ii = ||Q_i||²) without forming H.
+    """
+    Q, _ = np.linalg.qr(np.asarray(X, dtype=float))
+    return np.einsum("ij,ij->i", Q, Q)
+
+
+def press(y_true, y_pred, leverage):
+    """
+    Prediction error sum of squares (leave-one-out), for models linear in their coefficients.
+
+    Uses the closed form e_(i) = e_i / (1 - h_ii), so no refit is needed.
+
+    Parameters:
+        leverage (array-like): hat matrix diagonal, see `leverages`
+
+    Returns:
+        float or ndarray: PRESS, infinite if a point has leverage 1 (saturated design)
+    """
+    y_true, y_pred = _as_arrays(y_true, y_pred)
+    h = np.asarray(leverage, dtype=float)
+    if y_true.ndim > 1:
+        h = h[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loo = (y_true - y_pred) / (1.0 - h)
+    loo = np.where(np.isclose(h, 1.0), np.inf, loo)
+    value = np.sum(loo ** 2, axis=0)
+    return float(value) if value.ndim == 0 else value
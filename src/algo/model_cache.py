@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+import numpy as np
+from src.algo.grid_store import fingerprint
+
+__all__ = [
+    "ModelCache",
+]
+
+
+class ModelCache:
+    """
+    Fitted models kept in memory, keyed by a hash of the dataset (interpolator, points and
+    scores): fitting the same data again is free.
+
+    Entries are whatever the caller attaches to a fit, e.g. (model, r2) or the model with
+    the surfaces already evaluated from it. Keys only depend on the data, so a dataset that
+    comes back (undo, a repeated request) finds its fit again.
+
+    Parameters:
+        max_entries (int): entries kept; the least recently used are dropped
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(interpolator, points, scores):
+        """Key of a fit: interpolator name and dataset."""
+        return fingerprint(str(interpolator), np.asarray(points, dtype=float), np.asarray(scores, dtype=float))
+
+    @classmethod
+    def model_key(cls, model):
+        """Key of a fitted model (an Interpolator holds its own points and scores)."""
+        return cls.key(type(model).__name__, model.points, model.scores)
+
+    def get(self, key):
+        """Entry stored under `key` (now the most recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
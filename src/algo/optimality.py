@@ -0,0 +1,380 @@
+from functools import lru_cache
+from itertools import combinations
+from math import factorial
+import numpy as np
+from src.algo.simplex import simplex_to_cartesian
+
+__all__ = [
+    "model_matrix",
+    "moments_matrix",
+    "DCriterion",
+    "ACriterion",
+    "ICriterion",
+    "CRITERIA",
+    "make_criterion",
+    "exchange",
+    "coordinate_exchange",
+]
+
+
+# Exchanges dividing det(F^T F) by more than this are rejected as (nearly) singular
+MIN_DET_RATIO = 1e-9
+
+
+def model_matrix(points, degree=1):
+    """
+    Scheffé model matrix of mixtures.
+
+    Parameters:
+        points (array-like): (N, k) compositions
+        degree (int): 1 for the linear model (X_i), 2 for the quadratic one (X_i, X_i*X_j)
+
+    Returns:
+        ndarray: (N, p) model terms
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    if degree == 1:
+        return points
+    pairs = np.array(list(combinations(range(points.shape[1]), 2)))
+    return np.column_stack((points, points[:, pairs[:, 0]] * points[:, pairs[:, 1]]))
+
+
+def _grundmann_moller(d, s):
+    """
+    Grundmann-Möller rule of degree 2s+1 on the d-dimensional simplex.
+
+    Returns:
+        Tuple[ndarray, ndarray]: (Q, d+1) barycentric nodes and (Q,) weights summing to 1
+    """
+    from src.algo.simplex import lattice_counts
+    nodes, weights = [], []
+    for i in range(s + 1):
+        denominator = d + 2 * s + 1 - 2 * i
+        beta = lattice_counts(d + 1, s - i) if s > i else np.zeros((1, d + 1), dtype=np.int64)
+        weight = (-1) ** i * 2.0 ** (-2 * s) * denominator ** (2 * s + 1) / (factorial(i) * factorial(d + 2 * s + 1 - i))
+        nodes.append((2 * beta + 1) / denominator)
+        weights.append(np.full(len(beta), weight * factorial(d)))
+    return np.concatenate(nodes), np.concatenate(weights)
+
+
+@lru_cache(maxsize=32)
+def _moments(vertices, degree):
+    from scipy.spatial import Delaunay, QhullError
+    vertices = np.array(vertices)
+    k = vertices.shape[1]
+    try:
+        # Split the (k-1)-dimensional polytope into simplices
+        simplices = vertices[Delaunay(simplex_to_cartesian(vertices)).simplices]
+    except (QhullError, ValueError):
+        # Degenerate region (flat or reduced to a few points): average over the vertices
+        F = model_matrix(vertices, degree)
+        return F.T @ F / len(F)
+    # Exact for the polynomial entries of f(x) f(x)^T, of degree 2 * degree
+    nodes, weights = _grundmann_moller(k - 1, degree)
+    cartesian = simplex_to_cartesian(simplices.reshape(-1, k)).reshape(len(simplices), k, k - 1)
+    volumes = np.abs(np.linalg.det(cartesian[:, 1:] - cartesian[:, :1]))
+    moments = 0
+    for simplex, volume in zip(simplices, volumes):
+        F = model_matrix(nodes @ simplex, degree)
+        moments = moments + volume * (F.T * weights) @ F
+    return moments / volumes.sum()
+
+
+def moments_matrix(vertices, degree=1):
+    """
+    Moments matrix W = mean of f(x) f(x)^T over the constrained region, f being the model terms.
+
+    The region (convex hull of `vertices`) is split into simplices, on which an exact
+    Grundmann-Möller cubature is applied. The result is cached per region and model.
+
+    Parameters:
+        vertices (array-like): (V, k) vertices of the region, as proportions
+        degree (int): degree of the Scheffé model
+
+    Returns:
+        ndarray: (p, p) moments matrix (read-only, shared)
+    """
+    key = tuple(map(tuple, np.round(np.asarray(vertices, dtype=float), 12).tolist()))
+    moments = _moments(key, degree)
+    moments.setflags(write=False)
+    return moments
+
+
+class DesignCriterion:
+    """
+    Optimality criterion of the exchange algorithm, written as a loss to minimize.
+
+    `deltas` gives the change of the loss when one design row is replaced by each of the
+    candidates, from the current dispersion matrix V = (F^T F)^-1 only, without any
+    refactorization: this is what makes the shared exchange loop fast.
+    """
+    name = None
+
+    def loss(self, F):
+        raise NotImplementedError()
+
+    def deltas(self, V, f_out, F_in):
+        """
+        Parameters:
+            V (ndarray): (p, p) current dispersion matrix
+            f_out (ndarray): (p,) model terms of the design row leaving the design
+            F_in (ndarray): (C, p) model terms of the candidates
+
+        Returns:
+            ndarray: (C,) loss change of each exchange (inf if the design becomes singular)
+        """
+        raise NotImplementedError()
+
+
+class DCriterion(DesignCriterion):
+    """D-optimality: maximize det(F^T F), i.e. minimize -log det(F^T F)."""
+    name = "D"
+
+    def loss(self, F):
+        sign, logdet = np.linalg.slogdet(F.T @ F)
+        return -logdet if sign > 0 else np.inf
+
+    def deltas(self, V, f_out, F_in):
+        # Fedorov's delta: det ratio of the exchange
+        d_in = np.einsum("ij,jk,ik->i", F_in, V, F_in)
+        d_out = f_out @ V @ f_out
+        d_cross = F_in @ (V @ f_out)
+        ratio = (1 + d_in) * (1 - d_out) + d_cross ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ratio > MIN_DET_RATIO, -np.log(ratio), np.inf)
+
+
+class _TraceCriterion(DesignCriterion):
+    """Criteria of the form trace(W V), updated with the rank-2 Woodbury identity."""
+
+    def __init__(self, weights):
+        self.weights = weights
+
+    def loss(self, F):
+        try:
+            return float(np.trace(self.weights @ np.linalg.inv(F.T @ F)))
+        except np.linalg.LinAlgError:
+            return np.inf
+
+    def deltas(self, V, f_out, F_in):
+        # M' = M + U C U^T with U = [f_in, f_out], C = diag(1, -1):
+        # trace(W V') = trace(W V) - trace((C^-1 + U^T V U)^-1 U^T (V W V) U)
+        G = V @ self.weights @ V
+        a11 = 1 + np.einsum("ij,jk,ik->i", F_in, V, F_in)
+        a12 = F_in @ (V @ f_out)
+        a22 = f_out @ V @ f_out - 1
+        g11 = np.einsum("ij,jk,ik->i", F_in, G, F_in)
+        g12 = F_in @ (G @ f_out)
+        g22 = f_out @ G @ f_out
+        det = a11 * a22 - a12 ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deltas = -(a22 * g11 - 2 * a12 * g12 + a11 * g22) / det
+        # -det is the det(F^T F) ratio of the exchange: a vanishing ratio means a singular design
+        return np.where(-det > MIN_DET_RATIO, deltas, np.inf)
+
+
+class ACriterion(_TraceCriterion):
+    """A-optimality: minimize trace((F^T F)^-1), the mean variance of the coefficients."""
+    name = "A"
+
+    def __init__(self, p):
+        super().__init__(np.eye(p))
+
+
+class ICriterion(_TraceCriterion):
+    """
+    I-optimality: minimize the average prediction variance over the region,
+    trace(W (F^T F)^-1), W being the moments matrix of the region (see `moments_matrix`).
+    """
+    name = "I"
+
+
+CRITERIA = {
+    "D": DCriterion,
+    "A": ACriterion,
+    "I": ICriterion,
+}
+
+
+def make_criterion(name, vertices, degree=1):
+    """
+    Build a criterion for the region spanned by `vertices` ((V, k) proportions).
+    """
+    if name not in CRITERIA:
+        raise ValueError(f"Unknown criterion {name!r}, expected one of {list(CRITERIA)}")
+    if name == "D":
+        return DCriterion()
+    p = model_matrix(np.asarray(vertices)[:1], degree).shape[1]
+    if name == "A":
+        return ACriterion(p)
+    return ICriterion(moments_matrix(vertices, degree))
+
+
+def _exchange_update(V, f_in, f_out):
+    """Rank-2 (Woodbury) update of the dispersion matrix when f_out is replaced by f_in."""
+    U = np.column_stack((f_in, f_out))
+    VU = V @ U
+    return V - VU @ np.linalg.solve(np.diag([1.0, -1.0]) + U.T @ VU, VU.T)
+
+
+def exchange(F, n_points, criterion, max_iter=100, seed=None, ridge=1e-8, tol=1e-10):
+    """
+    Exchange algorithm shared by all criteria (Fedorov's, best-candidate variant).
+
+    For each design row in turn, the change of the loss is computed at once for all the
+    candidates not in the design, and the best exchange is applied if it improves the
+    loss. The dispersion matrix is kept up to date with the rank-2 Woodbury identity.
+
+    Parameters:
+        F (ndarray): (C, p) model terms of the candidates
+        n_points (int): number of design points
+        criterion (DesignCriterion): loss to minimize
+        max_iter (int): maximum number of passes over the design
+        seed (int, optional): seed of the random initial design
+        ridge (float): regularization of the initial information matrix, so that
+            designs with fewer points than terms can still be improved
+
+    Returns:
+        List[int]: indices of the selected candidates
+    """
+    F = np.asarray(F, dtype=float)
+    if n_points >= len(F):
+        return list(range(len(F)))
+    rng = np.random.default_rng(seed)
+    design = rng.choice(len(F), size=n_points, replace=False)
+    in_design = np.zeros(len(F), dtype=bool)
+    in_design[design] = True
+    p = F.shape[1]
+    V = np.linalg.inv(F[design].T @ F[design] + ridge * np.eye(p))
+
+    for _ in range(max_iter):
+        improved = False
+        for i in range(n_points):
+            f_out = F[design[i]]
+            deltas = criterion.deltas(V, f_out, F)
+            deltas[in_design] = np.inf
+            best = int(np.argmin(deltas))
+            if not deltas[best] < -tol:
+                continue
+            V = _exchange_update(V, F[best], f_out)
+            in_design[design[i]] = False
+            in_design[best] = True
+            design[i] = best
+            improved = True
+        if not improved:
+            break
+    return design.tolist()
+
+
+def _step_range(x, direction, lower, upper, tol=1e-12):
+    """Range [t_min, t_max] of the steps t such that lower <= x + t * direction <= upper."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_lower = (lower - x) / direction
+        to_upper = (upper - x) / direction
+    moving = np.abs(direction) > tol
+    t_min = np.max(np.where(moving, np.minimum(to_lower, to_upper), -np.inf))
+    t_max = np.min(np.where(moving, np.maximum(to_lower, to_upper), np.inf))
+    return max(t_min, -1.0), min(t_max, 1.0)
+
+
+def _cox_direction(x, j, eps=1e-12):
+    """
+    Cox direction of component j: x_j varies and the other components absorb the change
+    in proportion to their current values, so that the mixture still sums to 1.
+    """
+    direction = -x.copy()
+    rest = 1.0 - x[j]
+    if rest < eps:
+        # Pure component: the others share the change equally
+        direction[:] = 1.0 / (len(x) - 1)
+        direction[j] = -1.0
+    else:
+        direction[j] = rest
+    return direction
+
+
+def _search_directions(x):
+    """
+    Directions explored for a design point: the Cox direction of each component, then
+    the pairwise exchanges e_j - e_l. The latter let points slide along the faces of the
+    region, where Cox directions are often blocked by another bound.
+    """
+    k = len(x)
+    for j in range(k):
+        yield _cox_direction(x, j)
+    identity = np.eye(k)
+    for j, l in combinations(range(k), 2):
+        yield identity[j] - identity[l]
+
+
+def coordinate_exchange(n_points, criterion, lower, upper, degree=1, n_steps=21,
+                        max_iter=50, seed=None, ridge=1e-8, tol=1e-10, rtol=1e-4):
+    """
+    Coordinate-exchange optimization of a continuous design in the constrained region
+    (Piepel, Cox-direction variant).
+
+    Each design point is moved along the Cox direction of each component, then along
+    the pairwise exchange directions: `n_steps` feasible steps are evaluated at once with
+    the criterion's incremental update, and the best one is kept if it improves the loss. No candidate set is built, so memory
+    stays O(n_points * p) whatever the resolution of the search.
+
+    Parameters:
+        n_points (int): number of design points
+        criterion (DesignCriterion): loss to minimize
+        lower, upper (array-like): (k,) component bounds, as proportions
+        degree (int): degree of the Scheffé model
+        n_steps (int): number of steps evaluated by each line search
+        max_iter (int): maximum number of passes over the design
+        seed (int, optional): seed of the random initial design
+        rtol (float): the search stops when a pass improves the loss by less than this
+            relative amount
+
+    Returns:
+        ndarray: (n_points, k) design
+    """
+    from src.algo.constraints import effective_bounds, feasible_vertices
+    lower, upper = effective_bounds(lower, upper)
+    vertices = feasible_vertices(lower, upper)
+    if len(vertices) == 0:
+        raise ValueError("Constrained region is empty")
+    # Random initial design: random convex combinations of the vertices (always feasible),
+    # with sparse weights so that the points are spread out rather than gathered at the centre
+    rng = np.random.default_rng(seed)
+    design = rng.dirichlet(np.full(len(vertices), 0.2), size=n_points) @ vertices
+    F = model_matrix(design, degree)
+    fractions = np.linspace(0.0, 1.0, n_steps)
+
+    def dispersion():
+        # The ridge is relative to the scale of the information matrix
+        M = F.T @ F
+        return np.linalg.inv(M + ridge * np.trace(M) / len(M) * np.eye(len(M)))
+
+    previous_loss = np.inf
+    for _ in range(max_iter):
+        loss = criterion.loss(F)
+        if np.isfinite(previous_loss) and previous_loss - loss <= rtol * abs(loss):
+            break
+        previous_loss = loss
+        for i in range(n_points):
+            # Refactorized for each point (O(p^3), cheap next to the line searches), so that
+            # rounding errors of the rank-2 updates do not build up on ill-conditioned models
+            V = dispersion()
+            # design[i] is a view: directions follow the moves of the point
+            for direction in _search_directions(design[i]):
+                x = design[i]
+                t_min, t_max = _step_range(x, direction, lower, upper)
+                if t_max - t_min < 1e-9:
+                    continue
+                steps = t_min + (t_max - t_min) * fractions
+                trials = np.clip(x + steps[:, None] * direction, lower, upper)
+                deltas = criterion.deltas(V, F[i], model_matrix(trials, degree))
+                best = int(np.argmin(deltas))
+                if not deltas[best] < -tol:
+                    continue
+                f_in, f_out = model_matrix(trials[best], degree)[0], F[i].copy()
+                design[i], F[i] = trials[best], f_in
+                try:
+                    V = _exchange_update(V, f_in, f_out)
+                except np.linalg.LinAlgError:
+                    V = dispersion()
+    return design
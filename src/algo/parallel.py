@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+__all__ = [
+    "DEFAULT_CHUNK_BYTES",
+    "chunk_rows",
+    "evaluate_chunked",
+]
+
+# Memory budget of the working arrays of one chunk (e.g. the (rows, N) kernel block of an RBF)
+DEFAULT_CHUNK_BYTES = 16 * 2 ** 20
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    """Thread pool shared by all evaluations (one thread per core), created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="grid")
+        return _executor
+
+
+def chunk_rows(row_bytes, max_bytes=DEFAULT_CHUNK_BYTES, minimum=256):
+    """
+    Number of rows per chunk so that the working memory of a chunk stays within `max_bytes`.
+
+    Parameters:
+        row_bytes (int): working memory needed to evaluate one row
+        max_bytes (int): memory budget of one chunk
+        minimum (int): lower bound, so that chunks are never too small to amortize a call
+
+    Returns:
+        int: rows per chunk
+    """
+    return max(int(minimum), int(max_bytes // max(int(row_bytes), 1)))
+
+
+def evaluate_chunked(evaluate, points, chunk_size, max_workers=None, progress=None):
+    """
+    Evaluate a vectorized function on many points, in chunks evaluated on a thread pool.
+
+    NumPy and SciPy release the GIL in their compiled kernels (BLAS products, distance
+    computations), so the chunks of a fine grid run on all cores. Only the chunks being
+    evaluated hold working memory: the peak is about `workers * chunk_size` rows, whatever
+    the number of points.
+
+    Parameters:
+        evaluate (callable): maps (C, ...) points to (C,) or (C, R) values; must be thread safe
+        points (array-like): (P, ...) points
+        chunk_size (int): rows per chunk
+        max_workers (int, optional): threads used (default: the shared pool, one thread per
+            core; 1 evaluates the chunks in the calling thread)
+        progress (callable, optional): progress(done, total) called in the calling thread
+            after each chunk
+
+    Returns:
+        ndarray: (P,) or (P, R) values, in the order of `points`
+    """
+    points = np.asarray(points, dtype=float)
+    chunk_size = max(1, int(chunk_size))
+    starts = range(0, len(points), chunk_size)
+    total = len(starts)
+    if total <= 1 or max_workers == 1:
+        results = []
+        for done, start in enumerate(starts, 1):
+            results.append(np.asarray(evaluate(points[start:start + chunk_size]), dtype=float))
+            if progress is not None:
+                progress(done, total)
+        return np.concatenate(results) if results else np.asarray(evaluate(points), dtype=float)
+
+    executor = _shared_executor() if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(evaluate, points[start:start + chunk_size]): start for start in starts}
+        values = None
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk = np.asarray(future.result(), dtype=float)
+                if values is None:
+                    values = np.empty((len(points),) + chunk.shape[1:])
+                start = futures[future]
+                values[start:start + len(chunk)] = chunk
+                if progress is not None:
+                    progress(done, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return values
+    finally:
+        if executor is not _executor:
+            executor.shutdown(wait=True)
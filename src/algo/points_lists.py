@@ -1,15 +1,45 @@
-from itertools import combinations_with_replacement, combinations
 import numpy as np
+from src.algo.optimality import coordinate_exchange, exchange, make_criterion, model_matrix
+from src.algo.simplex import lattice_counts, lattice_size
 from src.interface.utils.data_processing import cartesian_to_ternary, ternary_to_cartesian
 
 __all__ = [
+    "MixtureDesign",
     "SimplexCentroid",
     "ScheffeNetwork",
     "TypeIIIPlan",
+    "ContinuousOptimalPlan",
     "SimplexCentroidGrowth",
+    "lattice_size",
+    "lattice_counts",
     ]
 
-class SimplexCentroid:
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class MixtureDesign:
+    """
+    Base class of the mixture designs: `design[k, m]` returns an (N, k) array of
+    proportions, and `iter_chunks` streams it by blocks.
+    """
+    order = True
+
+    def __getitem__(self, config):
+        raise NotImplementedError()
+
+    def iter_chunks(self, config, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Iterate over the design by blocks of at most `chunk_size` points.
+
+        Yields:
+            ndarray: (n, k) points
+        """
+        points = self[config]
+        for start in range(0, len(points), chunk_size):
+            yield points[start:start + chunk_size]
+
+
+class SimplexCentroid(MixtureDesign):
     """
     A class to represent a simplex centroid mixture design.
 
@@ -30,31 +60,25 @@ class SimplexCentroid:
                 - m: degree of the model to approximate
 
         Returns:
-            List[Tuple[float, ...]]: list of points (each point is a tuple of k proportions)
+            ndarray: (N, k) points, each row being the k proportions of a mixture
         """
         k, m = config
         assert m < k, "Degree m must be less than number of components k"
         if m < 1 or k < 1:
             raise ValueError("k and m must be >= 1")
 
-        points = []
-
-        # For each degree d from 1 to m
-        for d in range(1, m + 1):
-            # Generate all combinations of d components (no repetition in indices)
-            for combo in combinations(range(k), d):
-                # Create a proportion vector for this combination
-                p = [0.0] * k
-                for idx in combo:
-                    p[idx] = 1.0 / d
-                # Repeat this configuration m times (as in standard centroid design)
-                points.append(tuple(p))
+        # Every non-empty subset of components, as a (2^k - 1, k) indicator matrix
+        masks = np.arange(1, 2 ** k)
+        indicators = (masks[:, None] >> np.arange(k)) & 1
+        sizes = indicators.sum(axis=1)
+        indicators, sizes = indicators[sizes <= m], sizes[sizes <= m]
+        # Same order as combinations(range(k), d) for d = 1..m
+        keys = [-indicators[:, i] for i in reversed(range(k))] + [sizes]
+        order = np.lexsort(keys)
+        points = indicators[order] / sizes[order, None]
 
         # Add the centroid point: all components equal
-        centroid = tuple([1.0 / k] * k)
-        points.append(centroid)
-
-        return points
+        return np.vstack((points, np.full((1, k), 1.0 / k)))
 
 
 class SimplexCentroidGrowth(SimplexCentroid):
@@ -65,7 +89,7 @@ class SimplexCentroidGrowth(SimplexCentroid):
         - all mixtures of 1 to k components in equal proportions,
         - repeated according to the degree m,
         - totaling k * m + 1 points.
-        - center of the 3 sub-triangles (only for k=3)
+        - center of the k sub-simplices at the vertices (3 sub-triangles for k=3)
     """
     order = False
 
@@ -79,50 +103,32 @@ class SimplexCentroidGrowth(SimplexCentroid):
                 - m: degree of the model to approximate
 
         Returns:
-            List[Tuple[float, ...]]: list of points (each point is a tuple of k proportions)
+            ndarray: (N, k) points, each row being the k proportions of a mixture
         """
-        points = super().__getitem__((3, 2))
         k, m = config
-        assert k==3, "Only k=3 is supported for growth design"
-
-        # Generate the growth points (centroid of the 3 sub-triangles)
-        growth_points = []
-        triangles = [
-            [
-                (1, 0, 0),
-                (0.5, 0.5, 0),
-                (0.5, 0, 0.5),
-            ],
-            [
-                (0, 1, 0),
-                (0.5, 0.5, 0),
-                (0, 0.5, 0.5),
-            ],
-            [
-                (0, 0, 1),
-                (0.5, 0, 0.5),
-                (0, 0.5, 0.5),
-            ]
-        ]
-        for triangle in triangles:
-            # Calculate the centroid of the triangle
-            centroid = tuple(sum(coord) / len(triangle) for coord in zip(*triangle))
-            growth_points.append(centroid)
+        if k < 3:
+            raise ValueError("k must be >= 3 for growth design")
+        points = super().__getitem__((k, 2))
 
-        # Add the growth points to the existing points
-        points.extend(growth_points)
+        # Generate the growth points: centroid of the sub-simplex made of a vertex
+        # and the midpoints of its k-1 edges
+        growth_points = np.full((k, k), 0.5 / k)
+        np.fill_diagonal(growth_points, (1 + 0.5 * (k - 1)) / k)
 
-        return points
+        # Add the growth points to the existing points
+        return np.vstack((points, growth_points))
 
 
-class ScheffeNetwork:
+class ScheffeNetwork(MixtureDesign):
     """
     Generate a simplex lattice (Scheffé network) design.
 
     A (k, m) network corresponds to all combinations of (k) components
     whose proportions are multiples of 1/m and sum to 1.
 
-    The resulting design has C(m + k - 1, m) points.
+    The resulting design has C(m + k - 1, m) points. It is built with vectorized
+    stars-and-bars arithmetic (see `lattice_counts`), and `iter_chunks` streams large
+    lattices block by block without materializing them.
     """
     order = True
 
@@ -134,30 +140,73 @@ class ScheffeNetwork:
                 - m: number of subdivisions of the simplex (m+1 levels)
 
         Returns:
-            List[Tuple[float, ...]]: list of points in the mixture space
+            ndarray: (C(m + k - 1, m), k) points in the mixture space
+        """
+        k, m = self._check(config)
+        return lattice_counts(k, m) / m
+
+    def iter_chunks(self, config, chunk_size=DEFAULT_CHUNK_SIZE):
         """
+        Lazily iterate over the lattice by blocks of at most `chunk_size` points,
+        in the same order as `__getitem__`.
+
+        Yields:
+            ndarray: (n, k) points
+        """
+        k, m = self._check(config)
+        for start in range(0, lattice_size(k, m), chunk_size):
+            yield lattice_counts(k, m, start, start + chunk_size) / m
+
+    @staticmethod
+    def _check(config):
         k, m = config
         if k < 1 or m < 1:
             raise ValueError("k and m must be >= 1")
-
-        # Generate all integer partitions of m into k non-negative integers
-        # such that sum(p) == m
-        grid_points = []
-        for parts in combinations_with_replacement(range(k), m):
-            counts = [0] * k
-            for i in parts:
-                counts[i] += 1
-            point = tuple(c / m for c in counts)
-            grid_points.append(point)
-
-        return grid_points
+        return k, m
 
 
 class TypeIIIPlan:
-    def __init__(self, polygon):
-        self.polygon = [tuple([x/100, y/100, z/100]) for (x, y, z) in polygon]
+    """
+    Optimal design in a constrained region (vertices, edge midpoints and centre of
+    the feasible polytope, reduced with Fedorov's exchange algorithm for the D-, I- or
+    A-optimality criterion).
+
+    Parameters:
+        polygon (list): vertices of the region, in percent (any number of components)
+        edges (array-like, optional): vertex index pairs; by default consecutive
+            vertices of the (ordered) polygon are linked
+        seed (int, optional): seed of the random initial design of the exchange, so that
+            a given configuration always yields the same (cacheable) design
+        criterion (str): optimality criterion of the exchange, "D" (det of the
+            information matrix), "I" (average prediction variance over the region)
+            or "A" (mean variance of the coefficients)
+        degree (int): degree of the Scheffé model the design is optimized for
+    """
+    def __init__(self, polygon, edges=None, seed=0, criterion="D", degree=1):
+        self.polygon = [tuple(x / 100 for x in vertex) for vertex in polygon]
+        self.edges = edges
+        self.seed = seed
+        self.criterion = criterion
+        self.degree = degree
+        self.bounds = None
         self.points = self.generate_points()
         self.order = False
+
+    @classmethod
+    def from_bounds(cls, lower, upper):
+        """
+        Build the plan from component bounds (proportions), for any number of components.
+        """
+        from src.algo.constraints import feasible_vertices, polytope_edges, order_polygon
+        vertices = feasible_vertices(lower, upper)
+        if len(vertices) == 0:
+            raise ValueError("Constrained region is empty")
+        if vertices.shape[1] == 3:
+            plan = cls(order_polygon(vertices) * 100)
+        else:
+            plan = cls(vertices * 100, edges=polytope_edges(vertices, lower, upper))
+        plan.bounds = (np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+        return plan
     
     def generate_points(self):
         # Generate points based on the polygon :
@@ -168,14 +217,16 @@ class TypeIIIPlan:
         # Sommets
         points.extend(self.polygon)
         # Milieux des arêtes
-        # Milieux des arêtes
-        edges = [(self.polygon[i], self.polygon[(i + 1) % len(self.polygon)]) for i in range(len(self.polygon))]
+        if self.edges is None:
+            edges = [(self.polygon[i], self.polygon[(i + 1) % len(self.polygon)]) for i in range(len(self.polygon))]
+        else:
+            edges = [(self.polygon[i], self.polygon[j]) for i, j in self.edges]
         for edge in edges:
             edge_mid_point = tuple((edge[0][l] + edge[1][l]) / 2 for l in range(len(edge[0])))
             points.append(edge_mid_point)
         
         # Milieux des faces (for 3D)
-        if len(self.polygon[0]) == 4:
+        if len(self.polygon[0]) == 4 and self.edges is None:
             for i in range(len(self.polygon)):
                 for j in range(i + 1, len(self.polygon)):
                     for k in range(j + 1, len(self.polygon)):
@@ -186,64 +237,67 @@ class TypeIIIPlan:
         points.append(center)
         return points
 
-    def fedorov_exchange(self, candidates, n_points, max_iter=100):
+    def fedorov_exchange(self, candidates, n_points, max_iter=100, seed=None, criterion=None):
         """
-        Implémente l'algorithme d'échange de Fedorov pour sélectionner un plan D-optimal.
-        
+        Implémente l'algorithme d'échange de Fedorov pour sélectionner un plan optimal.
+
         :param candidates: ndarray, ensemble des points candidats
-        :param model_func: fonction, génère la matrice de régression à partir des points
         :param n_points: int, nombre de points à sélectionner
         :param max_iter: int, nombre maximal d'itérations
-        :return: ndarray, sous-ensemble D-optimal de points
+        :param seed: int, graine du tirage du plan initial (None : tirage non reproductible)
+        :param criterion: str, critère d'optimalité ("D", "I" ou "A"), par défaut celui du plan
+        :return: list, indices des points sélectionnés
         """
-        import random
-
-        if n_points > len(candidates):
-            # Si n_points est supérieur au nombre de candidats, retourner tous les candidats
-            indices = list(range(len(candidates)))
-            return indices
-
-        # Initialisation aléatoire du design
-        indices = list(range(len(candidates)))
-        candidates = np.array(candidates)
-        current_indices = random.sample(indices, n_points)
-        current_design = candidates[current_indices]
-        current_X = current_design
-        current_det = np.linalg.det(current_X.T @ current_X)
-
-        improved = True
-        iter_count = 0
-
-        while improved and iter_count < max_iter:
-            improved = False
-            iter_count += 1
-            for i in range(n_points):
-                for j in set(indices) - set(current_indices):
-                    # Essayer d'échanger le point i avec le point j
-                    new_indices = current_indices.copy()
-                    new_indices[i] = j
-                    new_design = candidates[new_indices]
-                    new_X = new_design
-                    try:
-                        new_det = np.linalg.det(new_X.T @ new_X)
-                    except np.linalg.LinAlgError:
-                        continue  # matrice singulière, passer
-                    if new_det > current_det:
-                        # Accepter l'échange
-                        current_indices = new_indices
-                        current_det = new_det
-                        improved = True
-                        break  # sortir de la boucle interne
-                if improved:
-                    break  # sortir de la boucle externe
-        
-        return current_indices
+        criterion = make_criterion(criterion or self.criterion, self.polygon, self.degree)
+        F = model_matrix(candidates, self.degree)
+        return exchange(F, n_points, criterion, max_iter=max_iter, seed=seed)
 
     def __getitem__(self, config):
         n_points = config[1] if len(config) > 1 else 15
         n_points = len(self.points) if n_points == 0 else n_points
         # Return the generated points for the given hull
-        return [self.points[i] for i in self.fedorov_exchange(self.points, n_points=n_points)]
+        return np.asarray(self.points)[self.fedorov_exchange(self.points, n_points=n_points, seed=self.seed)]
+
+
+
+class ContinuousOptimalPlan(MixtureDesign):
+    """
+    Optimal design in a constrained region, whose points move continuously inside the
+    feasible polytope (coordinate exchange) instead of being picked among candidates.
+
+    Parameters:
+        lower, upper (array-like): (k,) component bounds, as proportions
+        seed (int, optional): seed of the random initial design
+        criterion (str): optimality criterion, "D", "I" or "A"
+        degree (int): degree of the Scheffé model the design is optimized for
+    """
+    order = True
+
+    def __init__(self, lower, upper, seed=0, criterion="D", degree=1):
+        from src.algo.constraints import feasible_vertices
+        self.bounds = (np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+        self.polygon = feasible_vertices(*self.bounds)
+        if len(self.polygon) == 0:
+            raise ValueError("Constrained region is empty")
+        self.seed = seed
+        self.criterion = criterion
+        self.degree = degree
+
+    def __getitem__(self, config):
+        """
+        Parameters:
+            config (tuple): (k, n_points); n_points = 0 keeps as many points as model terms + 5
+
+        Returns:
+            ndarray: (n_points, k) design
+        """
+        k, n_points = config
+        if k != len(self.bounds[0]):
+            raise ValueError("k does not match the number of bounds")
+        if n_points == 0:
+            n_points = model_matrix(self.polygon[:1], self.degree).shape[1] + 5
+        criterion = make_criterion(self.criterion, self.polygon, self.degree)
+        return coordinate_exchange(n_points, criterion, *self.bounds, degree=self.degree, seed=self.seed)
 
 
 if __name__ == "__main__":
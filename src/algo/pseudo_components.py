@@ -0,0 +1,82 @@
+from functools import lru_cache
+import numpy as np
+from src.algo.constraints import effective_bounds
+
+__all__ = [
+    "PseudoComponents",
+    "pseudo_components",
+]
+
+
+class PseudoComponents:
+    """
+    Pseudo-component transform of a constrained mixture region.
+
+    L-pseudo-components map the unit simplex onto the simplex {x >= L}:
+        x = L + (1 - sum(L)) * z
+    U-pseudo-components map it onto the inverted simplex {x <= U}:
+        x = U - (sum(U) - 1) * z
+    Both mappings are affine, so whole (N, k) arrays are converted in a single operation
+    and converted points always sum to 1.
+
+    Parameters:
+        lower, upper (array-like): (k,) component bounds, as proportions (tightened with
+            `effective_bounds`)
+        kind (str): "L", "U", or "auto" to pick the pseudo-simplex with the smaller range
+            (the one fitting the region more closely)
+    """
+
+    def __init__(self, lower, upper, kind="auto"):
+        self.lower, self.upper = effective_bounds(lower, upper)
+        range_l = 1.0 - self.lower.sum()
+        range_u = self.upper.sum() - 1.0
+        if range_l < 0 or range_u < 0:
+            raise ValueError("Constrained region is empty")
+        if kind == "auto":
+            kind = "L" if range_l <= range_u else "U"
+        if kind == "L":
+            self.origin, self.scale = self.lower, range_l
+        elif kind == "U":
+            self.origin, self.scale = self.upper, -range_u
+        else:
+            raise ValueError(f"Unknown pseudo-component kind {kind!r}, expected 'L', 'U' or 'auto'")
+        if abs(self.scale) < 1e-12:
+            raise ValueError("Constrained region is reduced to a single point")
+        self.kind = kind
+        self.origin.setflags(write=False)
+
+    def to_mixture(self, pseudo):
+        """
+        Pseudo-components -> mixture proportions.
+
+        Parameters:
+            pseudo (array-like): (N, k) or (k,) pseudo-component proportions
+
+        Returns:
+            ndarray: mixture proportions, same shape
+        """
+        return self.origin + self.scale * np.asarray(pseudo, dtype=float)
+
+    def from_mixture(self, mixture):
+        """
+        Mixture proportions -> pseudo-components (inverse of `to_mixture`).
+        """
+        return (np.asarray(mixture, dtype=float) - self.origin) / self.scale
+
+    def covers(self, mixture, tol=1e-9):
+        """Whether mixtures lie in the pseudo-simplex (non-negative pseudo-components)."""
+        return np.all(np.atleast_2d(self.from_mixture(mixture)) >= -tol, axis=1)
+
+
+@lru_cache(maxsize=32)
+def _cached(lower, upper, kind):
+    return PseudoComponents(lower, upper, kind)
+
+
+def pseudo_components(lower, upper, kind="auto"):
+    """
+    Pseudo-component transform of a bound set, cached so that repeated conversions
+    (design generation, rendering, export) reuse the same mapping.
+    """
+    key = lambda bounds: tuple(np.round(np.asarray(bounds, dtype=float), 12).tolist())
+    return _cached(key(lower), key(upper), kind)
@@ -0,0 +1,122 @@
+import numpy as np
+from src.algo.simplex import lattice_counts
+
+__all__ = [
+    "AdaptiveMesh",
+    "refine_mesh",
+]
+
+SQRT3_OVER_2 = np.sqrt(3) / 2
+
+
+class AdaptiveMesh:
+    """
+    Non-uniform triangular mesh of the ternary diagram with the model values at its vertices.
+
+    Attributes:
+        points (ndarray): (N, 3) ternary coordinates of the vertices (rows sum to 1)
+        values (ndarray): (N,) values at the vertices (nan where the model is not shown)
+        triangles (ndarray): (T, 3) vertex indices of a conforming triangulation
+        n_evaluations (int): number of model evaluations used to build the mesh
+    """
+
+    def __init__(self, points, values, triangles, n_evaluations):
+        self.points = points
+        self.values = values
+        self.triangles = triangles
+        self.n_evaluations = n_evaluations
+
+    def cartesian(self, scale=1.0):
+        """(N, 2) planar coordinates, same convention as ternary.helpers.project_point."""
+        x = (self.points[:, 0] + self.points[:, 1] / 2) * scale
+        y = self.points[:, 1] * SQRT3_OVER_2 * scale
+        return np.column_stack((x, y))
+
+    def masked_triangles(self):
+        """(T,) booleans, True for the triangles having a vertex without value."""
+        return ~np.all(np.isfinite(self.values[self.triangles]), axis=1)
+
+
+def _uniform_triangles(level, step):
+    """
+    Triangles of the uniform subdivision of the simplex in `level` parts per side, as
+    (T, 3, 2) integer (i, j) coordinates multiplied by `step`.
+    """
+    counts = lattice_counts(3, level)[:, :2]
+    up = counts[counts.sum(axis=1) <= level - 1]
+    down = counts[counts.sum(axis=1) <= level - 2]
+    corners_up = np.array([[0, 0], [1, 0], [0, 1]])
+    corners_down = np.array([[1, 0], [0, 1], [1, 1]])
+    triangles = np.concatenate((up[:, None] + corners_up, down[:, None] + corners_down))
+    return triangles * step
+
+
+def refine_mesh(evaluate, level=16, max_depth=3, tol=0.02):
+    """
+    Adaptive triangular refinement of a function over the ternary diagram.
+
+    The simplex is first split uniformly in `level` parts per side. Then, at each depth,
+    the triangles whose vertex values spread by more than `tol` times the range of the
+    values (or that cross the boundary of the region where the function is defined) are
+    split in four through their edge midpoints. All the new vertices of a depth are
+    evaluated in a single batch. The final vertices are triangulated again (Delaunay), so
+    that the mesh is conforming and can be drawn as one artist.
+
+    Parameters:
+        evaluate (callable): maps (M, 3) ternary points to (M,) values, nan where undefined
+        level (int): subdivisions per side of the initial uniform mesh
+        max_depth (int): maximum number of refinements of a triangle
+        tol (float): relative variation above which a triangle is refined
+
+    Returns:
+        AdaptiveMesh: vertices, values and triangles of the mesh
+    """
+    from scipy.spatial import Delaunay
+    scale = level * 2 ** max_depth  # vertex coordinates are integers at this scale
+    triangles = _uniform_triangles(level, 2 ** max_depth)
+
+    def keys_of(coordinates):
+        return coordinates[..., 0] * (scale + 1) + coordinates[..., 1]
+
+    def points_of(keys):
+        ij = np.column_stack((keys // (scale + 1), keys % (scale + 1)))
+        return np.column_stack((ij, scale - ij.sum(axis=1))) / scale
+
+    def evaluate_keys(keys):
+        return np.asarray(evaluate(points_of(keys)), dtype=float)
+
+    keys = np.unique(keys_of(triangles))
+    values = evaluate_keys(keys)
+    finite = values[np.isfinite(values)]
+    threshold = tol * (finite.max() - finite.min()) if len(finite) else np.inf
+
+    for _ in range(max_depth):
+        vertex_values = values[np.searchsorted(keys, keys_of(triangles))]
+        defined = np.isfinite(vertex_values)
+        # fmax/fmin ignore nan (the spread stays nan, hence not refined, if all are nan)
+        spread = np.fmax.reduce(vertex_values, axis=1) - np.fmin.reduce(vertex_values, axis=1)
+        crossing = defined.any(axis=1) & ~defined.all(axis=1)
+        split = (spread > threshold) | crossing
+        if not split.any():
+            break
+        # Red refinement: 4 children through the edge midpoints
+        a, b, c = triangles[split, 0], triangles[split, 1], triangles[split, 2]
+        ab, bc, ca = (a + b) // 2, (b + c) // 2, (c + a) // 2
+        children = np.concatenate((
+            np.stack((a, ab, ca), axis=1),
+            np.stack((ab, b, bc), axis=1),
+            np.stack((ca, bc, c), axis=1),
+            np.stack((ab, bc, ca), axis=1),
+        ))
+        triangles = np.concatenate((triangles[~split], children))
+        # Batch evaluation of the midpoints not already known
+        new_keys = np.setdiff1d(keys_of(np.concatenate((ab, bc, ca))), keys)
+        if len(new_keys):
+            keys = np.concatenate((keys, new_keys))
+            values = np.concatenate((values, evaluate_keys(new_keys)))
+            order = np.argsort(keys)
+            keys, values = keys[order], values[order]
+
+    mesh = AdaptiveMesh(points_of(keys), values, None, len(keys))
+    mesh.triangles = Delaunay(mesh.cartesian()).simplices
+    return mesh
@@ -0,0 +1,214 @@
+import importlib
+import os
+from collections import OrderedDict
+
+__all__ = [
+    "RegistryEntry",
+    "Registry",
+    "INTERPOLATORS",
+    "DESIGNS",
+]
+
+# Entries are declared by import path ("package.module:attribute"); the module is only
+# imported when the entry is first used, so that registering an implementation (for example
+# a site-specific model) costs nothing at startup.
+
+
+def _import_target(target):
+    """Resolve "package.module:attribute.sub" (entry point syntax) to the object."""
+    module_name, _, attribute = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in filter(None, attribute.split(".")):
+        obj = getattr(obj, name)
+    return obj
+
+
+class RegistryEntry:
+    """
+    One implementation of a registry: an import path, loaded on first use, and its metadata.
+
+    Metadata declared at registration is available without importing anything (to fill
+    selectors, tooltips, ...). When the entry is loaded, the `registry_metadata` dict of the
+    loaded object, if it has one, completes it and takes precedence: the implementation is
+    the reference (e.g. the point counts of an interpolator class).
+
+    Parameters:
+        name (str): name shown to the user
+        target (str or object): "package.module:attribute" import path, or the object itself
+        metadata (dict, optional): description of the implementation
+    """
+
+    def __init__(self, name, target, metadata=None):
+        self.name = name
+        self.target = target
+        self.metadata = dict(metadata or {})
+        self._object = None if isinstance(target, str) else target
+
+    @property
+    def loaded(self):
+        return self._object is not None
+
+    def load(self):
+        """The implementation, imported on the first call."""
+        if self._object is None:
+            self._object = _import_target(self.target)
+            self.metadata.update(getattr(self._object, "registry_metadata", {}))
+        return self._object
+
+    def __repr__(self):
+        return f"RegistryEntry({self.name!r}, {self.target!r}, loaded={self.loaded})"
+
+
+class Registry:
+    """
+    Named implementations (interpolators, designs, ...) imported only when selected.
+
+    Implementations are found in three ways, in this order:
+        - `register` calls (the built-in implementations below);
+        - the `group` entry points of the installed packages, e.g. in a pyproject.toml:
+              [project.entry-points."mixplan.interpolators"]
+              Kriging = "site_models.kriging:KrigingInterpolator"
+        - the `env_var` environment variable, a ";"-separated list of name=module:attribute,
+          e.g. MIXPLAN_INTERPOLATORS="Kriging=site_models.kriging:KrigingInterpolator".
+    Discovery only reads the package metadata: no plugin module is imported before its
+    entry is used. A later definition of a name replaces the earlier one.
+
+    Parameters:
+        kind (str): what the registry holds (for error messages)
+        group (str, optional): entry point group
+        env_var (str, optional): environment variable listing extra entries
+    """
+
+    def __init__(self, kind, group=None, env_var=None):
+        self.kind = kind
+        self.group = group
+        self.env_var = env_var
+        self._entries = OrderedDict()
+        self._discovered = False
+
+    def register(self, name, target, **metadata):
+        """
+        Declare an implementation.
+
+        Parameters:
+            name (str): name shown to the user
+            target (str or object): "package.module:attribute" import path, or the object
+            **metadata: description of the implementation (see INTERPOLATORS and DESIGNS)
+
+        Returns:
+            RegistryEntry: the new entry
+        """
+        entry = RegistryEntry(name, target, metadata)
+        self._entries[name] = entry
+        return entry
+
+    def discover(self):
+        """Add the entries of the entry point group and of the environment variable (once)."""
+        if self._discovered:
+            return
+        self._discovered = True
+        if self.group:
+            from importlib.metadata import entry_points
+            for entry_point in entry_points(group=self.group):
+                self.register(entry_point.name, entry_point.value)
+        if self.env_var:
+            for item in filter(None, (part.strip() for part in os.environ.get(self.env_var, "").split(";"))):
+                name, separator, target = item.partition("=")
+                if not separator or ":" not in target:
+                    raise ValueError(f"Invalid {self.env_var} entry {item!r}, expected name=module:attribute")
+                self.register(name.strip(), target.strip())
+
+    def entries(self, **metadata):
+        """
+        Entries whose metadata match all the given values (a missing flag counts as False).
+        """
+        self.discover()
+        return [
+            entry for entry in self._entries.values()
+            if all(entry.metadata.get(key, False if isinstance(value, bool) else None) == value
+                   for key, value in metadata.items())
+        ]
+
+    def names(self, **metadata):
+        """Names of the entries matching `metadata` (see `entries`), in registration order."""
+        return [entry.name for entry in self.entries(**metadata)]
+
+    def entry(self, name):
+        self.discover()
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown {self.kind} {name!r}, expected one of {list(self._entries)}") from None
+
+    def metadata(self, name):
+        """Metadata of an entry, without loading it."""
+        return self.entry(name).metadata
+
+    def __getitem__(self, name):
+        """The implementation registered as `name`, imported on first use."""
+        return self.entry(name).load()
+
+    def __contains__(self, name):
+        self.discover()
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        self.discover()
+        return len(self._entries)
+
+
+# Interpolators: classes built with (points, scores), see src.algo.interpolator.Interpolator.
+# Metadata:
+#   min_points, max_points (int or None): number of points needed with 3 components
+#       (the class method `min_points(k)` gives the exact number for k components). They
+#       preview the class values without importing it; the loaded class replaces them, and
+#       tests/test_registry.py checks that the declarations agree with the classes.
+#   batch (bool): `predict` evaluates many points in one vectorized call
+#   uncertainty (bool): the model also predicts the uncertainty of its predictions
+INTERPOLATORS = Registry("interpolator", group="mixplan.interpolators", env_var="MIXPLAN_INTERPOLATORS")
+INTERPOLATORS.register(
+    "RBF", "src.algo.interpolator:RBFInterpolator",
+    min_points=3, max_points=None, batch=True, uncertainty=False,
+    description="Fonctions de base radiales (interpolation exacte)",
+)
+INTERPOLATORS.register(
+    "Quadratic", "src.algo.interpolator:QuadraticInterpolator",
+    min_points=7, max_points=None, batch=True, uncertainty=False,
+    description="Modèle de Scheffé quadratique (moindres carrés)",
+)
+INTERPOLATORS.register(
+    "Linear", "src.algo.interpolator:LinearInterpolator",
+    min_points=3, max_points=None, batch=True, uncertainty=False,
+    description="Modèle de Scheffé linéaire (moindres carrés)",
+)
+
+# Designs. Metadata:
+#   constrained (bool): the design is built for the constraint bounds: the target is then a
+#       factory(lower, upper) whose result has `bounds`, `criterion`, `polygon`, `degree` and
+#       `seed` attributes; otherwise the target is a class built without arguments
+#   order (bool): the design depends on the order field (for constrained designs the field
+#       is always the number of points)
+DESIGNS = Registry("design", group="mixplan.designs", env_var="MIXPLAN_DESIGNS")
+DESIGNS.register(
+    "SimplexCentroid", "src.algo.points_lists:SimplexCentroid", constrained=False, order=True,
+    description="Simplex centroïde",
+)
+DESIGNS.register(
+    "ScheffeNetwork", "src.algo.points_lists:ScheffeNetwork", constrained=False, order=True,
+    description="Réseau de Scheffé",
+)
+DESIGNS.register(
+    "SimplexCentroidGrowth", "src.algo.points_lists:SimplexCentroidGrowth", constrained=False, order=False,
+    description="Simplex centroïde avec croissance",
+)
+DESIGNS.register(
+    "Type III", "src.algo.points_lists:TypeIIIPlan.from_bounds", constrained=True, order=False,
+    description="Plan optimal, échange de Fedorov parmi des candidats",
+)
+DESIGNS.register(
+    "Type III continu", "src.algo.points_lists:ContinuousOptimalPlan", constrained=True, order=True,
+    description="Plan optimal, échange de coordonnées continu",
+)
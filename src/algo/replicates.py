@@ -0,0 +1,149 @@
+import numpy as np
+
+# scipy is imported on first use (neighbour search of the grouping, p-values of the
+# lack-of-fit test)
+
+__all__ = [
+    "KEY_DECIMALS",
+    "REPLICATE_TOLERANCE",
+    "ReplicateGroups",
+    "group_replicates",
+]
+
+# Compositions equal once rounded to KEY_DECIMALS decimals (as fractions) are the same point
+# of the experiment when measurements are merged by composition (see watch.merge_measurements)
+KEY_DECIMALS = 3
+# Compositions within this distance (as fractions) of the first composition of a group are
+# replicates of it when fitting; unlike rounding, a tolerance never splits two near-duplicates
+# that straddle a rounding boundary (0.1004999 and 0.1005001)
+REPLICATE_TOLERANCE = 1e-3
+
+
+class ReplicateGroups:
+    """
+    Observations grouped by composition: replicates of a design point share one group.
+
+    Models are fitted on the U group means weighted by the group sizes, which gives the
+    same least-squares coefficients as the N observations, keeps interpolating models
+    (RBF, Delaunay) from receiving duplicate points and makes every fit cost U rather than N.
+    The spread of the replicates around their mean is the pure error, which the lack-of-fit
+    test compares to the distance between the means and the model.
+
+    Attributes:
+        points (ndarray): (U, k) mean composition of each group
+        means (ndarray): (U,) or (U, R) mean responses of each group
+        counts (ndarray): (U,) number of observations of each group
+        inverse (ndarray): (N,) group of each observation
+        ss_pure_error (float or ndarray): sum of squares of the observations around their group mean
+        df_pure_error (int): degrees of freedom of the pure error, N - U
+    """
+
+    def __init__(self, points, means, counts, inverse, ss_pure_error):
+        self.points = points
+        self.means = means
+        self.counts = counts
+        self.inverse = inverse
+        self.ss_pure_error = ss_pure_error
+
+    @property
+    def n_observations(self):
+        return len(self.inverse)
+
+    @property
+    def df_pure_error(self):
+        return self.n_observations - len(self)
+
+    @property
+    def has_replicates(self):
+        return len(self) < self.n_observations
+
+    def __len__(self):
+        return len(self.counts)
+
+    def lack_of_fit(self, predictions, n_params):
+        """
+        Lack-of-fit F-test of a model from its predictions at the group compositions.
+
+        The residual sum of squares of the N observations splits into the pure error (within
+        groups) and the lack of fit, sum(n_g * (mean_g - prediction_g)²), with U - n_params
+        degrees of freedom. F = (SS_lof / df_lof) / (SS_pe / df_pe); a small p-value means
+        the model misses systematic variation that replicates cannot explain.
+
+        Parameters:
+            predictions (array-like): (U,) or (U, R) model predictions at `points`
+            n_params (int): number of fitted coefficients (U for an interpolating model)
+
+        Returns:
+            dict: "ss_lack_of_fit", "df_lack_of_fit", "ss_pure_error", "df_pure_error", "f" and
+            "p_value" (floats, or arrays of R values); f and p_value are nan when the test is
+            not defined (no replicates, or no degree of freedom left for the lack of fit)
+        """
+        predictions = np.asarray(predictions, dtype=float).reshape(np.shape(self.means))
+        weights = self.counts if np.ndim(self.means) == 1 else self.counts[:, None]
+        ss_lof = np.sum(weights * (self.means - predictions) ** 2, axis=0)
+        df_lof, df_pe = len(self) - int(n_params), self.df_pure_error
+        if df_lof > 0 and df_pe > 0:
+            from scipy.stats import f as f_distribution
+            with np.errstate(divide="ignore", invalid="ignore"):
+                f = (ss_lof / df_lof) / (self.ss_pure_error / df_pe)
+            p_value = f_distribution.sf(f, df_lof, df_pe)
+        else:
+            f = p_value = np.full(np.shape(ss_lof), np.nan)
+        as_output = float if np.ndim(ss_lof) == 0 else np.asarray
+        return {
+            "ss_lack_of_fit": as_output(ss_lof), "df_lack_of_fit": df_lof,
+            "ss_pure_error": as_output(self.ss_pure_error), "df_pure_error": df_pe,
+            "f": as_output(f), "p_value": as_output(p_value),
+        }
+
+
+def group_replicates(points, scores, tolerance=REPLICATE_TOLERANCE):
+    """
+    Group the observations whose compositions are within `tolerance` of each other.
+
+    The neighbours of every composition come from one k-d tree query. Groups are then seeded
+    in order: the first observation not yet grouped takes all its ungrouped neighbours, so
+    every member is within `tolerance` of the seed and a group spans at most 2 * `tolerance`
+    (a chain of compositions each close to the next is not merged into one wide group). The
+    group sums of the compositions and responses are computed in one `np.add.reduceat` over
+    the observations sorted by group. Without replicates, the points and scores are kept as
+    they are (same order).
+
+    Parameters:
+        points (array-like): (N, k) compositions (fractions)
+        scores (array-like): (N,) or (N, R) responses
+        tolerance (float): largest distance between replicates
+
+    Returns:
+        ReplicateGroups: the groups, their means and the pure error
+    """
+    points = np.asarray(points, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    n = len(points)
+    neighbours = None
+    if n > 1:
+        from scipy.spatial import cKDTree
+        neighbours = cKDTree(points).query_ball_point(points, tolerance)
+    if neighbours is None or all(len(close) == 1 for close in neighbours):
+        zero = np.zeros(scores.shape[1:]) if scores.ndim > 1 else 0.0
+        return ReplicateGroups(points, scores, np.ones(n, dtype=int), np.arange(n), zero)
+
+    inverse = np.full(n, -1)
+    n_groups = 0
+    for seed, close in enumerate(neighbours):
+        if inverse[seed] < 0:
+            close = np.asarray(close)
+            inverse[close[inverse[close] < 0]] = n_groups
+            n_groups += 1
+    counts = np.bincount(inverse)
+
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    columns = np.column_stack((points, scores.reshape(n, -1)))
+    means = np.add.reduceat(columns[order], starts, axis=0) / counts[:, None]
+    group_points, group_means = means[:, :points.shape[1]], means[:, points.shape[1]:]
+    deviations = scores.reshape(n, -1) - group_means[inverse]
+    ss_pure_error = np.sum(deviations ** 2, axis=0)
+    if scores.ndim == 1:
+        group_means, ss_pure_error = group_means[:, 0], float(ss_pure_error[0])
+    return ReplicateGroups(group_points, group_means, counts, inverse, ss_pure_error)
@@ -0,0 +1,146 @@
+import numpy as np
+from functools import lru_cache
+
+__all__ = [
+    "simplex_to_cartesian",
+    "slice_to_simplex",
+    "project_to_axes",
+    "lattice_size",
+    "lattice_counts",
+]
+
+
+@lru_cache(maxsize=None)
+def _embedding_basis(k):
+    """
+    Orthonormal basis (k, k-1) of the hyperplane sum(x) = 0 (Helmert contrasts),
+    scaled so that the simplex vertices are at distance 1 from each other.
+    """
+    basis = np.zeros((k, k - 1))
+    for j in range(1, k):
+        basis[:j, j - 1] = 1.0 / np.sqrt(j * (j + 1))
+        basis[j, j - 1] = -j / np.sqrt(j * (j + 1))
+    return basis / np.sqrt(2)
+
+
+def simplex_to_cartesian(points):
+    """
+    Isometric embedding of k-component mixtures into R^(k-1).
+
+    Distances between mixtures are preserved (edge length 1), so radial models such as
+    RBF behave the same whatever the number of components. For k = 3 this is the usual
+    equilateral ternary plot, up to a rotation.
+
+    Parameters:
+        points (array-like): (N, k) compositions (rows are normalized to sum to 1)
+
+    Returns:
+        ndarray: (N, k-1) cartesian coordinates
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    total = points.sum(axis=1, keepdims=True)
+    # Avoid division by zero if total is 0
+    total[total == 0] = 1e-10
+    return (points / total) @ _embedding_basis(points.shape[1])
+
+
+def slice_to_simplex(ternary_points, axes, fixed, k):
+    """
+    Map points of a ternary slice back to full k-component mixtures.
+
+    The components that are not displayed are fixed; the three displayed components
+    share the remaining proportion 1 - sum(fixed).
+
+    Parameters:
+        ternary_points (array-like): (N, 3) proportions on the displayed axes (rows sum to 1)
+        axes (tuple): indices of the three displayed components
+        fixed (dict): {component index: proportion} for the other components
+        k (int): number of components
+
+    Returns:
+        ndarray: (N, k) compositions
+    """
+    ternary_points = np.atleast_2d(np.asarray(ternary_points, dtype=float))
+    points = np.zeros((len(ternary_points), k))
+    remaining = 1.0 - sum(fixed.values())
+    points[:, list(axes)] = ternary_points * remaining
+    for index, value in fixed.items():
+        points[:, index] = value
+    return points
+
+
+def project_to_axes(points, axes):
+    """
+    Project k-component mixtures onto three components, renormalized to sum to 1.
+
+    Parameters:
+        points (array-like): (N, k) compositions
+        axes (tuple): indices of the three displayed components
+
+    Returns:
+        ndarray: (N, 3) proportions (rows without any of the three components stay at 0)
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    sub = points[:, list(axes)]
+    total = sub.sum(axis=1, keepdims=True)
+    total[total == 0] = 1.0
+    return sub / total
+
+
+@lru_cache(maxsize=None)
+def _binomial_table(n_max, r_max):
+    """
+    Pascal triangle as an (n_max+1, r_max+1) int64 array: table[n, r] = C(n, r).
+
+    Only the first r_max+1 columns are kept, so the table stays small for very fine lattices.
+    """
+    table = np.zeros((n_max + 1, r_max + 1), dtype=np.int64)
+    table[:, 0] = 1
+    for n in range(1, n_max + 1):
+        table[n, 1:] = table[n - 1, :-1] + table[n - 1, 1:]
+    return table
+
+
+def lattice_size(k, m):
+    """
+    Number of points of the (k, m) simplex lattice, C(m + k - 1, k - 1).
+    """
+    return int(_binomial_table(m + k, k)[m + k - 1, k - 1])
+
+
+def lattice_counts(k, m, start=0, stop=None):
+    """
+    Integer compositions of m into k non-negative parts (stars and bars), by rank.
+
+    Ranks follow the order of `combinations_with_replacement(range(k), m)`, i.e.
+    decreasing lexicographic order of the counts. Each rank is unranked independently
+    with vectorized index arithmetic (one binary search per component), so any slice
+    [start, stop) of the lattice can be built without generating the previous points.
+
+    Parameters:
+        k (int): number of components
+        m (int): number of subdivisions
+        start, stop (int): range of ranks to build (default: the whole lattice)
+
+    Returns:
+        ndarray: (stop - start, k) int64 counts, each row summing to m
+    """
+    size = lattice_size(k, m)
+    stop = size if stop is None else min(stop, size)
+    ranks = np.arange(start, stop, dtype=np.int64)
+    table = _binomial_table(m + k, k)
+    counts = np.zeros((len(ranks), k), dtype=np.int64)
+    remaining = np.full(len(ranks), m, dtype=np.int64)
+    for i in range(k - 1):
+        parts = k - i - 1  # components left after component i
+        # Component i takes c = remaining, remaining - 1, ..., 0 in turn; each value c
+        # is followed by the C(remaining - c + parts - 1, parts - 1) compositions of the rest,
+        # so the first s values cover skipped[s] = C(s + parts - 1, parts) ranks
+        skipped = table[np.arange(m + 1) + parts - 1, parts]
+        steps = np.searchsorted(skipped, ranks, side="right") - 1
+        ranks -= skipped[steps]
+        value = remaining - steps
+        counts[:, i] = value
+        remaining -= value
+    counts[:, -1] = remaining
+    return counts
@@ -0,0 +1,157 @@
+import numpy as np
+
+__all__ = [
+    "iso_segments",
+    "iso_lines",
+    "desirable_mask",
+    "desirable_triangles",
+    "find_optimum",
+]
+
+EDGES = np.array([[0, 1], [1, 2], [2, 0]])
+
+
+def iso_segments(xy, triangles, values, level):
+    """
+    Marching triangles: segments of the iso-line `values == level` on a triangular mesh.
+
+    All the triangles are processed at once. In each triangle crossed by the level,
+    the iso-line is the segment between the linear interpolation points of its two
+    crossed edges. Triangles with an undefined (nan) vertex are skipped.
+
+    Parameters:
+        xy (ndarray): (N, 2) vertex coordinates
+        triangles (ndarray): (T, 3) vertex indices
+        values (ndarray): (N,) values at the vertices
+        level (float): iso-value
+
+    Returns:
+        ndarray: (S, 2, 2) segments
+    """
+    tri_values = values[triangles]
+    valid = np.all(np.isfinite(tri_values), axis=1)
+    above = tri_values > level
+    # Edge e of a triangle is crossed when its two ends are on both sides of the level
+    crossed = above[:, EDGES[:, 0]] != above[:, EDGES[:, 1]]  # (T, 3)
+    keep = valid & crossed.any(axis=1)
+    tri_values, crossed = tri_values[keep], crossed[keep]
+    ends = triangles[keep][:, EDGES]  # (T', 3, 2) vertex indices of the edges
+    v0 = tri_values[:, EDGES[:, 0]]
+    v1 = tri_values[:, EDGES[:, 1]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip((level - v0) / (v1 - v0), 0.0, 1.0)
+    points = xy[ends[..., 0]] + t[..., None] * (xy[ends[..., 1]] - xy[ends[..., 0]])  # (T', 3, 2)
+    # The two crossed edges of each triangle (stable sort puts them first)
+    first_two = np.argsort(~crossed, axis=1, kind="stable")[:, :2]
+    return np.take_along_axis(points, first_two[..., None], axis=1)
+
+
+def iso_lines(xy, triangles, values, levels):
+    """
+    Iso-lines for several levels.
+
+    Parameters:
+        levels (int or array-like): number of levels evenly spaced strictly inside the range of
+            the values, or the levels themselves
+
+    Returns:
+        Tuple[ndarray, ndarray]: (S, 2, 2) segments and (S,) level of each segment, ready for a
+        single matplotlib LineCollection
+    """
+    finite = values[np.isfinite(values)]
+    if np.isscalar(levels):
+        if len(finite) == 0 or levels < 1:
+            return np.empty((0, 2, 2)), np.empty(0)
+        levels = np.linspace(finite.min(), finite.max(), int(levels) + 2)[1:-1]
+    segments, segment_levels = [], []
+    for level in np.asarray(levels, dtype=float):
+        level_segments = iso_segments(xy, triangles, values, level)
+        segments.append(level_segments)
+        segment_levels.append(np.full(len(level_segments), level))
+    if not segments:
+        return np.empty((0, 2, 2)), np.empty(0)
+    return np.concatenate(segments), np.concatenate(segment_levels)
+
+
+def desirable_mask(values, low=None, high=None):
+    """
+    Points whose value is within the desired thresholds (None: no threshold on that side).
+
+    Returns:
+        ndarray: booleans, same shape as values (False where the value is nan)
+    """
+    values = np.asarray(values, dtype=float)
+    mask = np.isfinite(values)
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    return mask
+
+
+def desirable_triangles(triangles, values, low=None, high=None):
+    """
+    Triangles of a mesh whose three vertices are within the desired thresholds.
+
+    Returns:
+        ndarray: (T,) booleans
+    """
+    return np.all(desirable_mask(values, low, high)[triangles], axis=1)
+
+
+def find_optimum(predict, lower, upper, seeds=None, maximize=True, n_starts=8, seed=None):
+    """
+    Constrained optimum of a fitted model inside the feasible region
+    {sum(x) = 1, lower <= x <= upper}.
+
+    Multi-start SLSQP: the starts are the given seeds (typically the best points of an
+    already evaluated grid) completed with random feasible mixtures. Starts where the
+    model is undefined (nan) are skipped.
+
+    Parameters:
+        predict (callable): maps (M, k) compositions to (M,) values
+        lower, upper (array-like): (k,) bounds, as proportions
+        seeds (array-like, optional): (S, k) starting compositions
+        maximize (bool): look for the maximum (True) or the minimum (False)
+        n_starts (int): total number of starts
+        seed (int, optional): seed of the random starts
+
+    Returns:
+        Tuple[ndarray, float]: best composition (k,) and its predicted value
+    """
+    from scipy.optimize import minimize
+    from src.algo.constraints import effective_bounds, feasible_vertices
+    lower, upper = effective_bounds(lower, upper)
+    vertices = feasible_vertices(lower, upper)
+    if len(vertices) == 0:
+        raise ValueError("Constrained region is empty")
+    sign = -1.0 if maximize else 1.0
+
+    starts = np.empty((0, len(lower))) if seeds is None else np.atleast_2d(np.asarray(seeds, dtype=float))
+    n_random = max(n_starts - len(starts), 0)
+    rng = np.random.default_rng(seed)
+    starts = np.concatenate((starts, rng.dirichlet(np.ones(len(vertices)), size=n_random) @ vertices))
+
+    start_values = np.asarray(predict(starts), dtype=float)
+    defined = np.isfinite(start_values)
+    if not defined.any():
+        raise ValueError("The model is undefined at every starting point")
+    starts, start_values = starts[defined], start_values[defined]
+    best = int(np.argmin(sign * start_values))
+    best_x, best_value = starts[best], start_values[best]
+
+    def objective(x):
+        value = float(np.asarray(predict(x[None]))[0])
+        # Undefined areas (e.g. outside the data hull of LinearND) repel the search
+        return sign * value if np.isfinite(value) else 1e12
+
+    constraints = ({"type": "eq", "fun": lambda x: x.sum() - 1.0, "jac": lambda x: np.ones_like(x)},)
+    for start in starts:
+        result = minimize(objective, start, method="SLSQP", bounds=list(zip(lower, upper)),
+                          constraints=constraints, options={"maxiter": 200, "ftol": 1e-10})
+        x = np.clip(result.x, lower, upper)
+        x = x / x.sum()
+        value = float(np.asarray(predict(x[None]))[0])
+        if np.isfinite(value) and sign * value < sign * best_value:
+            best_x, best_value = x, value
+    return best_x, best_value
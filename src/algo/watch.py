@@ -0,0 +1,223 @@
+import csv
+import glob
+import os
+
+import numpy as np
+from src.algo.replicates import KEY_DECIMALS
+
+__all__ = [
+    "CsvTail",
+    "FolderTail",
+    "parse_measurements",
+    "merge_measurements",
+]
+
+
+class CsvTail:
+    """
+    Incremental reader of a CSV file that is being appended to (e.g. by an instrument).
+
+    Each `read` only parses the bytes written since the previous call: a file of any length
+    costs one `stat` and the new lines. A last line without its newline is still being written
+    and is left for the next call. A file that is replaced (new inode) or modified without
+    growing (rewritten) is read again from the start.
+
+    The delimiter (",", ";" or tab) is detected on the header line.
+
+    Parameters:
+        path (str): CSV file, with a header line
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.delimiter = ","
+        self._offset = 0
+        self._inode = None
+        self._mtime = None
+
+    def reset(self):
+        self.header = None
+        self._offset = 0
+
+    def read(self):
+        """
+        Rows appended since the last call.
+
+        Returns:
+            list of list of str: new complete rows (the header line is not included)
+        """
+        try:
+            status = os.stat(self.path)
+        except OSError:
+            return []
+        modified = status.st_mtime_ns != self._mtime
+        if status.st_ino != self._inode or status.st_size < self._offset or (modified and status.st_size == self._offset):
+            self.reset()
+        self._inode, self._mtime = status.st_ino, status.st_mtime_ns
+        if status.st_size == self._offset:
+            return []
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            data = file.read(status.st_size - self._offset)
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return []  # Line still being written
+        self._offset += end
+        lines = data[:end].decode("utf-8-sig" if self.header is None else "utf-8", errors="replace").splitlines()
+        lines = [line for line in lines if line.strip()]
+        if self.header is None and lines:
+            try:
+                self.delimiter = csv.Sniffer().sniff(lines[0], delimiters=",;\t").delimiter
+            except csv.Error:
+                self.delimiter = ","
+            self.header = [name.strip() for name in next(csv.reader(lines[:1], delimiter=self.delimiter))]
+            lines = lines[1:]
+        return list(csv.reader(lines, delimiter=self.delimiter))
+
+
+class FolderTail:
+    """
+    Incremental reader of a CSV file, or of all the CSV files of a directory.
+
+    Files that appear in the directory are read from their start, the others only from
+    the point reached at the previous poll (see CsvTail).
+
+    Parameters:
+        path (str): CSV file or directory
+        pattern (str): files read in a directory
+    """
+
+    def __init__(self, path, pattern="*.csv"):
+        self.path = path
+        self.pattern = pattern
+        self.tails = {}
+
+    def files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, self.pattern)))
+        return [self.path]
+
+    def poll(self):
+        """
+        New rows of every watched file.
+
+        Returns:
+            list of (CsvTail, list of list of str): the files with new rows and these rows
+        """
+        files = self.files()
+        for path in set(self.tails) - set(files):
+            del self.tails[path]  # File removed
+        updates = []
+        for path in files:
+            tail = self.tails.setdefault(path, CsvTail(path))
+            rows = tail.read()
+            if rows:
+                updates.append((tail, rows))
+        return updates
+
+
+def _number(text, delimiter):
+    text = text.strip()
+    if delimiter != ",":
+        text = text.replace(",", ".")  # Decimal comma of ";"-separated files
+    return float(text)
+
+
+def parse_measurements(header, rows, n_components, response_names, delimiter=","):
+    """
+    Compositions and responses of CSV rows laid out like the points table: the k components
+    (in %) first, then the responses.
+
+    Response columns are matched to `response_names` by name; if some name is missing from
+    the header, they are taken in order instead. Missing responses are nan.
+
+    Parameters:
+        header (list of str): column names
+        rows (list of list of str): data rows
+        n_components (int): number of components k
+        response_names (list of str): responses of the experiment
+        delimiter (str): delimiter of the file (a decimal comma is read unless it is ",")
+
+    Returns:
+        tuple: (P, k) compositions as fractions, (P, M) responses and the number of rows
+        skipped (wrong number of columns, non-numeric value, composition not summing to 100 %)
+
+    Raises:
+        ValueError: if the header does not hold the k components and at least one response
+    """
+    if len(header) <= n_components:
+        raise ValueError(f"Expected the {n_components} components and at least one response, got {len(header)} columns")
+    names = header[n_components:]
+    if all(name in names for name in response_names):
+        columns = [n_components + names.index(name) for name in response_names]
+    else:
+        columns = list(range(n_components, min(len(header), n_components + len(response_names))))
+    compositions, responses, skipped = [], [], 0
+    for row in rows:
+        if len(row) != len(header):
+            skipped += 1
+            continue
+        try:
+            composition = [_number(row[i], delimiter) / 100 for i in range(n_components)]
+            values = [_number(row[i], delimiter) if row[i].strip() else np.nan for i in columns]
+        except ValueError:
+            skipped += 1
+            continue
+        if abs(sum(composition) - 1.0) > 1e-2:
+            skipped += 1
+            continue
+        compositions.append(composition)
+        responses.append(values + [np.nan] * (len(response_names) - len(values)))
+    compositions = np.array(compositions, dtype=float).reshape(-1, n_components)
+    responses = np.array(responses, dtype=float).reshape(-1, len(response_names))
+    return compositions, responses, skipped
+
+
+def merge_measurements(points, scores, new_points, new_scores, pending=None, decimals=KEY_DECIMALS):
+    """
+    Merge measurements into an experiment, by composition.
+
+    A measurement whose composition (rounded to `decimals` decimals) matches a point of the
+    experiment replaces the responses of that point, in which a nan keeps the previous value.
+    A new composition is appended once all its responses are known: until then its partial
+    responses wait in `pending`, where the later rows of the same composition complete them
+    (a missing response is never stored as a value). `points`, `scores` and `pending` are
+    modified in place.
+
+    Parameters:
+        points (list of tuple): compositions of the experiment (fractions)
+        scores (list of tuple): responses of each point
+        new_points (array-like): (P, k) compositions
+        new_scores (array-like): (P, M) responses
+        pending (dict, optional): incomplete new compositions, {rounded composition:
+            (composition, responses with nan)}, kept by the caller between batches (without
+            it, incomplete rows of new compositions are dropped)
+
+    Returns:
+        tuple: (indices of the updated points, indices of the appended points), sorted
+    """
+    pending = {} if pending is None else pending
+    index = {tuple(np.round(point, decimals)): i for i, point in enumerate(points)}
+    updated, added = set(), []
+    for point, values in zip(np.asarray(new_points, dtype=float), np.asarray(new_scores, dtype=float)):
+        key = tuple(np.round(point, decimals))
+        i = index.get(key)
+        if i is None:
+            if key in pending:
+                values = np.where(np.isnan(values), pending[key][1], values)
+            if np.isnan(values).any():
+                pending[key] = (point, values)
+                continue
+            pending.pop(key, None)
+            index[key] = len(points)
+            added.append(len(points))
+            points.append(tuple(point.tolist()))
+            scores.append(tuple(values.tolist()))
+            continue
+        values = np.where(np.isnan(values), scores[i], values)
+        if tuple(values.tolist()) != tuple(scores[i]):
+            scores[i] = tuple(values.tolist())
+            if i not in added:
+                updated.add(i)
+    return sorted(updated), added
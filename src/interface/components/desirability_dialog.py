@@ -0,0 +1,68 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QComboBox,
+    QHeaderView, QDialogButtonBox, QMessageBox
+)
+from src.algo.desirability import Desirability
+
+# Libellés des objectifs -> codes de src.algo.desirability.GOALS
+GOAL_LABELS = {"Maximiser": "max", "Minimiser": "min", "Cible": "target"}
+
+
+class DesirabilityDialog(QDialog):
+    """
+    Saisie des objectifs de désirabilité (Derringer) : pour chaque réponse, l'objectif,
+    la plage acceptable [bas, haut], la cible, l'exposant et l'importance.
+    """
+    COLUMNS = ["Objectif", "Bas", "Haut", "Cible", "Exposant", "Importance"]
+
+    def __init__(self, response_names, desirability, parent=None):
+        """
+        :param response_names: Noms des M réponses.
+        :param desirability: Désirabilité courante (Desirability), utilisée pour préremplir le tableau.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Objectifs de désirabilité")
+        self.response_names = list(response_names)
+        self.desirability = desirability
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.table = QTableWidget(len(self.response_names), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setVerticalHeaderLabels(self.response_names)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        codes = list(GOAL_LABELS.values())
+        self.goal_selectors = []
+        for row in range(len(self.response_names)):
+            selector = QComboBox()
+            selector.addItems(GOAL_LABELS.keys())
+            selector.setCurrentIndex(codes.index(desirability.goals[row]))
+            self.table.setCellWidget(row, 0, selector)
+            self.goal_selectors.append(selector)
+            values = (desirability.low, desirability.high, desirability.target,
+                      desirability.weights, desirability.importance)
+            for column, vector in enumerate(values, start=1):
+                self.table.setItem(row, column, QTableWidgetItem(f"{vector[row]:.4g}"))
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.resize(600, 120 + 30 * len(self.response_names))
+
+    def accept(self):
+        """Valide la saisie ; le dialogue reste ouvert si elle est incohérente."""
+        try:
+            columns = [
+                [float(self.table.item(row, column).text().replace(",", "."))
+                 for row in range(len(self.response_names))]
+                for column in range(1, len(self.COLUMNS))
+            ]
+            goals = [GOAL_LABELS[selector.currentText()] for selector in self.goal_selectors]
+            self.desirability = Desirability(goals, *columns)
+        except (ValueError, AttributeError) as e:
+            QMessageBox.warning(self, "Désirabilité", f"Objectifs invalides : {e}")
+            return
+        super().accept()
@@ -1,14 +1,27 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QHBoxLayout, QTextEdit, QGroupBox
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QHBoxLayout, QGroupBox, QTabWidget, QSpinBox, QScrollArea
+from PyQt5.QtCore import Qt
 
-from src.algo.points_lists import *
+from src.algo.registry import DESIGNS
 from src.interface.utils.logger import gui_logger
 from src.interface.utils.console import SmartConsole
+from src.interface.components.timings_panel import TimingsPanel
 
-POINTS_LISTS = {
-    "SimplexCentroid": SimplexCentroid(),
-    "ScheffeNetwork": ScheffeNetwork(),
-    "SimplexCentroidGrowth": SimplexCentroidGrowth(),
+# Nombre maximal de composants du mélange
+MAX_COMPONENTS = 8
+
+# Plans optimaux construits dans la zone contrainte (le champ d'ordre y est le nombre de points) :
+# sélection parmi des candidats (Fedorov) ou optimisation continue (échange de coordonnées),
+# ainsi que les plans contraints ajoutés par extension
+OPTIMAL_PLANS = tuple(DESIGNS.names(constrained=True))
+
+# Plans du simplexe, construits en pseudo-composants
+SIMPLEX_PLANS = tuple(DESIGNS.names(constrained=False))
+
+# Critères d'optimalité proposés pour les plans Type III
+CRITERIA = {
+    "D-optimalité": "D",
+    "I-optimalité": "I",
+    "A-optimalité": "A",
 }
 
 class ParametersPanel(QWidget):
@@ -24,41 +37,29 @@ class ParametersPanel(QWidget):
         self.component_inputs = {}
         self.component_names = {}
         self.names = []
-
-        for i in range(1, 4):
-            group_box = QGroupBox(f"Composant {i}")
-            group_box.setStyleSheet("QGroupBox { font-style: italic; }")
-            group_layout = QVBoxLayout()
-            group_box.setLayout(group_layout)
-
-            # Champ pour le nom
-            name_input = QLineEdit()
-            name_input.setPlaceholderText(f"Nom du composant {i}")
-            group_layout.addWidget(name_input)
-            self.component_names[f"component_{i}_name"] = name_input
-
-            self.names.append(QLabel(f"Contraintes pour Composant {i}"))
-            group_layout.addWidget(self.names[-1])
-
-            # Champs min/max (collés horizontalement)
-            min_max_layout = QHBoxLayout()
-            # min_max_layout.setAlignment(Qt.AlignLeft)
-            min_max_layout.setSpacing(10)
-            min_input = QLineEdit()
-            min_input.setPlaceholderText(f"Valeur min composant {i}")
-            min_max_layout.addWidget(min_input)
-            min_max_layout.addStretch(1)
-
-            max_input = QLineEdit()
-            max_input.setPlaceholderText(f"Valeur max composant {i}")
-            min_max_layout.addWidget(max_input)
-            min_max_layout.addStretch(1)
-            group_layout.addLayout(min_max_layout)
-
-            self.layout.addWidget(group_box)
-
-            self.component_inputs[f"component_{i}_min"] = min_input
-            self.component_inputs[f"component_{i}_max"] = max_input
+        self.component_boxes = []
+
+        # Nombre de composants du mélange
+        n_components_layout = QHBoxLayout()
+        n_components_layout.addWidget(QLabel("Nombre de composants :"))
+        self.n_components_input = QSpinBox()
+        self.n_components_input.setRange(3, MAX_COMPONENTS)
+        n_components_layout.addWidget(self.n_components_input)
+        self.layout.addLayout(n_components_layout)
+
+        # Composants, dans une zone défilante lorsqu'ils sont nombreux
+        components_widget = QWidget()
+        self.components_layout = QVBoxLayout(components_widget)
+        self.components_layout.setAlignment(Qt.AlignTop)
+        self.components_layout.setContentsMargins(0, 0, 0, 0)
+        components_scroll = QScrollArea()
+        components_scroll.setWidgetResizable(True)
+        components_scroll.setFrameShape(QScrollArea.NoFrame)
+        components_scroll.setWidget(components_widget)
+        self.layout.addWidget(components_scroll)
+
+        self.set_n_components(3)
+        self.n_components_input.valueChanged.connect(self.set_n_components)
 
         total_mass = QLineEdit()
         total_mass.setPlaceholderText("Masse totale du mélange (g)")
@@ -78,12 +79,23 @@ class ParametersPanel(QWidget):
         # Menu déroulant pour choisir la liste de points initiaux
         plan_type_order = QHBoxLayout()
         self.initial_points_selector = QComboBox()
-        self.initial_points_selector.addItems(POINTS_LISTS.keys())
+        self.initial_points_selector.addItems(SIMPLEX_PLANS)
         plan_type_order.addWidget(self.initial_points_selector)
 
         self.plan_order = QLineEdit()
         self.plan_order.setPlaceholderText("Ordre de la configuration")
         plan_type_order.addWidget(self.plan_order)
+
+        # Critère de l'algorithme d'échange (plans Type III uniquement)
+        self.criterion_selector = QComboBox()
+        self.criterion_selector.addItems(CRITERIA.keys())
+        self.criterion_selector.setToolTip(
+            "D : précision des coefficients (det)\n"
+            "I : variance de prédiction moyenne sur la zone\n"
+            "A : variance moyenne des coefficients"
+        )
+        self.criterion_selector.setVisible(False)
+        plan_type_order.addWidget(self.criterion_selector)
         experience_layout.addLayout(plan_type_order)
 
         # On selector switch, change enabled state of order input
@@ -103,15 +115,71 @@ class ParametersPanel(QWidget):
         self.console = SmartConsole()
         # self.console.setFixedHeight(150)  # ajustable selon ton besoin
         self.console.setStyleSheet("background-color: #1e1e1e; color: white; font-family: Consolas;")
-        self.layout.addWidget(QLabel("Console :"))
-        self.layout.addWidget(self.console)
+
+        # Panneau des temps mesurés, dans un onglet à côté de la console
+        self.timings_panel = TimingsPanel()
+        self.console_tabs = QTabWidget()
+        self.console_tabs.addTab(self.console, "Console")
+        self.console_tabs.addTab(self.timings_panel, "Performances")
+        self.layout.addWidget(self.console_tabs)
 
         gui_logger.log_signal.connect(self.log)
 
 
+    def add_component_box(self, i):
+        """Ajoute les champs (nom, min, max) du composant i."""
+        group_box = QGroupBox(f"Composant {i}")
+        group_box.setStyleSheet("QGroupBox { font-style: italic; }")
+        group_layout = QVBoxLayout()
+        group_box.setLayout(group_layout)
+
+        # Champ pour le nom
+        name_input = QLineEdit()
+        name_input.setPlaceholderText(f"Nom du composant {i}")
+        group_layout.addWidget(name_input)
+        self.component_names[f"component_{i}_name"] = name_input
+
+        self.names.append(QLabel(f"Contraintes pour Composant {i}"))
+        group_layout.addWidget(self.names[-1])
+
+        # Champs min/max (collés horizontalement)
+        min_max_layout = QHBoxLayout()
+        # min_max_layout.setAlignment(Qt.AlignLeft)
+        min_max_layout.setSpacing(10)
+        min_input = QLineEdit()
+        min_input.setPlaceholderText(f"Valeur min composant {i}")
+        min_max_layout.addWidget(min_input)
+        min_max_layout.addStretch(1)
+
+        max_input = QLineEdit()
+        max_input.setPlaceholderText(f"Valeur max composant {i}")
+        min_max_layout.addWidget(max_input)
+        min_max_layout.addStretch(1)
+        group_layout.addLayout(min_max_layout)
+
+        self.components_layout.addWidget(group_box)
+        self.component_boxes.append(group_box)
+
+        self.component_inputs[f"component_{i}_min"] = min_input
+        self.component_inputs[f"component_{i}_max"] = max_input
+
+    def set_n_components(self, k):
+        """Ajoute ou retire des composants ; les saisies des composants conservés sont gardées."""
+        while len(self.component_boxes) < k:
+            self.add_component_box(len(self.component_boxes) + 1)
+        while len(self.component_boxes) > k:
+            i = len(self.component_boxes)
+            self.component_boxes.pop().deleteLater()
+            self.names.pop()
+            del self.component_names[f"component_{i}_name"]
+            del self.component_inputs[f"component_{i}_min"]
+            del self.component_inputs[f"component_{i}_max"]
+
     def get_parameters(self):
         parameters = {}
-        for i in range(1, 4):
+        k = self.n_components_input.value()
+        parameters["n_components"] = k
+        for i in range(1, k + 1):
             try:
                 min_val = float(self.component_inputs[f"component_{i}_min"].text())
             except ValueError:
@@ -155,53 +223,18 @@ class ParametersPanel(QWidget):
         return parameters
 
 
-    def log(self, message, level="INFO"):
-        level = level.upper()
-        color = {
-            "ERROR": "red",
-            "WARNING": "orange",
-            "INFO": "white",
-            "USER_ACTION": "yellow",  # pour clignotement
-        }.get(level, "white")
-
-        # Ajout avec style
-        formatted = f'<span style="color:{color}">{message}</span>'
-        self.console.append(formatted)
-
-        # Effet clignotant pour USER_ACTION
-        if level == "USER_ACTION":
-            self.blink_text(message)
-
-    def blink_text(self, msg):
-        def toggle_visibility():
-            if self.console.toPlainText().endswith(msg):
-                # remove the last line (the blinking message)
-                cursor = self.console.textCursor()
-                cursor.movePosition(cursor.End, cursor.MoveAnchor)
-                cursor.select(cursor.BlockUnderCursor)
-                cursor.removeSelectedText()
-                cursor.deleteChar()
-                self.console.setTextCursor(cursor)
-            else:
-                self.console.append(f'<span style="color:yellow">{msg}</span>')
-
-        # Faire clignoter 3 fois
-        timer = QTimer(self)
-        timer.setInterval(300)
-        count = {"value": 0}
-
-        def update():
-            toggle_visibility()
-            count["value"] += 1
-            if count["value"] >= 10:
-                timer.stop()
-
-        timer.timeout.connect(update)
-        timer.start()
+    def log(self, records):
+        """Affiche un lot de messages [(message, niveau), ...] dans la console."""
+        self.console.append_records(records)
     
     def enable_plan_order(self, text):
         """Active ou désactive le champ d'ordre selon la sélection de la configuration."""
         if text:
-            self.plan_order.setEnabled(POINTS_LISTS[text].order)
+            self.plan_order.setEnabled(DESIGNS.metadata(text).get("order", True) or text in OPTIMAL_PLANS)
         else:
-            self.plan_order.setEnabled(True)
\ No newline at end of file
+            self.plan_order.setEnabled(True)
+        self.criterion_selector.setVisible(text in OPTIMAL_PLANS)
+
+    def get_criterion(self):
+        """Critère d'optimalité sélectionné ("D", "I" ou "A")."""
+        return CRITERIA[self.criterion_selector.currentText()]
\ No newline at end of file
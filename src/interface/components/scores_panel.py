@@ -2,36 +2,70 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton,
     QLineEdit, QComboBox, QTableWidget, QTableWidgetItem,
     QHeaderView, QAbstractItemView, QMessageBox, QHBoxLayout,
-    QGroupBox, QFileDialog, QMenu, QAction
+    QGroupBox, QFileDialog, QMenu, QAction, QSpinBox, QFormLayout
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from functools import partial
-from src.algo.interpolator import *
+from src.algo.registry import INTERPOLATORS
+from src.algo.grid_export import export_table
+from src.interface.utils.data_processing import with_file_extension
 from src.interface.utils.logger import gui_logger
+from src.interface.utils.profiler import profiler
 import csv
+import numpy as np
 from datetime import datetime
 
-# Dictionnaire des interpolateurs disponibles
-INTERPOLATORS = {
-    # "LinearND": LinearNDInterpolator,
-    # "Delaunay": DelaunayInterpolator,
-    "RBF": RBFInterpolator,
-    "Quadratic": QuadraticInterpolator,
-    "Linear": LinearInterpolator,
-}
+# Formats proposés pour l'export des tableaux (Parquet nécessite pyarrow)
+TABLE_FILE_FILTERS = "CSV Files (*.csv);;NumPy (*.npz);;Parquet (*.parquet);;All Files (*)"
+
+# Entrée du sélecteur de surface pour la désirabilité globale (plusieurs réponses)
+DESIRABILITY_LABEL = "Désirabilité globale"
+
+
+def registry_tooltip(metadata):
+    """Infobulle d'un interpolateur à partir de ses métadonnées (sans l'importer)."""
+    lines = [metadata["description"]] if metadata.get("description") else []
+    if metadata.get("min_points") is not None:
+        lines.append(f"Points minimum (3 composants) : {metadata['min_points']}")
+    if metadata.get("max_points") is not None:
+        lines.append(f"Points maximum : {metadata['max_points']}")
+    lines.append("Évaluation vectorisée : " + ("oui" if metadata.get("batch") else "non"))
+    lines.append("Incertitude des prédictions : " + ("oui" if metadata.get("uncertainty") else "non"))
+    return "\n".join(lines)
+
 
 class ScoresPanel(QWidget):
+    # Émis avec la liste des noms de réponses lorsqu'elle change (saisie ou import)
+    responses_changed = pyqtSignal(list)
+    # Surveillance d'un fichier ou d'un dossier de mesures : chemin choisi, ou arrêt
+    watch_requested = pyqtSignal(str)
+    watch_stop_requested = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
         self.total_mass = None
-
-        # Tableau de points (X, Y, Z, Score)
+        self.n_components = 3
+        self.response_names = ["Score"]  # Une colonne du tableau par réponse mesurée
+        self.import_count = 0  # Numéro de l'import en cours (ses lignes forment une seule étape d'annulation)
+
+        # Noms des réponses (coût, dureté, viscosité, ...)
+        responses_layout = QHBoxLayout()
+        responses_layout.addWidget(QLabel("Réponses :"))
+        self.responses_input = QLineEdit(", ".join(self.response_names))
+        self.responses_input.setToolTip("Noms des réponses mesurées, séparés par des virgules (ex : Coût, Dureté).")
+        responses_layout.addWidget(self.responses_input)
+        self.layout.addLayout(responses_layout)
+        self.responses_input.editingFinished.connect(self.on_responses_edited)
+
+        # Tableau de points (Comp1, ..., Compk, Réponse1, ..., RéponseM)
         self.points_table = QTableWidget()
-        self.points_table.setColumnCount(4)
-        self.points_table.setHorizontalHeaderLabels(["Comp1 (%)", "Comp2 (%)", "Comp3 (%)", "Score"])
+        self.points_table.setColumnCount(self.n_components + self.n_responses)
+        self.points_table.setHorizontalHeaderLabels(
+            [f"Comp{i} (%)" for i in range(1, self.n_components + 1)] + self.response_names
+        )
         self.points_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.points_table.setEditTriggers(QTableWidget.AllEditTriggers)
         self.layout.addWidget(self.points_table)
@@ -52,6 +86,18 @@ class ScoresPanel(QWidget):
         self.export_button.clicked.connect(self.export_points)
         self.export_button.setEnabled(False)
 
+        # Surveillance des fichiers écrits par un instrument : les nouvelles lignes sont ajoutées au fil de l'eau
+        self.watch_button = QPushButton("Surveiller")
+        self.watch_button.setStyleSheet("QPushButton { font-weight: bold; }")
+        self.watch_button.setToolTip("Ajouter automatiquement les mesures écrites dans un fichier CSV ou un dossier.")
+        watch_menu = QMenu(self.watch_button)
+        watch_menu.addAction("Un fichier CSV...", self.choose_watched_file)
+        watch_menu.addAction("Un dossier...", self.choose_watched_folder)
+        self.stop_watch_action = watch_menu.addAction("Arrêter la surveillance", self.watch_stop_requested.emit)
+        self.stop_watch_action.setEnabled(False)
+        self.watch_button.setMenu(watch_menu)
+        self.import_export_layout.addWidget(self.watch_button)
+
         # Bouton pour afficher un popup qui donne les masses (à partir des pourcentages dans le tableau)
         self.show_masses_button = QPushButton("Afficher les masses")
         self.show_masses_button.setStyleSheet("QPushButton { font-weight: bold; }")
@@ -67,28 +113,23 @@ class ScoresPanel(QWidget):
         addpoint_gbox.setLayout(addpoint_layout)
         self.layout.addWidget(addpoint_gbox)
 
-        point_layout = QHBoxLayout()
-        self.x_input = QLineEdit()
-        self.x_input.setPlaceholderText("Comp1 (%)")
-        point_layout.addWidget(self.x_input)
+        self.point_layout = QHBoxLayout()
+        point_layout = self.point_layout
+        self.component_inputs = []
+        for i in range(1, self.n_components + 1):
+            component_input = QLineEdit()
+            component_input.setPlaceholderText(f"Comp{i} (%)")
+            point_layout.addWidget(component_input)
+            self.component_inputs.append(component_input)
 
-        self.y_input = QLineEdit()
-        self.y_input.setPlaceholderText("Comp2 (%)")
-        point_layout.addWidget(self.y_input)
-
-        self.z_input = QLineEdit()
-        self.z_input.setPlaceholderText("Comp3 (%)")
-        point_layout.addWidget(self.z_input)
-
-        self.score_input = QLineEdit()
-        self.score_input.setPlaceholderText("Score")
-        point_layout.addWidget(self.score_input)
+        # Un champ par réponse
+        self.add_button = QPushButton("Ajouter")
+        self.score_inputs = []
+        self.set_score_inputs()
         addpoint_layout.addLayout(point_layout)
 
         # Bouton pour ajouter un point
-        self.add_button = QPushButton("Ajouter")
         addpoint_layout.addWidget(self.add_button)
-        self.score_input.returnPressed.connect(self.add_button.click)
 
         # Menu déroulant pour sélectionner l'interpolateur
         interpolator_gbox = QGroupBox("Sélectionner un interpolateur")
@@ -97,48 +138,184 @@ class ScoresPanel(QWidget):
         interpolator_gbox.setLayout(interpolator_layout)
         self.layout.addWidget(interpolator_gbox)
         self.interpolator_selector = QComboBox()
-        self.interpolator_selector.addItems(INTERPOLATORS.keys())
+        # Interpolateurs du registre (intégrés et extensions) : un module n'est importé que
+        # lorsque son interpolateur est utilisé
+        for index, name in enumerate(INTERPOLATORS.names()):
+            self.interpolator_selector.addItem(name)
+            self.interpolator_selector.setItemData(index, registry_tooltip(INTERPOLATORS.metadata(name)), Qt.ToolTipRole)
         interpolator_layout.addWidget(self.interpolator_selector)
 
         # Bouton pour lancer l'interpolation
         self.interpolate_button = QPushButton("Interpoler")
         interpolator_layout.addWidget(self.interpolate_button)
 
-        # Interpolateur actuellement sélectionné (par défaut)
-        self.interpolator = INTERPOLATORS[self.interpolator_selector.currentText()]
+        # Analyse de la surface interpolée : isolignes, optimum et zone souhaitable
+        analysis_gbox = QGroupBox("Analyser la surface")
+        analysis_gbox.setStyleSheet("QGroupBox { font-weight: bold; font-style: italic; }")
+        analysis_layout = QVBoxLayout()
+        analysis_gbox.setLayout(analysis_layout)
+        self.layout.addWidget(analysis_gbox)
+
+        analysis_form = QFormLayout()
+        analysis_layout.addLayout(analysis_form)
+        self.iso_lines_input = QSpinBox()
+        self.iso_lines_input.setRange(0, 30)
+        self.iso_lines_input.setValue(8)
+        self.iso_lines_input.setToolTip("Nombre d'isolignes tracées sur la heatmap (0 pour les masquer).")
+        analysis_form.addRow("Isolignes :", self.iso_lines_input)
+
+        desirable_layout = QHBoxLayout()
+        self.desirable_min_input = QLineEdit()
+        self.desirable_min_input.setPlaceholderText("Score min")
+        self.desirable_max_input = QLineEdit()
+        self.desirable_max_input.setPlaceholderText("Score max")
+        desirable_layout.addWidget(self.desirable_min_input)
+        desirable_layout.addWidget(self.desirable_max_input)
+        analysis_form.addRow("Zone souhaitable :", desirable_layout)
+
+        self.display_selector = QComboBox()
+        self.display_selector.setToolTip("Réponse affichée sur la heatmap, ou désirabilité globale de toutes les réponses.")
+        analysis_form.addRow("Surface affichée :", self.display_selector)
+        self.desirability_button = QPushButton("Objectifs de désirabilité...")
+        self.desirability_button.setToolTip("Objectif (maximiser, minimiser, cible) et plage acceptable de chaque réponse.")
+        analysis_form.addRow(self.desirability_button)
+        self.update_display_selector()
+
+        export_layout = QHBoxLayout()
+        self.export_grid_button = QPushButton("Exporter la grille")
+        self.export_grid_button.setToolTip("Exporter les compositions et les réponses prédites sur une grille fine (CSV, NPZ, Parquet).")
+        self.export_image_button = QPushButton("Exporter l'image")
+        self.export_image_button.setToolTip("Exporter la heatmap en haute résolution (PNG, SVG).")
+        export_layout.addWidget(self.export_grid_button)
+        export_layout.addWidget(self.export_image_button)
+        analysis_layout.addLayout(export_layout)
+
+        optimum_layout = QHBoxLayout()
+        self.maximum_button = QPushButton("Chercher le maximum")
+        self.minimum_button = QPushButton("Chercher le minimum")
+        optimum_layout.addWidget(self.maximum_button)
+        optimum_layout.addWidget(self.minimum_button)
+        analysis_layout.addLayout(optimum_layout)
 
         # Connexion du menu déroulant à la mise à jour
         self.interpolator_selector.currentTextChanged.connect(self.update_interpolator)
 
+    @property
+    def n_responses(self):
+        return len(self.response_names)
+
+    @property
+    def score_input(self):
+        """Premier champ de réponse (celui qui reçoit le focus après un clic sur le graphe)."""
+        return self.score_inputs[0]
+
+    def set_score_inputs(self):
+        """Ajuste les champs de saisie des réponses à la liste des réponses."""
+        while len(self.score_inputs) < self.n_responses:
+            score_input = QLineEdit()
+            score_input.returnPressed.connect(self.add_button.click)
+            self.point_layout.addWidget(score_input)
+            self.score_inputs.append(score_input)
+        while len(self.score_inputs) > self.n_responses:
+            score_input = self.score_inputs.pop()
+            self.point_layout.removeWidget(score_input)
+            score_input.deleteLater()
+        for score_input, name in zip(self.score_inputs, self.response_names):
+            score_input.setPlaceholderText(name)
+
+    def on_responses_edited(self):
+        """Applique les noms de réponses saisis."""
+        names = [name.strip() for name in self.responses_input.text().split(",") if name.strip()]
+        self.set_responses(names or ["Score"])
+
+    def set_responses(self, names):
+        """
+        Change la liste des réponses : colonnes du tableau et champs de saisie.
+        Les valeurs des réponses conservées sont gardées ; les nouvelles colonnes valent 0.
+        """
+        names = list(names)
+        if names == self.response_names:
+            return
+        k, previous = self.n_components, self.n_responses
+        self.response_names = names
+        self.responses_input.setText(", ".join(names))
+        self.points_table.blockSignals(True)
+        self.points_table.setColumnCount(k + len(names))
+        for j, name in enumerate(names):
+            self.points_table.setHorizontalHeaderItem(k + j, QTableWidgetItem(name))
+        for row in range(self.points_table.rowCount()):
+            for j in range(previous, len(names)):
+                self.points_table.setItem(row, k + j, QTableWidgetItem("0"))
+        self.points_table.blockSignals(False)
+        self.set_score_inputs()
+        self.update_display_selector()
+        gui_logger.log("Réponses :", ", ".join(names))
+        self.responses_changed.emit(names)
+
+    def update_display_selector(self):
+        """Liste des surfaces affichables : chaque réponse, et la désirabilité globale s'il y en a plusieurs."""
+        self.display_selector.blockSignals(True)
+        self.display_selector.clear()
+        self.display_selector.addItems(self.response_names)
+        if self.n_responses > 1:
+            self.display_selector.addItem(DESIRABILITY_LABEL)
+        self.display_selector.blockSignals(False)
+        self.desirability_button.setEnabled(self.n_responses > 1)
+
+    def set_display(self, display):
+        """Sélectionne la surface affichée (indice de réponse ou désirabilité) sans émettre de signal."""
+        index = self.display_selector.findText(DESIRABILITY_LABEL) if isinstance(display, str) else display
+        self.display_selector.blockSignals(True)
+        self.display_selector.setCurrentIndex(max(index, 0))
+        self.display_selector.blockSignals(False)
+
     def get_point_data(self):
-        """Récupère les données des champs pour ajouter un point."""
+        """Récupère les données des champs pour ajouter un point : (comp1, ..., compk, réponse1, ..., réponseM)."""
         try:
-            x = float(self.x_input.text())
-            y = float(self.y_input.text())
-            z = float(self.z_input.text())
-            score = float(self.score_input.text()) if self.score_input.text() else 0.0
-            return x, y, z, score
+            composition = [float(component_input.text()) for component_input in self.component_inputs]
+            scores = [float(score_input.text()) if score_input.text() else 0.0 for score_input in self.score_inputs]
+            return (*composition, *scores)
         except ValueError:
             return None
 
+    def get_desirable_range(self):
+        """
+        Seuils (min, max) de la zone souhaitable ; None pour un seuil non renseigné.
+        Lève ValueError si un seuil n'est pas un nombre.
+        """
+        thresholds = []
+        for threshold_input in (self.desirable_min_input, self.desirable_max_input):
+            text = threshold_input.text().strip().replace(",", ".")
+            thresholds.append(float(text) if text else None)
+        return tuple(thresholds)
+
     def update_points_table(self, point_data):
         """Ajoute un point dans le tableau."""
         self.export_button.setEnabled(True)
         row_position = self.points_table.rowCount()
         self.points_table.insertRow(row_position)
+        self.set_point_row(row_position, point_data)
+
+    def set_point_row(self, row_position, point_data):
+        """Remplace les valeurs d'une ligne du tableau (comp1, ..., compk, réponse1, ..., réponseM)."""
         for i, value in enumerate(point_data):
             item = QTableWidgetItem(str(value))
             item.setFlags(item.flags() | Qt.ItemIsEditable)
             # round to 3 decimal places
-            item.setData(Qt.EditRole, round(value, 2))
+            item.setData(Qt.EditRole, round(float(value), 2))
             self.points_table.setItem(row_position, i, item)
 
+    def set_points(self, rows):
+        """Remplace toutes les lignes du tableau (retour à un état précédent)."""
+        self.points_table.setRowCount(len(rows))
+        for row_position, point_data in enumerate(rows):
+            self.set_point_row(row_position, point_data)
+        self.export_button.setEnabled(bool(rows))
+
     def clear_inputs(self):
         """Efface les champs d'entrée."""
-        self.x_input.clear()
-        self.y_input.clear()
-        self.z_input.clear()
-        self.score_input.clear()
+        for component_input in self.component_inputs + self.score_inputs:
+            component_input.clear()
 
     def clear_scores_table(self):
         self.points_table.setRowCount(0)
@@ -148,22 +325,44 @@ class ScoresPanel(QWidget):
         self.clear_inputs()
         self.clear_scores_table()
 
+    @property
+    def interpolator(self):
+        """Classe de l'interpolateur sélectionné, importée à la première utilisation."""
+        return INTERPOLATORS[self.interpolator_selector.currentText()]
+
     def update_interpolator(self):
-        """Met à jour l'interpolateur sélectionné."""
+        """Signale le changement d'interpolateur."""
         selected_name = self.interpolator_selector.currentText()
-        self.interpolator = INTERPOLATORS[selected_name]
         gui_logger.log(f"Interpolateur sélectionné : {selected_name}")
 
+    def set_n_components(self, k):
+        """Change le nombre de composants : colonnes du tableau et champs de saisie (le tableau est vidé)."""
+        self.clear_scores_table()
+        self.n_components = k
+        self.points_table.setColumnCount(k + self.n_responses)
+        for j, name in enumerate(self.response_names):
+            self.points_table.setHorizontalHeaderItem(k + j, QTableWidgetItem(name))
+        while len(self.component_inputs) < k:
+            component_input = QLineEdit()
+            self.point_layout.insertWidget(len(self.component_inputs), component_input)
+            self.component_inputs.append(component_input)
+        while len(self.component_inputs) > k:
+            component_input = self.component_inputs.pop()
+            self.point_layout.removeWidget(component_input)
+            component_input.deleteLater()
+
     def update_with_parameters(self, parameters):
         """Met à jour le tableau avec les paramètres."""
         # self.clear_scores_table()
-        inputs = [self.x_input, self.y_input, self.z_input]
-        for i in range(1, 4):
+        k = parameters.get("n_components", 3)
+        if k != self.n_components:
+            self.set_n_components(k)
+        for i in range(1, k + 1):
             name = parameters[f"component_{i}"]["name"] + " (%)"
             if not name:
                 name = f"Comp{i} (%)"
             self.points_table.setHorizontalHeaderItem(i-1, QTableWidgetItem(name))
-            inputs[i-1].setPlaceholderText(name)
+            self.component_inputs[i-1].setPlaceholderText(name)
         
         self.total_mass = parameters["total_mass"]
         if self.total_mass:
@@ -190,17 +389,23 @@ class ScoresPanel(QWidget):
         """Exporte les points vers un fichier csv."""
         options = QFileDialog.Options()
         default_path = f"essai_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter les points", default_path, "CSV Files (*.csv);;All Files (*)", options=options
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exporter les points", default_path, TABLE_FILE_FILTERS, options=options
         )
         if not file_path:
             return  # L'utilisateur a annulé
+        file_path = with_file_extension(file_path, selected_filter)
 
+        if not file_path.lower().endswith(".csv"):
+            # Formats en colonnes (NPZ, Parquet) : le tableau est écrit en un bloc
+            self.export_points_table(file_path)
+            return
         try:
-            with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+            with profiler.timed("io.export_points"), open(file_path, mode='w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
                 # Écrire les en-têtes
-                headers = [self.points_table.horizontalHeaderItem(i).text() for i in range(4)]
+                n_columns = self.points_table.columnCount()
+                headers = [self.points_table.horizontalHeaderItem(i).text() for i in range(n_columns)]
                 writer.writerow(headers)
 
                 # Écrire les données
@@ -208,7 +413,7 @@ class ScoresPanel(QWidget):
                     row_data = [
                         self.points_table.item(row, col).text()
                         if self.points_table.item(row, col) else ""
-                        for col in range(4)
+                        for col in range(n_columns)
                     ]
                     writer.writerow(row_data)
 
@@ -217,6 +422,26 @@ class ScoresPanel(QWidget):
             QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite lors de l'exportation : {e}")
             gui_logger.log(f"Erreur lors de l'exportation des points : {e}", level="error")
     
+    def export_points_table(self, file_path):
+        """Exporte les points au format NPZ ou Parquet (valeurs numériques, cellules vides -> nan)."""
+        n_columns = self.points_table.columnCount()
+        headers = [self.points_table.horizontalHeaderItem(i).text() for i in range(n_columns)]
+        table = np.full((self.points_table.rowCount(), n_columns), np.nan)
+        for row in range(self.points_table.rowCount()):
+            for col in range(n_columns):
+                item = self.points_table.item(row, col)
+                try:
+                    table[row, col] = float(item.text())
+                except (AttributeError, ValueError):
+                    pass
+        try:
+            with profiler.timed("io.export_points"):
+                export_table(file_path, headers, [table], n_rows=len(table))
+            QMessageBox.information(self, "Succès", "Les points ont été exportés avec succès.")
+        except (ImportError, ValueError, OSError) as e:
+            QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite lors de l'exportation : {e}")
+            gui_logger.log(f"Erreur lors de l'exportation des points : {e}", level="error")
+
     def import_points(self):
         """Importe les points depuis un fichier csv."""
         options = QFileDialog.Options()
@@ -227,15 +452,20 @@ class ScoresPanel(QWidget):
             return
         
         try:
-            with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+            with profiler.timed("io.import_points"), open(file_path, mode='r', newline='', encoding='utf-8') as file:
                 reader = csv.reader(file)
                 headers = next(reader)  # Lire les en-têtes
-                if len(headers) != 4:
-                    raise ValueError("Le fichier doit contenir exactement 4 colonnes.")
+                # Colonnes : les k composants puis une colonne par réponse
+                if len(headers) <= self.n_components:
+                    raise ValueError(f"Le fichier doit contenir les {self.n_components} composants et au moins une réponse.")
+                n_columns = len(headers)
 
+                self.import_count += 1
                 self.clear_scores_table()
+                self.set_responses([header.strip() or f"Réponse {j + 1}"
+                                    for j, header in enumerate(headers[self.n_components:])])
                 for row in reader:
-                    if len(row) != 4:
+                    if len(row) != n_columns:
                         continue  # Ignorer les lignes incorrectes
                     try:
                         point_data = [float(value) for value in row]
@@ -248,6 +478,27 @@ class ScoresPanel(QWidget):
             QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite lors de l'importation : {e}")
             gui_logger.log(f"Erreur lors de l'importation des points : {e}", level="error")
 
+    def choose_watched_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Surveiller un fichier de mesures", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if file_path:
+            self.watch_requested.emit(file_path)
+
+    def choose_watched_folder(self):
+        directory = QFileDialog.getExistingDirectory(self, "Surveiller un dossier de mesures")
+        if directory:
+            self.watch_requested.emit(directory)
+
+    def set_watching(self, path):
+        """Affiche l'état de la surveillance : chemin surveillé, ou "" si elle est arrêtée."""
+        self.stop_watch_action.setEnabled(bool(path))
+        self.watch_button.setText("Surveillance en cours" if path else "Surveiller")
+        self.watch_button.setToolTip(
+            f"Mesures lues au fil de l'eau depuis {path}" if path
+            else "Ajouter automatiquement les mesures écrites dans un fichier CSV ou un dossier."
+        )
+
     def delete_point(self, row):
         self.points_table.removeRow(row)
         if self.points_table.rowCount() == 0:
@@ -265,9 +516,10 @@ class MassPopup(QWidget):
 
         # Tableau des masses
         self.masses_list = QTableWidget()
-        self.masses_list.setColumnCount(3)
+        n_components = self.parent_scores_panel.n_components
+        self.masses_list.setColumnCount(n_components)
         
-        column_names = [self.parent_scores_panel.points_table.horizontalHeaderItem(i).text().replace("%", "g") for i in range(3)]
+        column_names = [self.parent_scores_panel.points_table.horizontalHeaderItem(i).text().replace("%", "g") for i in range(n_components)]
         self.masses_list.setHorizontalHeaderLabels(column_names)
 
         # ➔ Options pour rendre le tableau copiable mais pas éditable
@@ -299,7 +551,7 @@ class MassPopup(QWidget):
         for i in range(self.parent_scores_panel.points_table.rowCount()):
             row_position = self.masses_list.rowCount()
             self.masses_list.insertRow(row_position)
-            for j in range(3):
+            for j in range(self.parent_scores_panel.n_components):
                 percentage_item = self.parent_scores_panel.points_table.item(i, j)
                 if percentage_item is None:
                     continue
@@ -0,0 +1,120 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QDoubleSpinBox
+from PyQt5.QtCore import pyqtSignal
+import numpy as np
+
+
+class SliceControls(QWidget):
+    """
+    Choix de la coupe ternaire affichée lorsque le mélange a plus de 3 composants :
+    les 3 composants affichés, et la proportion fixée (%) de chacun des autres.
+    """
+    view_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+
+        axes_layout = QHBoxLayout()
+        axes_layout.addWidget(QLabel("Axes :"))
+        self.axis_selectors = []
+        for i in range(3):
+            selector = QComboBox()
+            selector.currentIndexChanged.connect(lambda index, i=i: self.on_axis_changed(i, index))
+            axes_layout.addWidget(selector)
+            self.axis_selectors.append(selector)
+        self.layout.addLayout(axes_layout)
+
+        self.fixed_layout = QHBoxLayout()
+        self.layout.addLayout(self.fixed_layout)
+        self.fixed_inputs = {}
+        self.fixed_containers = []
+
+        self.names = []
+        self.lower = None
+        self.upper = None
+        self.fixed_values = {}  # index du composant -> proportion fixée (%)
+        self._axes = (0, 1, 2)
+
+    def set_components(self, names, lower, upper):
+        """
+        Met à jour les composants disponibles.
+        :param names: Noms des k composants.
+        :param lower, upper: Bornes des composants (proportions).
+        """
+        k = len(names)
+        if k != len(self.names):
+            # Nouveau nombre de composants : coupe par défaut (3 premiers axes, autres au centre)
+            self._axes = (0, 1, 2)
+            self.fixed_values = {}
+        self.names = list(names)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        for index in range(k):
+            default = np.clip(1.0 / k, self.lower[index], self.upper[index]) * 100
+            self.fixed_values.setdefault(index, float(default))
+
+        for selector, axis in zip(self.axis_selectors, self._axes):
+            selector.blockSignals(True)
+            selector.clear()
+            selector.addItems(self.names)
+            selector.setCurrentIndex(axis)
+            selector.blockSignals(False)
+        self.build_fixed_inputs()
+
+    def build_fixed_inputs(self):
+        """(Re)crée les champs de proportion des composants non affichés."""
+        for container in self.fixed_containers:
+            container.deleteLater()
+        self.fixed_containers = []
+        self.fixed_inputs = {}
+        for index in range(len(self.names)):
+            if index in self._axes:
+                continue
+            container = QWidget()
+            row = QHBoxLayout(container)
+            row.setContentsMargins(0, 0, 0, 0)
+            row.addWidget(QLabel(f"{self.names[index]} (%)"))
+            spin_box = QDoubleSpinBox()
+            spin_box.setDecimals(1)
+            spin_box.setSingleStep(1.0)
+            spin_box.setRange(self.lower[index] * 100, self.upper[index] * 100)
+            spin_box.setValue(self.fixed_values[index])
+            spin_box.valueChanged.connect(lambda value, index=index: self.on_fixed_changed(index, value))
+            row.addWidget(spin_box)
+            self.fixed_layout.addWidget(container)
+            self.fixed_containers.append(container)
+            self.fixed_inputs[index] = spin_box
+
+    def on_axis_changed(self, position, index):
+        """Change un axe affiché ; si le composant était déjà affiché, les deux axes sont échangés."""
+        if index < 0:
+            return
+        axes = list(self._axes)
+        if index in axes:
+            other = axes.index(index)
+            axes[other] = axes[position]
+            self.axis_selectors[other].blockSignals(True)
+            self.axis_selectors[other].setCurrentIndex(axes[other])
+            self.axis_selectors[other].blockSignals(False)
+        axes[position] = index
+        self._axes = tuple(axes)
+        self.build_fixed_inputs()
+        self.view_changed.emit()
+
+    def on_fixed_changed(self, index, value):
+        self.fixed_values[index] = value
+        self.view_changed.emit()
+
+    def axes(self):
+        """Indices des 3 composants affichés."""
+        return self._axes
+
+    def fixed(self):
+        """Proportions fixées des autres composants, {index: proportion}."""
+        return {
+            index: value / 100
+            for index, value in self.fixed_values.items()
+            if index not in self._axes and index < len(self.names)
+        }
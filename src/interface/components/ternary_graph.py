@@ -1,13 +1,59 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMessageBox
+import copy
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QLabel
 import ternary
 from ternary.helpers import project_point
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
-from scipy.spatial import ConvexHull
 from matplotlib.figure import Figure
+from src.algo.constraints import is_feasible
+from src.algo.desirability import Desirability
+from src.algo.refinement import refine_mesh
+from src.algo.replicates import group_replicates
+from src.algo.simplex import lattice_size, slice_to_simplex, project_to_axes
+from src.algo.parallel import DEFAULT_CHUNK_BYTES
+from src.algo.grid_export import DEFAULT_BLOCK_SIZE, export_table, lattice_blocks
+from src.algo.grid_store import GridStore, fingerprint
+from src.algo.history import Snapshot
+from src.algo.model_cache import ModelCache
+from src.algo.surface import find_optimum
+from src.algo.watch import merge_measurements
+from src.interface.components.slice_controls import SliceControls
+from src.interface.utils.data_processing import bounds_from_parameters
 from src.interface.utils.logger import gui_logger
+from src.interface.utils.profiler import profiler
+from src.interface.utils.rendering import (
+    draw_mesh_heatmap, draw_iso_lines, draw_desirable_region, render_in_background, visible_labels
+)
 
 class TernaryGraph(QWidget):
+    # Avancement de l'évaluation du modèle sur une grille : (blocs évalués, nombre de blocs)
+    evaluation_progress = pyqtSignal(int, int)
+
+    # Raffinement adaptatif de la heatmap : maillage initial de REFINE_LEVEL divisions par côté,
+    # triangles redécoupés (au plus REFINE_DEPTH fois) tant que le modèle y varie de plus de
+    # REFINE_TOL fois l'étendue des valeurs
+    REFINE_LEVEL = 16
+    REFINE_DEPTH = 3
+    REFINE_TOL = 0.02
+    COLORMAP = "viridis"
+    # Évaluation du modèle par blocs, en parallèle : mémoire de travail d'un bloc (octets) et
+    # nombre de threads (None : un par cœur)
+    EVAL_CHUNK_BYTES = DEFAULT_CHUNK_BYTES
+    EVAL_WORKERS = None
+    # Dossier des grilles évaluées conservées sur disque (None : cache utilisateur, voir grid_store_dir)
+    GRID_STORE_DIR = None
+    # Modèles ajustés gardés en mémoire avec leurs maillages évalués (annuler/rétablir sans réajuster)
+    FIT_CACHE_SIZE = 16
+    SCALE = 100  # Coordonnées du graphe : pourcentages
+    # Distance maximale (unités du graphe, échelle 100) entre le clic et un point sélectionné
+    PICK_RADIUS = 3
+    # Espacement minimal à l'écran (pixels) entre deux numéros de points ; les numéros masqués
+    # restent lisibles au survol
+    LABEL_SPACING = 20
+    # Valeur de `display` pour afficher la désirabilité globale plutôt qu'une réponse
+    DESIRABILITY = "desirability"
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -16,34 +62,73 @@ class TernaryGraph(QWidget):
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
-        # Créer une figure matplotlib standard
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-
         self._is_panning = False
         self._pan_start = None
+        view = self.create_view()
 
-        self.canvas.mpl_connect("button_press_event", self.on_mouse_press)
-        self.canvas.mpl_connect("button_release_event", self.on_mouse_release)
-        self.canvas.mpl_connect("motion_notify_event", self.on_mouse_move)
-        self.canvas.mpl_connect("scroll_event", self.on_scroll)
-        self.layout.addWidget(self.canvas)
+        # Choix de la coupe affichée (uniquement pour plus de 3 composants)
+        self.slice_controls = SliceControls()
+        self.slice_controls.view_changed.connect(self.on_view_changed)
+        self.slice_controls.setVisible(False)
+        self.layout.addWidget(self.slice_controls)
+        self.layout.addWidget(view)
+
+        # Lecture au survol : composition et valeur de la surface sous le curseur
+        self.hover_label = QLabel(" ")
+        self.layout.addWidget(self.hover_label)
 
         # Initialisation des données
-        self.points = []  # Liste des points ajoutés (ternary coordinates)
-        self.scores = []  # Liste des scores associés
+        self.points = []  # Liste des points ajoutés (proportions des k composants)
+        self.scores = []  # Liste des réponses associées (un tuple de M valeurs par point)
+        # Mesures de nouvelles compositions dont des réponses manquent encore (fichier surveillé)
+        self.pending_measurements = {}
+        self.response_names = ["Score"]  # Noms des M réponses
+        self.display = 0  # Surface affichée : indice de réponse, ou DESIRABILITY
+        self.desirability = None  # Objectifs de désirabilité (défaut : maximiser sur la plage observée)
         self.parameters = None  # Stockage des paramètres min/max/nom
-        self.R2_score = None  # Stockage du score R2
+        self.R2_score = None  # Stockage du score R2 (un par réponse)
         self.constraint_mask = None  # Stockage de la heatmap des contraintes
         self.polygon = None  # Stockage de l'enveloppe convexe pour les contraintes
+        self.n_components = 3  # Nombre de composants du mélange
+        self.view_axes = (0, 1, 2)  # Composants affichés sur le graphe
+        self.fixed = {}  # Proportions fixées des composants non affichés {index: proportion}
+        self.model = None  # Dernier interpolateur ajusté, réutilisé lors d'un changement de coupe
+        self.mesh = None  # Maillage adaptatif et valeurs du modèle sur la coupe courante
+        self._point_tree = None  # Arbre k-d des points projetés, reconstruit après chaque modification
+        self._hover_lookup = (None, None)  # (maillage, interpolateur linéaire sur ce maillage)
+        self.iso_levels = 8  # Nombre d'isolignes tracées sur la heatmap
+        self.desirable_range = (None, None)  # Seuils (min, max) de la zone souhaitable
+        self.optimum = None  # Dernier optimum trouvé : (composition, valeur)
+        self._labels = []  # Numéros de points affichés (seulement ceux retenus par visible_labels)
+        self._scatter = None  # Marqueurs des points, mis à jour sans redessiner le reste (update_points)
+        # Ajustements déjà calculés, indexés par l'empreinte des données : {clé: (modèle, R², {vue: maillage})}
+        self.fits = ModelCache(self.FIT_CACHE_SIZE)
 
         # Configuration initiale du graphe
         self.initialize_graph()
     
+    def create_view(self):
+        """Crée la zone de dessin (figure matplotlib) et connecte ses événements souris."""
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect("button_press_event", self.on_mouse_press)
+        self.canvas.mpl_connect("button_release_event", self.on_mouse_release)
+        self.canvas.mpl_connect("motion_notify_event", self.on_mouse_move)
+        self.canvas.mpl_connect("scroll_event", self.on_scroll)
+        self.canvas.mpl_connect("resize_event", self.on_resize)
+        return self.canvas
+
+    def refresh(self):
+        """Redessine la zone de dessin."""
+        self.canvas.draw()
+
     def set_initial_points(self, points):
         """Définir les points initiaux pour le graphe."""
-        self.points = points
-        self.scores = [0] * len(points)
+        self.points = [tuple(p) for p in points]
+        self.scores = [self.responses(0)] * len(points)
+        self.pending_measurements.clear()
+        self.model = None
+        self.mesh = None
         self.update_graph()
 
     def initialize_graph(self):
@@ -52,7 +137,7 @@ class TernaryGraph(QWidget):
         for ax in self.figure.axes:
             self.figure.delaxes(ax)
         self.ax = self.figure.add_subplot(111)
-        self.tax = ternary.TernaryAxesSubplot(ax=self.ax, scale=100)
+        self.tax = ternary.TernaryAxesSubplot(ax=self.ax, scale=self.SCALE)
 
         # Configuration du triangle
         self.tax.boundary(linewidth=2.0)
@@ -61,16 +146,18 @@ class TernaryGraph(QWidget):
         # Définir les labels des axes
         fontsize = 15
         if self.parameters is not None:
-            # Utiliser les noms des composants si disponibles
-            self.tax.left_axis_label(f'{self.parameters["component_3"]["name"]} (%)', fontsize=fontsize)
-            self.tax.right_axis_label(f'{self.parameters["component_2"]["name"]} (%)', fontsize=fontsize)
-            self.tax.bottom_axis_label(f'{self.parameters["component_1"]["name"]} (%)', fontsize=fontsize)
-
-            # TODO :Prendre en compte les contraintes min/max :
-            # -> Dessiner les lignes de contraintes pour chaque composant, dessinant ainsi un triangle intérieur
+            # Utiliser les noms des composants affichés si disponibles
+            names = [self.parameters[f"component_{axis + 1}"]["name"] for axis in self.view_axes]
+            self.tax.left_axis_label(f'{names[2]} (%)', fontsize=fontsize)
+            self.tax.right_axis_label(f'{names[1]} (%)', fontsize=fontsize)
+            self.tax.bottom_axis_label(f'{names[0]} (%)', fontsize=fontsize)
+
+            # Lignes des contraintes min/max de chaque composant, dans la coupe affichée
+            slice_min, slice_max = self.slice_bounds()
             for i in range(1, 4):
-                min_val = self.parameters[f"component_{i}"]["min"]
-                max_val = self.parameters[f"component_{i}"]["max"]
+                component = self.parameters[f"component_{self.view_axes[i-1] + 1}"]
+                min_val = slice_min[i-1] if component["min"] is not None else None
+                max_val = slice_max[i-1] if component["max"] is not None else None
                 if min_val is not None:
                     p1 = [None, None, None]
                     p2 = [None, None, None]
@@ -105,52 +192,452 @@ class TernaryGraph(QWidget):
         self.tax.clear_matplotlib_ticks()
 
         if self.R2_score is not None:
-            self.tax.set_title(f"R²: {self.R2_score:.2f}", fontsize=fontsize)
+            self.tax.set_title(self.r2_title(), fontsize=fontsize)
 
         self.canvas.draw()
 
-    def add_point(self, a, b, c, score):
-        """Ajoute un point au graphe avec un score associé."""
-        if not np.isclose(a + b + c, 1.0, atol=1e-2):
+    def r2_title(self):
+        """Titre du graphe : R² de chaque réponse ajustée."""
+        r2 = np.atleast_1d(self.R2_score)
+        if len(r2) == 1:
+            return f"R²: {r2[0]:.2f}"
+        return " | ".join(f"R² {name}: {value:.2f}" for name, value in zip(self.response_names, r2))
+
+    def responses(self, score):
+        """Réponses d'un point sous forme de tuple de M valeurs (une valeur seule est complétée par des 0)."""
+        values = np.zeros(len(self.response_names))
+        score = np.atleast_1d(np.asarray(score, dtype=float))[:len(values)]
+        values[:len(score)] = score
+        return tuple(values.tolist())
+
+    def set_responses(self, names):
+        """
+        Change la liste des réponses : les réponses conservées gardent leurs valeurs,
+        les nouvelles valent 0. Le modèle ajusté est invalidé.
+        """
+        previous = len(self.response_names)
+        self.response_names = list(names)
+        self.scores = [self.responses(score[:min(previous, len(names))]) for score in self.scores]
+        self.pending_measurements.clear()
+        self.display = 0
+        self.desirability = None
+        self.model = None
+        self.mesh = None
+        self.R2_score = None
+        self.update_graph()
+
+    def set_display(self, display):
+        """
+        Change la surface affichée (indice de réponse ou DESIRABILITY). Toutes les réponses
+        ayant été ajustées ensemble, le modèle est réutilisé sans réajustement.
+        """
+        self.display = display
+        self.optimum = None
+        if self.model is not None:
+            self.show_model()
+
+    def set_desirability(self, desirability):
+        """Change les objectifs de désirabilité ; la heatmap est recalculée si elle l'affiche."""
+        self.desirability = desirability
+        if self.display == self.DESIRABILITY and self.model is not None:
+            self.optimum = None
+            self.show_model()
+
+    def desirability_function(self):
+        """Désirabilité courante, ou par défaut maximisation de chaque réponse sur sa plage observée."""
+        if self.desirability is not None and len(self.desirability.goals) == len(self.response_names):
+            return self.desirability
+        scores = np.array(self.scores, dtype=float).reshape(-1, len(self.response_names))
+        return Desirability.from_data(scores)
+
+    def surface_values(self, predictions):
+        """
+        Valeurs de la surface affichée à partir des prédictions de toutes les réponses.
+        :param predictions: (N, M) prédictions (ou (N,) pour un modèle à une réponse).
+        """
+        predictions = np.asarray(predictions, dtype=float)
+        if predictions.ndim == 1:
+            return predictions
+        if self.display == self.DESIRABILITY:
+            return self.desirability_function()(predictions)
+        return predictions[:, self.display]
+
+    def add_point(self, point, score):
+        """Ajoute un point (proportions des k composants) au graphe avec ses réponses (une valeur ou M)."""
+        if not np.isclose(sum(point), 1.0, atol=1e-2):
             raise ValueError("Les proportions doivent totaliser 1.0")
-        self.points.append((a, b, c))
-        self.scores.append(score)
+        self.points.append(tuple(point))
+        self.scores.append(self.responses(score))
+        self.model = None
+        self.mesh = None
         self.update_graph()
 
-    def update_graph(self, hm=False):
-        """Met à jour l'affichage du graphe."""
+    @profiler.timeit("render.update_graph")
+    def update_graph(self, mesh=None):
+        """
+        Met à jour l'affichage du graphe.
+        :param mesh: Maillage adaptatif déjà évalué (AdaptiveMesh), affiché en heatmap.
+        """
+        # Les points ou leur projection ont pu changer : l'index spatial sera reconstruit au besoin
+        self._point_tree = None
+        self._labels = []
+        self._scatter = None
         self.initialize_graph()
-        if hm:
-            self.tax.heatmapf(hm, boundary=True, style="triangular")
+        if mesh is not None:
+            self.draw_heatmap(mesh)
+            self.draw_analysis(mesh)
 
-        # Ajouter les points au graphe
         if self.points:
-            scaled_points = [(p[0], p[1], p[2]) for p in self.points]
-            self.tax.scatter(scaled_points, marker='o', color='red', label="Points")
-            # Ajouter les numéros à côté de chaque point
-            for idx, pt in enumerate(scaled_points):
-                # Décaler légèrement le texte pour qu'il ne soit pas sur le point
-                offset = (2, 2, -4)  # Décalage arbitraire, à ajuster si besoin
-                self.tax.annotate(str(idx + 1), pt, fontsize=12, ha='left', va='bottom', color='black')
+            self.draw_points()
         self.canvas.draw()
 
+    def draw_points(self):
+        """Dessine les points projetés sur les 3 composants affichés, et leurs numéros."""
+        xy = self.point_tree().data
+        self._scatter = self.ax.scatter(xy[:, 0], xy[:, 1], marker='o', color='red', label="Points")
+        # Numéros des points : seulement ceux visibles et assez espacés à l'écran
+        self.draw_point_labels()
+
+    @profiler.timeit("render.update_points")
+    def update_points(self):
+        """
+        Redessin partiel après une modification des seuls points (aucun modèle affiché) : les
+        marqueurs et les numéros sont mis à jour, la grille, les contraintes et les axes restent.
+        """
+        self._point_tree = None
+        if self._scatter is None or not self.points:
+            self.update_graph(mesh=self.mesh)
+            return
+        self._scatter.set_offsets(self.point_tree().data)
+        self.draw_point_labels()
+        self.canvas.draw_idle()
+
+    def view_window(self):
+        """
+        Zone du graphe visible à l'écran.
+        :return: ((xmin, xmax), (ymin, ymax), taille d'un pixel en unités du graphe).
+        """
+        self.ax.apply_aspect()
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        bbox = self.ax.bbox
+        pixel_size = max(abs(xlim[1] - xlim[0]) / max(bbox.width, 1), abs(ylim[1] - ylim[0]) / max(bbox.height, 1))
+        return xlim, ylim, pixel_size
+
+    def visible_label_indices(self):
+        """Indices des points dont le numéro est affiché avec la vue courante."""
+        if not self.points:
+            return np.empty(0, dtype=int)
+        return visible_labels(self.point_tree().data, *self.view_window(), self.LABEL_SPACING)
+
+    def draw_point_labels(self):
+        """(Re)dessine les numéros des points pour la vue courante, à appeler après un zoom ou un déplacement."""
+        for label in self._labels:
+            label.remove()
+        xy = self.point_tree().data if self.points else ()
+        self._labels = [
+            self.ax.text(xy[index, 0], xy[index, 1], str(index + 1), fontsize=12, ha="left", va="bottom",
+                         color="black")
+            for index in self.visible_label_indices()
+        ]
+
     def interpolate(self, interpolator_cls):
         """Effectue une interpolation sur les points existants, uniquement dans la zone de contrainte."""
-        points = np.array(self.points)
-        scores = np.array(self.scores)
-        if len(self.points) < interpolator_cls.min_num_points:
-            gui_logger.log("Pas assez de points pour interpoler", level="warning")
+        points = np.array(self.points, dtype=float)
+        # (N, M) : toutes les réponses sont ajustées en une seule résolution
+        scores = np.array(self.scores, dtype=float).reshape(len(self.points), len(self.response_names))
+        if scores.shape[1] == 1:
+            scores = scores[:, 0]
+        # Les répétitions d'une même composition ne comptent qu'une fois ; les groupes sont
+        # repris tels quels par l'interpolateur
+        groups = group_replicates(points, scores)
+        if len(groups) < interpolator_cls.min_points(self.n_components):
+            gui_logger.log("Pas assez de compositions distinctes pour interpoler", level="warning")
             return None
 
-        interpolator = interpolator_cls(points, scores)
-        self.R2_score = interpolator.R2_score()
+        # Mêmes données et même interpolateur qu'un ajustement récent : il est réutilisé
+        key = ModelCache.key(interpolator_cls.__name__, points, scores)
+        entry = self.fits.get(key)
+        if entry is None:
+            with profiler.timed(f"fit.{interpolator_cls.__name__}"):
+                model = interpolator_cls(points, scores, groups=groups)
+                entry = self.fits.put(key, (model, model.R2_score(), {}))
+        self.model, self.R2_score = entry[:2]
+        self.optimum = None
+        return self.show_model()
+
+    def refit(self):
+        """
+        Réajuste le modèle courant (même interpolateur, réutilisé via `update`) sur les points
+        actuels et l'affiche.
+        """
+        scores = np.array(self.scores, dtype=float).reshape(len(self.points), len(self.response_names))
+        if scores.shape[1] == 1:
+            scores = scores[:, 0]
+        with profiler.timed(f"fit.{type(self.model).__name__}"):
+            # Copie : le modèle précédent reste dans le cache des ajustements
+            model = copy.copy(self.model)
+            model.update(np.array(self.points, dtype=float), scores)
+            self.model, self.R2_score, _ = self.fits.put(ModelCache.model_key(model), (model, model.R2_score(), {}))
+        self.optimum = None
+        return self.show_model()
+
+    def mesh_key(self):
+        """
+        Ce dont dépend le maillage évalué d'un modèle : coupe, surface affichée, contraintes et
+        raffinement. None pour la désirabilité, qui dépend aussi des objectifs.
+        """
+        if self.display == self.DESIRABILITY:
+            return None
+        bounds = bounds_from_parameters(self.parameters) if self.parameters is not None else None
+        return (
+            tuple(self.view_axes), tuple(sorted(self.fixed.items())), self.display,
+            bounds and tuple(tuple(np.round(b, 9).tolist()) for b in bounds),
+            self.REFINE_LEVEL, self.REFINE_DEPTH, self.REFINE_TOL,
+        )
 
-        constr_function = self.constraint_mask_function()
-        def heatmap_function(p):
-            score = interpolator(np.array(p)) if constr_function(p)==0 else np.nan
-            return float(score) if not np.isnan(score) else 0
-        self.update_graph(hm=heatmap_function)
-        self.canvas.draw()
+    def snapshot(self, label=""):
+        """État courant (points, réponses, modèle affiché), pour l'historique annuler/rétablir."""
+        return Snapshot(
+            self.points, self.scores, self.response_names,
+            model_key=ModelCache.model_key(self.model) if self.model is not None else None,
+            display=self.display, label=label,
+        )
+
+    def restore(self, snapshot):
+        """
+        Revient à un état de l'historique. Le modèle qui était affiché est repris du cache des
+        ajustements, avec ses maillages déjà évalués : la surface réapparaît sans réajustement.
+        :return: True si le modèle a été retrouvé (sinon il faut relancer l'interpolation).
+        """
+        self.points = list(snapshot.points)
+        self.scores = list(snapshot.scores)
+        self.response_names = list(snapshot.response_names)
+        self.display = snapshot.display
+        self.optimum = None
+        entry = self.fits.get(snapshot.model_key) if snapshot.model_key is not None else None
+        if entry is None:
+            self.model = None
+            self.mesh = None
+            self.R2_score = None
+            self.update_graph()
+            return False
+        self.model, self.R2_score = entry[:2]
+        self.show_model()
+        return True
+
+    def show_model(self):
+        """
+        Affiche la heatmap du modèle ajusté sur la coupe courante, sans réajustement.
+        :return: Valeurs aux sommets du maillage (nan hors de la zone de contrainte).
+        """
+        # Maillage déjà évalué pour ce modèle et cette vue (retour en arrière, coupe déjà vue) :
+        # réutilisé sans appel au modèle
+        entry = self.fits.get(ModelCache.model_key(self.model))
+        meshes, view = (entry[2] if entry is not None else {}), self.mesh_key()
+        self.mesh = meshes.get(view) if view is not None else None
+        if self.mesh is None:
+            # Évaluation sur le maillage adaptatif, séparée du rendu pour pouvoir les mesurer
+            with profiler.timed(f"grid.{type(self.model).__name__}"):
+                self.mesh = refine_mesh(
+                    lambda points: self.evaluate_slice(self.model, points),
+                    level=self.REFINE_LEVEL, max_depth=self.REFINE_DEPTH, tol=self.REFINE_TOL,
+                )
+            if view is not None:
+                meshes[view] = self.mesh
+        self.update_graph(mesh=self.mesh)
+        with profiler.timed("render.draw"):
+            self.refresh()
+        return self.mesh.values
+
+    def draw_heatmap(self, mesh):
+        """Dessine le maillage en un seul artiste (tripcolor), avec sa barre de couleurs."""
+        draw_mesh_heatmap(self.figure, self.ax, mesh, self.tax.get_scale(), self.COLORMAP)
+
+    def draw_analysis(self, mesh):
+        """
+        Superpose à la heatmap les isolignes, la zone souhaitable et l'optimum, calculés
+        à partir des valeurs déjà évaluées sur le maillage (le modèle n'est pas réévalué).
+        """
+        scale = self.tax.get_scale()
+        draw_iso_lines(self.ax, mesh, scale, self.iso_levels)
+        draw_desirable_region(self.ax, mesh, scale, *self.desirable_range)
+        if self.optimum is not None:
+            composition, value = self.optimum
+            projected = project_to_axes(np.atleast_2d(composition), self.view_axes)[0] * 100
+            self.tax.scatter([tuple(projected)], marker="*", s=250, color="gold",
+                             edgecolors="black", zorder=5, label=f"Optimum ({value:.3g})")
+
+    def set_analysis(self, iso_levels=None, desirable_range=None):
+        """Change les isolignes ou la zone souhaitable ; seul le rendu est refait."""
+        if iso_levels is not None:
+            self.iso_levels = iso_levels
+        if desirable_range is not None:
+            self.desirable_range = desirable_range
+        if self.mesh is not None:
+            self.update_graph(mesh=self.mesh)
+
+    def find_optimum(self, maximize=True):
+        """
+        Cherche l'optimum du modèle ajusté dans la zone de contrainte (toutes les composantes,
+        pas seulement la coupe affichée). Les départs de la recherche sont les meilleurs sommets
+        du maillage déjà évalué, complétés par des mélanges aléatoires admissibles.
+        :return: (composition, valeur) ou None si aucun modèle n'est ajusté.
+        """
+        if self.model is None:
+            gui_logger.log("Interpoler les points avant de chercher un optimum", level="warning")
+            return None
+        lower, upper = bounds_from_parameters(self.parameters) if self.parameters is not None \
+            else (np.zeros(self.n_components), np.ones(self.n_components))
+        seeds = None
+        if self.mesh is not None:
+            values = self.mesh.values
+            if np.isfinite(values).any():
+                ranked = np.argsort(-values if maximize else values)  # nan en dernier
+                best = ranked[:3][np.isfinite(values[ranked[:3]])]
+                seeds = slice_to_simplex(self.mesh.points[best], self.view_axes, self.fixed, self.n_components)
+        with profiler.timed("analysis.optimum"):
+            try:
+                self.optimum = find_optimum(
+                    lambda compositions: self.surface_values(self.model.predict(compositions)),
+                    lower, upper, seeds=seeds, maximize=maximize, seed=0,
+                )
+            except ValueError as e:
+                gui_logger.log("Recherche de l'optimum impossible :", e, level="warning")
+                return None
+        if self.mesh is not None:
+            self.update_graph(mesh=self.mesh)
+        return self.optimum
+
+    def component_names(self):
+        """Noms des k composants (noms par défaut tant que les paramètres ne sont pas saisis)."""
+        if self.parameters is None:
+            return [f"Composant {i + 1}" for i in range(self.n_components)]
+        return [self.parameters[f"component_{i + 1}"]["name"] for i in range(self.n_components)]
+
+    def grid_blocks(self, level, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Évalue toutes les réponses du modèle sur la grille uniforme de la coupe courante,
+        par blocs de lignes : seul un bloc de la grille existe à la fois en mémoire.
+        :param level: Nombre de divisions par côté du triangle.
+        :return: Générateur de blocs (B, k + M + 1) : compositions (%), réponses (nan hors
+                 contraintes) et masque (1 dans la zone de contrainte, 0 sinon).
+        """
+        n_responses = self.model.n_responses
+        for ternary_points in lattice_blocks(level, block_size):
+            compositions = slice_to_simplex(ternary_points, self.view_axes, self.fixed, self.n_components)
+            inside = self.feasible_mask(compositions)
+            predictions = np.full((len(compositions), n_responses), np.nan)
+            if inside.any():
+                predictions[inside] = self.predict_chunked(self.model, compositions[inside]).reshape(-1, n_responses)
+            yield np.column_stack((compositions * 100, predictions, inside))
+
+    def grid_columns(self):
+        """Colonnes de la grille évaluée : compositions (%), réponses et masque des contraintes."""
+        return [f"{name} (%)" for name in self.component_names()] + self.response_names + ["Dans les contraintes"]
+
+    def grid_key(self, level):
+        """Empreinte de la grille évaluée : modèle ajusté (type, points, réponses), coupe, contraintes et finesse."""
+        bounds = bounds_from_parameters(self.parameters) if self.parameters is not None else None
+        return fingerprint(
+            type(self.model).__name__, self.model.points, self.model.scores, self.view_axes,
+            sorted(self.fixed.items()), self.n_components, bounds and tuple(np.round(b, 9).tolist() for b in bounds),
+            self.grid_columns(), int(level),
+        )
+
+    def evaluated_grid(self, level):
+        """
+        Grille uniforme évaluée, conservée sur disque dans un fichier projeté en mémoire
+        (GridStore) : elle n'est jamais entière en mémoire, et une grille déjà évaluée pour le
+        même modèle et la même coupe est relue sans réévaluer le modèle, y compris d'une
+        session à l'autre.
+        :param level: Nombre de divisions par côté du triangle.
+        :return: GridStore en lecture seule.
+        """
+        with profiler.timed("grid.store"):
+            return GridStore.cached(
+                self.grid_key(level), self.grid_columns(), lattice_size(3, level),
+                lambda: self.grid_blocks(level), directory=self.GRID_STORE_DIR,
+                metadata={"level": int(level), "model": type(self.model).__name__,
+                          "view_axes": list(self.view_axes)},
+            )
+
+    def export_grid(self, path, level):
+        """
+        Exporte la grille évaluée (CSV, NPZ ou Parquet selon l'extension), lue par blocs
+        dans la grille conservée sur disque.
+        :return: Nombre de lignes écrites.
+        """
+        store = self.evaluated_grid(level)
+        with profiler.timed("io.export_grid"):
+            return export_table(path, store.columns, store.blocks(), n_rows=store.n_rows)
+
+    def render_image(self, path, dpi=300):
+        """
+        Exporte la heatmap courante dans une image haute résolution (PNG ou SVG), rendue hors
+        écran dans un thread de fond à partir du maillage déjà évalué.
+        :return: Future du rendu, ou None s'il n'y a pas de surface à exporter.
+        """
+        if self.mesh is None:
+            gui_logger.log("Interpoler les points avant d'exporter une image", level="warning")
+            return None
+        names = self.component_names()
+        return render_in_background(
+            path, self.mesh,
+            points=self.projected_points() if self.points else (),
+            axis_labels=[names[axis] for axis in self.view_axes],
+            title=self.r2_title() if self.R2_score is not None else None,
+            iso_levels=self.iso_levels, desirable_range=self.desirable_range,
+            colormap=self.COLORMAP, dpi=dpi,
+        )
+
+    def evaluate_slice(self, model, ternary_points):
+        """
+        Évalue un modèle sur des points de la coupe courante, en un seul appel vectorisé.
+        :param ternary_points: (N, 3) proportions sur les 3 composants affichés.
+        :return: Valeurs (nan hors de la zone de contrainte ou si le modèle n'est pas défini).
+        """
+        compositions = slice_to_simplex(ternary_points, self.view_axes, self.fixed, self.n_components)
+        values = np.full(len(compositions), np.nan)
+        inside = self.feasible_mask(compositions)
+        if inside.any():
+            values[inside] = self.surface_values(self.predict_chunked(model, compositions[inside]))
+        return values
+
+    def predict_chunked(self, model, compositions):
+        """
+        Évalue le modèle par blocs de taille bornée (EVAL_CHUNK_BYTES), répartis sur plusieurs threads ;
+        l'avancement est signalé par `evaluation_progress` après chaque bloc.
+        """
+        return model.predict_chunked(
+            compositions, chunk_bytes=self.EVAL_CHUNK_BYTES, max_workers=self.EVAL_WORKERS,
+            progress=self.evaluation_progress.emit,
+        )
+
+    def projected_points(self):
+        """Points projetés sur les 3 composants affichés, en pourcentages."""
+        return project_to_axes(np.array(self.points, dtype=float), self.view_axes) * 100
+
+    def on_view_changed(self):
+        """Change la coupe affichée ; le modèle déjà ajusté est réutilisé."""
+        self.view_axes = self.slice_controls.axes()
+        self.fixed = self.slice_controls.fixed()
+        if sum(self.fixed.values()) >= 1:
+            gui_logger.log("Les proportions fixées doivent totaliser moins de 100 %.", level="warning")
+            return
+        if self.model is not None:
+            self.show_model()
+        else:
+            self.update_graph()
+
+    def slice_bounds(self):
+        """
+        Bornes (min, max) des 3 composants affichés, en pourcentages de la coupe.
+        Pour 3 composants, ce sont directement les contraintes saisies.
+        """
+        lower, upper = bounds_from_parameters(self.parameters)
+        remaining = max(1.0 - sum(self.fixed.values()), 1e-9)
+        axes = list(self.view_axes)
+        return lower[axes] / remaining * 100, np.minimum(upper[axes] / remaining * 100, 100)
 
     def update_with_parameters(self, parameters):
         """
@@ -158,36 +645,71 @@ class TernaryGraph(QWidget):
         :param parameters: Dictionnaire contenant les valeurs min et max pour chaque composant.
         """
         self.parameters = parameters
+        k = parameters.get("n_components", 3)
+        if k != self.n_components:
+            self.n_components = k
+            self.model = None
+            self.mesh = None
+        names = [parameters[f"component_{i}"]["name"] for i in range(1, k + 1)]
+        self.slice_controls.set_components(names, *bounds_from_parameters(parameters))
+        self.slice_controls.setVisible(k > 3)
+        self.view_axes = self.slice_controls.axes()
+        self.fixed = self.slice_controls.fixed()
         self.update_graph()
         return self.polygon
     
 
-    def update_point(self, row, a, b, c, score):
-        """Met à jour un point existant dans le graphe."""
+    def update_point(self, row, point, score):
+        """Met à jour un point existant (proportions des k composants) dans le graphe."""
         if row < 0:
             gui_logger.log(f"Index de ligne invalide : {row}", level="error")
             return
         if row >= len(self.points):
             gui_logger.log(f"Detection d'un nouveau point : {row}")
-            self.points.append((a, b, c))
-            self.scores.append(score)
+            self.points.append(tuple(point))
+            self.scores.append(self.responses(score))
         else:
-            self.points[row] = (a, b, c)
-            self.scores[row] = score
+            self.points[row] = tuple(point)
+            self.scores[row] = self.responses(score)
+        self.model = None
+        self.mesh = None
         self.update_graph()
-    
+
+    def merge_measurements(self, points, scores):
+        """
+        Fusionne un lot de mesures (fichier surveillé) avec les points, par composition : une
+        composition déjà présente voit ses réponses remplacées, les autres sont ajoutées dès que
+        toutes leurs réponses sont connues (en attendant, dans pending_measurements).
+        Le graphe n'est redessiné qu'une fois pour tout le lot, et pas du tout si rien n'a changé.
+        Sans modèle, seuls les marqueurs et numéros des points sont redessinés ; avec un modèle,
+        il est réajusté sur tous les points et sa surface réévaluée, puisque chacune de ses
+        valeurs dépend de tous les points.
+        :param points: (P, k) compositions (proportions).
+        :param scores: (P, M) réponses (nan : valeur précédente conservée).
+        :return: (indices des points modifiés, indices des points ajoutés).
+        """
+        updated, added = merge_measurements(self.points, self.scores, points, scores, self.pending_measurements)
+        if not updated and not added:
+            return updated, added
+        if self.model is not None:
+            self.refit()
+        else:
+            self.update_points()
+        return updated, added
+
     def enable_click_callback(self, callback):
-        """Active le clic sur le graphe et appelle le callback avec les coordonnées ternaires."""
+        """Active le clic sur le graphe et appelle le callback avec la composition (k proportions) du point cliqué."""
         def on_click(event):
             if event.inaxes is None:
                 return
 
             x, y = event.xdata, event.ydata
-            x /= self.tax.get_scale()
-            y /= self.tax.get_scale()
+            x /= self.SCALE
+            y /= self.SCALE
             a, b, c = self.cartesian_to_ternary(x, y)
             if a is not None:
-                callback(a, b, c)
+                point = slice_to_simplex([(a, b, c)], self.view_axes, self.fixed, self.n_components)[0]
+                callback(tuple(point.tolist()))
 
         self.canvas.mpl_connect("button_press_event", on_click)
 
@@ -212,25 +734,14 @@ class TernaryGraph(QWidget):
         from ternary.helpers import project_point
         return [project_point(p) for p in points]
 
-    def constraint_mask_function(self):
+    def feasible_mask(self, points):
         """
-        Crée une fonction qui retourne 1 pour les zones en dehors des contraintes, 0 sinon.
-        Utilisée pour griser les zones invalides.
+        Indique, pour chaque composition (N, k), si elle respecte les contraintes min/max.
+        Utilisée pour ne pas afficher le modèle dans les zones invalides.
         """
         if self.parameters is None:
-            return lambda p: 0  # Pas de contrainte
-
-        def is_outside(p):
-            a, b, c = p
-            for i, comp in enumerate(['component_1', 'component_2', 'component_3']):
-                val = [a, b, c][i]
-                min_val = self.parameters[comp]["min"]
-                max_val = self.parameters[comp]["max"]
-                if (min_val is not None and val * 100 < min_val) or (max_val is not None and val * 100 > max_val):
-                    return 1
-            return 0
-
-        return is_outside
+            return np.ones(len(points), dtype=bool)  # Pas de contrainte
+        return is_feasible(points, *bounds_from_parameters(self.parameters))
 
     def draw_constraints_overlay(self):
         """
@@ -239,17 +750,12 @@ class TernaryGraph(QWidget):
         if self.parameters is None:
             return
 
-        constraints = self.parameters
-
-        def get_bound(c, which):
-            return constraints[c][which] if constraints[c][which] is not None else (0 if which == "min" else 100)
-
-        min1 = get_bound("component_1", "min")
-        max1 = get_bound("component_1", "max")
-        min2 = get_bound("component_2", "min")
-        max2 = get_bound("component_2", "max")
-        min3 = get_bound("component_3", "min")
-        max3 = get_bound("component_3", "max")
+        # Bornes dans la coupe affichée (contraintes saisies pour 3 composants)
+        (min1, min2, min3), (max1, max2, max3) = self.slice_bounds()
+        fixed_indices = list(self.fixed)
+        fixed_values = np.array(list(self.fixed.values()))
+        lower, upper = bounds_from_parameters(self.parameters)
+        fixed_ok = np.all((fixed_values >= lower[fixed_indices] - 1e-9) & (fixed_values <= upper[fixed_indices] + 1e-9))
 
         valid = []
         max1 = int(max1) or 100
@@ -261,22 +767,26 @@ class TernaryGraph(QWidget):
         for a in range(min1, max1 + 1):
             for b in range(min2, max2 + 1):
                 c = 100 - a - b
-                if min3 <= c <= max3 and a >= 0 and b >= 0 and c >= 0:
+                if min3 <= c <= max3 and a >= 0 and b >= 0 and c >= 0 and fixed_ok:
                     valid.append((a, b, c))
 
+        outer_triangle = [(0, 0, 100), (0, 100, 0), (100, 0, 0)]
+        outer_cart = self.ternary_to_cartesian(outer_triangle)
         if not valid:
+            # Coupe entièrement hors contraintes
+            self.ax.fill(*zip(*outer_cart), color='lightgrey', alpha=0.4, zorder=0)
             return
 
+        from scipy.spatial import ConvexHull, QhullError
         pts_2d = np.array([[p[0], p[1]] for p in valid])
         try:
             hull = ConvexHull(pts_2d)
             polygon = [valid[i] for i in hull.vertices]
             self.polygon = polygon
-        except:
+        except (QhullError, ValueError):
+            # Zone dégénérée (segment ou point) : les sommets sont tracés tels quels
             polygon = valid
 
-        outer_triangle = [(0, 0, 100), (0, 100, 0), (100, 0, 0)]
-        outer_cart = self.ternary_to_cartesian(outer_triangle)
         valid_cart = self.ternary_to_cartesian(polygon)
 
         # Dessiner le masque
@@ -318,8 +828,13 @@ class TernaryGraph(QWidget):
 
         ax.set_xlim(new_xlim)
         ax.set_ylim(new_ylim)
+        self.draw_point_labels()
         self.canvas.draw_idle()
 
+    def on_resize(self, event):
+        # La taille d'un pixel change : l'espacement des numéros aussi
+        self.draw_point_labels()
+
     def on_mouse_press(self, event):
         if event.button == 3:  # clic droit
             # Tentative de suppression de point si clic sur un point
@@ -334,6 +849,8 @@ class TernaryGraph(QWidget):
     def delete_point(self, index):
         self.points.pop(index)
         self.scores.pop(index)
+        self.model = None
+        self.mesh = None
         self.update_graph()
 
     def confirm_delete_point(self, index):
@@ -354,7 +871,10 @@ class TernaryGraph(QWidget):
             self._pan_start = None
 
     def on_mouse_move(self, event):
-        if not self._is_panning or event.xdata is None or event.ydata is None:
+        if event.xdata is None or event.ydata is None:
+            return
+        if not self._is_panning:
+            self.show_hover(event.xdata, event.ydata)
             return
 
         dx = self._pan_start[0] - event.xdata
@@ -365,18 +885,57 @@ class TernaryGraph(QWidget):
 
         self.ax.set_xlim(xlim[0] + dx, xlim[1] + dx)
         self.ax.set_ylim(ylim[0] + dy, ylim[1] + dy)
+        self.draw_point_labels()
         self.canvas.draw_idle()
 
         self._pan_start = (event.xdata, event.ydata)
     
+    def point_tree(self):
+        """Arbre k-d des points projetés sur la coupe (coordonnées du graphe), construit à la demande."""
+        if self._point_tree is None:
+            from scipy.spatial import cKDTree
+            projected = self.projected_points()
+            xy = np.column_stack((projected[:, 0] + projected[:, 1] / 2, projected[:, 1] * np.sqrt(3) / 2))
+            self._point_tree = cKDTree(xy)
+        return self._point_tree
+
     def find_closest_point_index(self, x, y):
-        if not self.points:
+        if not self.points or x is None or y is None:
             return None
+        distance, index = self.point_tree().query((x, y), distance_upper_bound=self.PICK_RADIUS)
+        return int(index) if np.isfinite(distance) else None
 
-        # Conversion des points ternaires en coordonnées cartésiennes pour comparaison
-        cart_points = self.ternary_to_cartesian([(a * 100, b * 100, c * 100) for a, b, c in self.points])
-        distances = [np.hypot(x - xp, y - yp) for xp, yp in cart_points]
-        min_dist = min(distances)
-        if min_dist < 3:  # Seuil de proximité en pixels
-            return distances.index(min_dist)
-        return None
\ No newline at end of file
+    def surface_at(self, x, y):
+        """
+        Valeur de la surface affichée en (x, y) (coordonnées du graphe), interpolée linéairement
+        sur le maillage déjà évalué : aucun appel au modèle. None hors de la surface.
+        """
+        mesh, lookup = self._hover_lookup
+        if mesh is not self.mesh:
+            from matplotlib.tri import Triangulation, LinearTriInterpolator
+            xy = self.mesh.cartesian(self.SCALE)
+            triangulation = Triangulation(xy[:, 0], xy[:, 1], self.mesh.triangles)
+            triangulation.set_mask(self.mesh.masked_triangles())
+            lookup = LinearTriInterpolator(triangulation, np.nan_to_num(self.mesh.values))
+            self._hover_lookup = (self.mesh, lookup)
+        value = lookup(x, y)
+        return None if np.ma.is_masked(value) else float(value)
+
+    def show_hover(self, x, y):
+        """Affiche la composition sous le curseur et, si une surface est affichée, sa valeur."""
+        a, b, c = self.cartesian_to_ternary(x / self.SCALE, y / self.SCALE)
+        if a is None:
+            self.hover_label.setText(" ")
+            return
+        composition = slice_to_simplex([(a, b, c)], self.view_axes, self.fixed, self.n_components)[0]
+        text = ", ".join(f"{name} {100 * value:.1f} %" for name, value in zip(self.component_names(), composition))
+        # Numéro du point survolé : seul moyen de le lire quand son étiquette est masquée
+        index = self.find_closest_point_index(x, y)
+        if index is not None:
+            text = f"Point {index + 1} : " + text
+        if self.mesh is not None:
+            value = self.surface_at(x, y)
+            if value is not None:
+                name = "Désirabilité" if self.display == self.DESIRABILITY else self.response_names[self.display]
+                text += f"  —  {name} : {value:.4g}"
+        self.hover_label.setText(text)
\ No newline at end of file
@@ -0,0 +1,302 @@
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QPolygonF, QBrush, QPen, QColor
+from PyQt5.QtWidgets import QGraphicsPolygonItem
+import numpy as np
+import pyqtgraph as pg
+from src.algo.constraints import feasible_vertices, order_polygon
+from src.algo.simplex import slice_to_simplex, project_to_axes
+from src.algo.surface import iso_lines, desirable_mask
+from src.interface.components.ternary_graph import TernaryGraph
+from src.interface.utils.data_processing import bounds_from_parameters
+from src.interface.utils.profiler import profiler
+
+SQRT3_OVER_2 = np.sqrt(3) / 2
+
+
+def to_view(points):
+    """(N, 3) points ternaires en pourcentages -> (N, 2) coordonnées du graphe (comme project_point)."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return np.column_stack((points[:, 0] + points[:, 1] / 2, points[:, 1] * SQRT3_OVER_2))
+
+
+class PyQtGraphTernaryGraph(TernaryGraph):
+    """
+    Graphe ternaire rendu avec pyqtgraph : la heatmap est rastérisée dans une ImageItem
+    (pixels hors du triangle ou des contraintes transparents), les points sont une
+    ScatterPlotItem, et le zoom/déplacement sont ceux de la ViewBox (molette, glisser).
+
+    Même interface publique que TernaryGraph (update_graph, interpolate, show_model,
+    enable_click_callback, ...) : seul le dessin change. L'export d'images reste fait
+    avec matplotlib (render_image), pour une qualité publication.
+    """
+    # Résolution de la rastérisation de la heatmap (pixels sur la largeur du triangle)
+    IMAGE_WIDTH = 500
+
+    def create_view(self):
+        """Crée la zone de dessin pyqtgraph et connecte ses événements souris."""
+        self.plot_widget = pg.PlotWidget(background="w")
+        # Même encombrement initial que le canevas matplotlib (figure de 640 x 480)
+        self.plot_widget.setMinimumSize(480, 480)
+        self.plot_item = self.plot_widget.getPlotItem()
+        self.plot_item.hideAxis("left")
+        self.plot_item.hideAxis("bottom")
+        self.plot_item.setMenuEnabled(False)
+        self.view_box = self.plot_item.getViewBox()
+        self.view_box.setAspectLocked(True)
+        self.view_box.setMenuEnabled(False)
+        self.color_bar = None
+        self._raster = None  # Heatmap rastérisée (valeurs), réutilisée pour la zone souhaitable
+        self._click_callback = None
+        scene = self.plot_widget.scene()
+        scene.sigMouseClicked.connect(self.on_scene_click)
+        scene.sigMouseMoved.connect(self.on_scene_move)
+        # Zoom, déplacement ou redimensionnement : les numéros de points affichés changent
+        self.view_box.sigRangeChanged.connect(self.on_range_changed)
+        return self.plot_widget
+
+    def refresh(self):
+        """pyqtgraph redessine la scène de lui-même."""
+
+    def initialize_graph(self):
+        """Trace le triangle, la grille, les graduations, les noms d'axes et les contraintes."""
+        self.plot_item.clear()
+        if self.color_bar is not None:
+            self.plot_item.layout.removeItem(self.color_bar)
+            self.color_bar.setParentItem(None)
+            self.color_bar = None
+        scale = self.SCALE
+        corners = to_view([(0, 0, scale), (scale, 0, 0), (0, scale, 0), (0, 0, scale)])
+
+        # Grille : tous les segments en un seul élément
+        ticks = np.arange(10, scale, 10)
+        segments = []
+        for t in ticks:
+            segments += [(t, 0, scale - t), (t, scale - t, 0),
+                         (0, t, scale - t), (scale - t, t, 0),
+                         (0, scale - t, t), (scale - t, 0, t)]
+        grid = to_view(segments)
+        self.plot_item.addItem(pg.PlotDataItem(grid[:, 0], grid[:, 1], connect="pairs",
+                                               pen=pg.mkPen((0, 0, 255, 90), width=0.5)))
+
+        if self.parameters is not None:
+            self.draw_constraints_overlay()
+        self.plot_item.addItem(pg.PlotDataItem(corners[:, 0], corners[:, 1], pen=pg.mkPen("k", width=2)))
+
+        # Graduations et noms des axes (mêmes conventions que python-ternary)
+        names = self.component_names()
+        names = [names[axis] for axis in self.view_axes] if self.parameters is not None else \
+            ["Composant 1", "Composant 2", "Composant 3"]
+        for t in np.arange(0, scale + 1, 10):
+            for point, anchor in (((t, 0, scale - t), (0.5, 0)), ((scale - t, t, 0), (0, 0.5)),
+                                  ((0, scale - t, t), (1, 0.5))):
+                label = pg.TextItem(f"{t:.0f}", color="k", anchor=anchor)
+                label.setPos(*to_view(point)[0])
+                self.plot_item.addItem(label)
+        for text, point, anchor in ((f"{names[0]} (%)", (scale / 2, -8, scale / 2 + 8), (0.5, 0)),
+                                    (f"{names[1]} (%)", (scale / 2 + 8, scale / 2, -8), (0, 0.5)),
+                                    (f"{names[2]} (%)", (-8, scale / 2, scale / 2 + 8), (1, 0.5))):
+            label = pg.TextItem(text, color="k", anchor=anchor)
+            label.setPos(*to_view(point)[0])
+            self.plot_item.addItem(label)
+
+        # Les textes ne comptent pas dans l'ajustement automatique : marge fixe pour les noms d'axes
+        self.view_box.setRange(xRange=(-0.2 * scale, 1.2 * scale), yRange=(-0.15 * scale, scale), padding=0)
+        self.plot_item.setTitle(self.r2_title() if self.R2_score is not None else None, color="k")
+
+    def draw_constraints_overlay(self):
+        """Grise le triangle hors de la zone de contrainte de la coupe et trace les bornes en pointillés."""
+        scale = self.SCALE
+        lower, upper = self.slice_bounds()
+        outer = to_view([(0, 0, scale), (scale, 0, 0), (0, scale, 0)])
+        self._add_polygon(outer, QColor(211, 211, 211, 100))
+
+        fixed_indices = list(self.fixed)
+        fixed_values = np.array(list(self.fixed.values()))
+        bounds = bounds_from_parameters(self.parameters)
+        fixed_ok = np.all((fixed_values >= bounds[0][fixed_indices] - 1e-9) &
+                          (fixed_values <= bounds[1][fixed_indices] + 1e-9))
+        vertices = feasible_vertices(lower / scale, upper / scale) if fixed_ok else np.empty((0, 3))
+        if len(vertices) >= 3:
+            polygon = order_polygon(vertices) * scale
+            self.polygon = [tuple(p) for p in polygon.tolist()]
+            self._add_polygon(to_view(polygon), QColor("white"))
+
+        # Bornes min/max saisies : une ligne par borne, parallèle au côté opposé au composant
+        segments = []
+        for i in range(3):
+            component = self.parameters[f"component_{self.view_axes[i] + 1}"]
+            for value, given in ((lower[i], component["min"]), (upper[i], component["max"])):
+                if given is None:
+                    continue
+                p1, p2 = [0.0] * 3, [0.0] * 3
+                p1[i], p1[(i + 1) % 3], p1[(i + 2) % 3] = value, 0, scale - value
+                p2[i], p2[(i + 1) % 3], p2[(i + 2) % 3] = value, scale - value, 0
+                segments += [p1, p2]
+        if segments:
+            lines = to_view(segments)
+            self.plot_item.addItem(pg.PlotDataItem(
+                lines[:, 0], lines[:, 1], connect="pairs", pen=pg.mkPen("r", width=2, style=Qt.DashLine)
+            ))
+
+    def _add_polygon(self, xy, color):
+        polygon = QGraphicsPolygonItem(QPolygonF([QPointF(x, y) for x, y in xy]))
+        polygon.setBrush(QBrush(color))
+        polygon.setPen(QPen(Qt.NoPen))
+        polygon.setZValue(-2)  # Sous la heatmap
+        self.plot_item.addItem(polygon)
+
+    @profiler.timeit("render.update_graph")
+    def update_graph(self, mesh=None):
+        """
+        Met à jour l'affichage du graphe.
+        :param mesh: Maillage adaptatif déjà évalué (AdaptiveMesh), affiché en heatmap.
+        """
+        # Les points ou leur projection ont pu changer : l'index spatial sera reconstruit au besoin
+        self._point_tree = None
+        self._labels = []
+        self._raster = None
+        self._scatter = None
+        self.initialize_graph()
+        if mesh is not None:
+            self.draw_heatmap(mesh)
+            self.draw_analysis(mesh)
+
+        if self.points:
+            self.draw_points()
+
+    def draw_points(self):
+        """Dessine les points projetés sur les 3 composants affichés, et leurs numéros."""
+        xy = self.point_tree().data
+        self._scatter = pg.ScatterPlotItem(xy[:, 0], xy[:, 1], **self.point_style())
+        self.plot_item.addItem(self._scatter)
+        self.draw_point_labels()
+
+    @staticmethod
+    def point_style():
+        # Redonné à chaque setData : le style passé à la création ne vaut que pour les premiers points
+        return {"size": 8, "brush": pg.mkBrush("r"), "pen": pg.mkPen(None)}
+
+    @profiler.timeit("render.update_points")
+    def update_points(self):
+        """Redessin partiel des seuls points : les données du nuage de points sont remplacées, la heatmap reste."""
+        self._point_tree = None
+        if self._scatter is None or not self.points:
+            self.update_graph(mesh=self.mesh)
+            return
+        xy = self.point_tree().data
+        self._scatter.setData(xy[:, 0], xy[:, 1], **self.point_style())
+        self.draw_point_labels()
+
+    def view_window(self):
+        """
+        Zone du graphe visible à l'écran.
+        :return: ((xmin, xmax), (ymin, ymax), taille d'un pixel en unités du graphe).
+        """
+        x_range, y_range = self.view_box.viewRange()
+        width, height = self.view_box.viewPixelSize()
+        return x_range, y_range, max(width, height)
+
+    def draw_point_labels(self):
+        """(Re)dessine les numéros des points pour la vue courante."""
+        for label in self._labels:
+            self.plot_item.removeItem(label)
+        xy = self.point_tree().data if self.points else ()
+        self._labels = []
+        for index in self.visible_label_indices():
+            label = pg.TextItem(str(index + 1), color="k", anchor=(0, 1))
+            label.setPos(*xy[index])
+            self.plot_item.addItem(label)
+            self._labels.append(label)
+
+    def on_range_changed(self, *_):
+        if hasattr(self, "_labels"):  # La vue peut changer avant la fin de __init__
+            self.draw_point_labels()
+
+    def raster(self, mesh, values=None):
+        """
+        Rastérise le maillage sur une grille régulière couvrant le triangle, par interpolation
+        linéaire des valeurs déjà évaluées (aucun appel au modèle).
+        :return: (valeurs (H, W) avec nan hors de la surface, rectangle (x, y, largeur, hauteur)).
+        """
+        from matplotlib.tri import Triangulation, LinearTriInterpolator
+        width = self.IMAGE_WIDTH
+        height = int(round(width * SQRT3_OVER_2))
+        xy = mesh.cartesian(self.SCALE)
+        triangulation = Triangulation(xy[:, 0], xy[:, 1], mesh.triangles)
+        triangulation.set_mask(mesh.masked_triangles())
+        lookup = LinearTriInterpolator(triangulation, np.nan_to_num(mesh.values if values is None else values))
+        x = (np.arange(width) + 0.5) * self.SCALE / width
+        y = (np.arange(height) + 0.5) * self.SCALE * SQRT3_OVER_2 / height
+        grid_x, grid_y = np.meshgrid(x, y)
+        image = lookup(grid_x, grid_y).filled(np.nan)
+        return image, (0, 0, self.SCALE, self.SCALE * SQRT3_OVER_2)
+
+    def draw_heatmap(self, mesh):
+        """Affiche la heatmap en une ImageItem RGBA (transparente hors de la surface), avec sa barre de couleurs."""
+        finite = mesh.values[np.isfinite(mesh.values)]
+        if len(finite) == 0:
+            return
+        image, rect = self.raster(mesh)
+        self._raster = image
+        vmin, vmax = finite.min(), finite.max()
+        colormap = pg.colormap.get(self.COLORMAP)
+        lut = colormap.getLookupTable(nPts=256, alpha=True)
+        levels = np.clip((image - vmin) / max(vmax - vmin, 1e-12), 0, 1)
+        rgba = lut[(np.nan_to_num(levels) * 255).astype(np.int64)]
+        rgba[~np.isfinite(image), 3] = 0
+        # ImageItem : premier indice = x ; la ligne 0 de la grille est en bas (y croissant)
+        item = pg.ImageItem(np.ascontiguousarray(rgba.transpose(1, 0, 2)))
+        item.setRect(*rect)
+        item.setZValue(-1)
+        self.plot_item.addItem(item)
+        self.color_bar = pg.ColorBarItem(values=(vmin, vmax), colorMap=colormap, interactive=False)
+        self.plot_item.layout.addItem(self.color_bar, 2, 5)
+
+    def draw_analysis(self, mesh):
+        """Isolignes (un seul élément), zone souhaitable hachurée et optimum, à partir du maillage évalué."""
+        if self.iso_levels:
+            segments, _ = iso_lines(mesh.cartesian(self.SCALE), mesh.triangles, mesh.values, self.iso_levels)
+            if len(segments):
+                lines = segments.reshape(-1, 2)
+                self.plot_item.addItem(pg.PlotDataItem(
+                    lines[:, 0], lines[:, 1], connect="pairs", pen=pg.mkPen((0, 0, 0, 150), width=1)
+                ))
+        low, high = self.desirable_range
+        if (low is not None or high is not None) and self._raster is not None:
+            inside = desirable_mask(self._raster, low, high)
+            rows, cols = np.indices(inside.shape)
+            hatch = inside & ((rows + cols) % 8 < 2)  # Hachures diagonales
+            rgba = np.zeros(inside.shape + (4,), dtype=np.uint8)
+            rgba[hatch] = (0, 0, 0, 200)
+            item = pg.ImageItem(np.ascontiguousarray(rgba.transpose(1, 0, 2)))
+            item.setRect(0, 0, self.SCALE, self.SCALE * SQRT3_OVER_2)
+            self.plot_item.addItem(item)
+        if self.optimum is not None:
+            composition, value = self.optimum
+            xy = to_view(project_to_axes(np.atleast_2d(composition), self.view_axes) * 100)
+            self.plot_item.addItem(pg.ScatterPlotItem(
+                xy[:, 0], xy[:, 1], symbol="star", size=20, brush=pg.mkBrush("gold"), pen=pg.mkPen("k")
+            ))
+
+    def enable_click_callback(self, callback):
+        """Active le clic gauche sur le graphe : callback(composition des k composants du point cliqué)."""
+        self._click_callback = callback
+
+    def on_scene_click(self, event):
+        position = self.view_box.mapSceneToView(event.scenePos())
+        x, y = position.x(), position.y()
+        if event.button() == Qt.RightButton:
+            index = self.find_closest_point_index(x, y)
+            if index is not None:
+                self.confirm_delete_point(index)
+            return
+        if event.button() != Qt.LeftButton or self._click_callback is None:
+            return
+        a, b, c = self.cartesian_to_ternary(x / self.SCALE, y / self.SCALE)
+        if a is not None:
+            point = slice_to_simplex([(a, b, c)], self.view_axes, self.fixed, self.n_components)[0]
+            self._click_callback(tuple(point.tolist()))
+
+    def on_scene_move(self, position):
+        position = self.view_box.mapSceneToView(position)
+        self.show_hover(position.x(), position.y())
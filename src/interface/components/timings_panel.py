@@ -0,0 +1,85 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer
+from datetime import datetime
+from src.interface.utils.profiler import profiler
+from src.interface.utils.logger import gui_logger
+
+COLUMNS = ["Opération", "Appels", "Dernier (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+KEYS = ["count", "last_ms", "p50_ms", "p95_ms", "max_ms"]
+
+
+class TimingsPanel(QWidget):
+    """Tableau des temps mesurés par le profileur, rafraîchi périodiquement."""
+
+    def __init__(self, parent=None, refresh_ms=1000):
+        super().__init__(parent)
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.reset_button = QPushButton("Réinitialiser")
+        self.export_json_button = QPushButton("Exporter JSON")
+        self.export_trace_button = QPushButton("Exporter trace Chrome")
+        for button in (self.reset_button, self.export_json_button, self.export_trace_button):
+            buttons_layout.addWidget(button)
+        self.layout.addLayout(buttons_layout)
+
+        self.reset_button.clicked.connect(profiler.reset)
+        self.export_json_button.clicked.connect(
+            lambda: self.export(profiler.export_json, "timings", "JSON Files (*.json)")
+        )
+        self.export_trace_button.clicked.connect(
+            lambda: self.export(profiler.export_chrome_trace, "trace", "Chrome Trace (*.json)")
+        )
+
+        # Rafraîchissement uniquement si de nouvelles mesures sont disponibles
+        self._shown_version = -1
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        """Met à jour le tableau si le panneau est visible et que les mesures ont changé."""
+        if not self.isVisible() or profiler.version == self._shown_version:
+            return
+        self._shown_version = profiler.version
+        stats = profiler.summary()
+        self.table.setRowCount(len(stats))
+        for row, (name, values) in enumerate(stats.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for col, key in enumerate(KEYS, start=1):
+                value = values[key]
+                item = QTableWidgetItem(str(value) if key == "count" else f"{value:.1f}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def export(self, export_function, prefix, file_filter):
+        """Exporte les mesures vers un fichier choisi par l'utilisateur."""
+        default_path = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exporter les mesures", default_path, file_filter)
+        if not file_path:
+            return  # L'utilisateur a annulé
+        try:
+            export_function(file_path)
+            gui_logger.log(f"Mesures exportées vers {file_path}")
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite lors de l'exportation : {e}")
+            gui_logger.log(f"Erreur lors de l'exportation des mesures : {e}", level="error")
@@ -1,28 +1,87 @@
-from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QSplitter, QMenu, QAction
+from PyQt5.QtWidgets import (
+    QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QSplitter, QMenu, QAction,
+    QFileDialog, QInputDialog, QMessageBox
+)
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
+import os
 import numpy as np
-from src.algo.points_lists import TypeIIIPlan
-from src.interface.components.parameters_panel import ParametersPanel, POINTS_LISTS
+from src.algo.constraints import feasible_vertices
+from src.algo.pseudo_components import pseudo_components
+from src.algo.design_cache import design_cache
+from src.algo.history import History
+from src.algo.registry import DESIGNS
+from src.algo.watch import parse_measurements
+from src.interface.components.parameters_panel import ParametersPanel, OPTIMAL_PLANS, SIMPLEX_PLANS
 from src.interface.components.ternary_graph import TernaryGraph
-from src.interface.components.scores_panel import ScoresPanel
+from src.interface.components.scores_panel import ScoresPanel, DESIRABILITY_LABEL, TABLE_FILE_FILTERS
+from src.interface.components.desirability_dialog import DesirabilityDialog
+from src.interface.utils.data_processing import bounds_from_parameters, with_file_extension
+from src.interface.utils.file_watcher import MeasurementWatcher
 from src.interface.utils.logger import gui_logger
+from src.interface.utils.profiler import profiler
+
+# Moteurs de rendu du graphe ternaire, choisis au démarrage
+GRAPH_BACKENDS = ("matplotlib", "pyqtgraph")
+
+
+def ternary_graph_class(backend="matplotlib"):
+    """
+    Classe du graphe ternaire pour un moteur de rendu. pyqtgraph n'est importé que s'il est choisi.
+    """
+    if backend == "pyqtgraph":
+        from src.interface.components.ternary_graph_pg import PyQtGraphTernaryGraph
+        return PyQtGraphTernaryGraph
+    if backend != "matplotlib":
+        raise ValueError(f"Moteur de rendu inconnu : {backend!r} (choix : {', '.join(GRAPH_BACKENDS)})")
+    return TernaryGraph
+
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, backend="matplotlib"):
         super().__init__()
         self.setWindowTitle("Outil de Graphe Ternaire")
+        self.designs = {}  # Plans d'expériences du registre déjà construits {nom: plan}
+        self.optimal_bounds = None  # Contraintes (min, max) pour lesquelles les plans optimaux sont construits
 
         # Création des composants
         self.parameters_panel = ParametersPanel(parent=self)
-        self.ternary_graph = TernaryGraph(parent=self)
+        self.ternary_graph = ternary_graph_class(backend)(parent=self)
         self.scores_panel = ScoresPanel()
+        self.watcher = MeasurementWatcher(parent=self)  # Fichier ou dossier de mesures surveillé
+        self.history = History()  # États précédents du plan d'expérience (annuler/rétablir)
+        self._restoring = False  # Vrai pendant un retour en arrière : les modifications ne sont pas enregistrées
 
         # Connexions
         self.scores_panel.add_button.clicked.connect(self.add_point_to_graph)
         self.scores_panel.points_table.cellChanged.connect(self.edit_point_in_graph)
         self.scores_panel.interpolate_button.clicked.connect(self.interpolate_graph)
+        self.scores_panel.iso_lines_input.valueChanged.connect(self.update_surface_analysis)
+        self.scores_panel.desirable_min_input.editingFinished.connect(self.update_surface_analysis)
+        self.scores_panel.desirable_max_input.editingFinished.connect(self.update_surface_analysis)
+        self.scores_panel.maximum_button.clicked.connect(lambda: self.find_optimum(maximize=True))
+        self.scores_panel.responses_changed.connect(self.on_responses_changed)
+        self.scores_panel.display_selector.currentTextChanged.connect(self.on_display_changed)
+        self.scores_panel.desirability_button.clicked.connect(self.edit_desirability)
+        self.scores_panel.export_grid_button.clicked.connect(self.export_grid)
+        self.scores_panel.export_image_button.clicked.connect(self.export_image)
+        self.scores_panel.minimum_button.clicked.connect(lambda: self.find_optimum(maximize=False))
+        self.scores_panel.watch_requested.connect(self.start_watch)
+        self.scores_panel.watch_stop_requested.connect(self.watcher.stop)
+        self.watcher.watching_changed.connect(self.on_watching_changed)
+        self.watcher.rows_read.connect(self.ingest_measurements)
         self.ternary_graph.enable_click_callback(self.update_score_inputs_from_graph_click)
+        self.ternary_graph.evaluation_progress.connect(self.show_evaluation_progress)
         self.parameters_panel.launch_plan_button.clicked.connect(self.launch_plan)
+        self.parameters_panel.n_components_input.valueChanged.connect(self.on_n_components_changed)
+
+        # Menu Édition : annuler/rétablir les modifications des points
+        edit_menu = self.menuBar().addMenu("Édition")
+        self.undo_action = edit_menu.addAction("Annuler", self.undo)
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.redo_action = edit_menu.addAction("Rétablir", self.redo)
+        self.redo_action.setShortcut(QKeySequence.Redo)
+        self.update_history_actions()
 
         self.scores_panel.points_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.scores_panel.points_table.customContextMenuRequested.connect(self.open_context_menu)
@@ -53,13 +112,14 @@ class MainWindow(QMainWindow):
         """Ajoute un point au graphe depuis le ScoresPanel."""
         point_data = self.scores_panel.get_point_data()
         if point_data:
-            x, y, z, score = point_data
-            self.ternary_graph.add_point(x/100, y/100, z/100, score)
-            self.scores_panel.update_points_table((x, y, z, score))
-            self.scores_panel.x_input.clear()
-            self.scores_panel.y_input.clear()
-            self.scores_panel.z_input.clear()
-            self.scores_panel.score_input.clear()
+            k = self.scores_panel.n_components
+            composition, scores = point_data[:k], point_data[k:]
+            self.record("Ajout d'un point")
+            self.ternary_graph.add_point([c/100 for c in composition], scores)
+            self.ignore_table_changes = True
+            self.scores_panel.update_points_table(point_data)
+            self.ignore_table_changes = False
+            self.scores_panel.clear_inputs()
             gui_logger.log("Point ajouté :", point_data)
     
     def edit_point_in_graph(self, row):
@@ -68,36 +128,280 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            x = float(self.scores_panel.points_table.item(row, 0).text())
-            y = float(self.scores_panel.points_table.item(row, 1).text())
-            z = float(self.scores_panel.points_table.item(row, 2).text())
-            score = float(self.scores_panel.points_table.item(row, 3).text())
-            self.ternary_graph.update_point(row, x, y, z, score)
-            gui_logger.log(f"Point modifié (ligne {row}) -> ({x}, {y}, {z}) score {score}")
+            k = self.scores_panel.n_components
+            table = self.scores_panel.points_table
+            composition = [float(table.item(row, col).text()) for col in range(k)]
+            scores = [float(table.item(row, k + j).text()) for j in range(self.scores_panel.n_responses)]
+            if row >= len(self.ternary_graph.points):
+                # Lignes ajoutées à la suite (import) : une seule étape d'annulation par import
+                self.record("Import de points", group=("import", self.scores_panel.import_count))
+            else:
+                self.record(f"Modification du point {row + 1}")
+            self.ternary_graph.update_point(row, [c/100 for c in composition], scores)
+            gui_logger.log(f"Point modifié (ligne {row}) -> {tuple(composition)} réponses {tuple(scores)}")
         except ValueError as e:
             gui_logger.log("Erreur lors de la modification du point :", e, level="warning")
         except AttributeError as e:
             pass
 
+    def record(self, label, group=None):
+        """
+        Enregistre l'état courant avant une modification, pour pouvoir l'annuler.
+        :param group: identifiant d'une même opération (un import) : ses modifications successives
+            forment une seule étape d'annulation.
+        """
+        if self._restoring:
+            return
+        self.history.record(self.ternary_graph.snapshot(label), group=group)
+        self.update_history_actions()
+
+    def update_history_actions(self):
+        """Active les actions Annuler/Rétablir et indique la modification concernée."""
+        for action, stack, text in ((self.undo_action, self.history.undo_stack, "Annuler"),
+                                    (self.redo_action, self.history.redo_stack, "Rétablir")):
+            action.setEnabled(bool(stack))
+            action.setText(f"{text} : {stack[-1].label}" if stack else text)
+
+    def undo(self):
+        snapshot = self.history.undo(self.ternary_graph.snapshot())
+        if snapshot is not None:
+            self.restore(snapshot, f"Annulé : {snapshot.label}")
+
+    def redo(self):
+        label = self.history.redo_stack[-1].label if self.history.can_redo else ""
+        snapshot = self.history.redo(self.ternary_graph.snapshot())
+        if snapshot is not None:
+            self.restore(snapshot, f"Rétabli : {label}")
+
+    def restore(self, snapshot, message):
+        """Revient à un état de l'historique : points, réponses et surface affichée (sans réajustement si possible)."""
+        self._restoring = True
+        try:
+            if list(snapshot.response_names) != self.scores_panel.response_names:
+                self.scores_panel.set_responses(snapshot.response_names)
+            refitted = self.ternary_graph.restore(snapshot)
+            self.ignore_table_changes = True
+            self.scores_panel.set_points([
+                [100 * x for x in point] + list(score) for point, score in zip(snapshot.points, snapshot.scores)
+            ])
+            self.ignore_table_changes = False
+            self.scores_panel.set_display(snapshot.display)
+        finally:
+            self._restoring = False
+        self.update_history_actions()
+        if snapshot.model_key is not None and not refitted:
+            message += " (relancer l'interpolation pour afficher la surface)"
+        gui_logger.log(message, level="user_action")
+
     def interpolate_graph(self):
         """Effectue une interpolation sur le graphe."""
         interpolated_scores = self.ternary_graph.interpolate(self.scores_panel.interpolator)
         if interpolated_scores is not None:
             gui_logger.log("Interpolation effectuée.")
+            self.log_fit_metrics()
+            self.log_lack_of_fit()
+
+    def log_fit_metrics(self):
+        """Qualité de l'ajustement de chaque réponse : R² ajusté, RMSE, MAE et PRESS (modèles linéaires en leurs coefficients)."""
+        metrics = {name: np.atleast_1d(value) for name, value in self.ternary_graph.model.fit_metrics().items()}
+        for i, name in enumerate(self.ternary_graph.response_names[:len(metrics["rmse"])]):
+            message = (f"Ajustement ({name}) : R² ajusté = {metrics['adjusted_r2'][i]:.3f}, "
+                       f"RMSE = {metrics['rmse'][i]:.3g}, MAE = {metrics['mae'][i]:.3g}")
+            if np.isfinite(metrics["press"][i]):
+                message += f", PRESS = {metrics['press'][i]:.3g}"
+            gui_logger.log(message)
+
+    def log_lack_of_fit(self):
+        """Test du manque d'ajustement du modèle contre l'erreur pure des répétitions, une ligne par réponse."""
+        model = self.ternary_graph.model
+        if not model.groups.has_replicates:
+            gui_logger.log("Manque d'ajustement non testable : aucune composition répétée.")
+            return
+        test = model.lack_of_fit()
+        if test["df_lack_of_fit"] <= 0:
+            gui_logger.log(f"Manque d'ajustement non testable : le modèle passe par chacune des "
+                           f"{len(model.groups)} compositions distinctes.")
+            return
+        for name, f, p_value in zip(self.ternary_graph.response_names, np.atleast_1d(test["f"]), np.atleast_1d(test["p_value"])):
+            gui_logger.log(
+                f"Manque d'ajustement ({name}) : F = {f:.3g} ({test['df_lack_of_fit']} et {test['df_pure_error']} ddl), "
+                f"p = {p_value:.3g}", level="warning" if p_value < 0.05 else "info",
+            )
+
+    def start_watch(self, path):
+        """Surveille un fichier CSV ou un dossier : ses lignes sont lues une fois, puis seulement les nouvelles."""
+        self.watcher.start(path)
+
+    def on_watching_changed(self, path):
+        self.scores_panel.set_watching(path)
+        if path:
+            gui_logger.log(f"Surveillance des mesures : {path}", level="user_action")
+        else:
+            gui_logger.log("Surveillance des mesures arrêtée.", level="user_action")
+
+    def ingest_measurements(self, batches):
+        """
+        Ajoute les lignes lues lors d'un passage de la surveillance : les mesures de tous les
+        fichiers sont fusionnées en une fois avec les points (par composition), de sorte que le
+        modèle n'est réajusté et le graphe redessiné qu'une fois ; seules les lignes concernées
+        du tableau sont ensuite mises à jour.
+        :param batches: liste de (chemin, en-tête, délimiteur, lignes), un élément par fichier.
+        """
+        k = self.scores_panel.n_components
+        compositions, responses, names = [], [], []
+        for path, header, delimiter, rows in batches:
+            name = os.path.basename(path)
+            if self.scores_panel.points_table.rowCount() == 0 and not names and len(header) > k:
+                # Comme à l'import, les colonnes du premier fichier donnent les réponses d'un tableau vide
+                self.scores_panel.set_responses([column.strip() or f"Réponse {j + 1}" for j, column in enumerate(header[k:])])
+            try:
+                points, scores, skipped = parse_measurements(header, rows, k, self.scores_panel.response_names, delimiter)
+            except ValueError as e:
+                gui_logger.log(f"Fichier surveillé ignoré ({name}) : {e}", level="warning")
+                continue
+            if skipped:
+                gui_logger.log(f"{name} : {skipped} lignes ignorées (valeurs invalides)", level="warning")
+            compositions.append(points)
+            responses.append(scores)
+            names.append(name)
+        if not names:
+            return
+        source = names[0] if len(names) == 1 else f"{len(names)} fichiers"
+        before = self.ternary_graph.snapshot(f"Mesures de {source}")
+        updated, added = self.ternary_graph.merge_measurements(np.concatenate(compositions), np.concatenate(responses))
+        if self.ternary_graph.pending_measurements:
+            gui_logger.log(f"{len(self.ternary_graph.pending_measurements)} compositions en attente de réponses manquantes")
+        if not updated and not added:
+            return
+        self.history.record(before)
+        self.update_history_actions()
+        table = self.scores_panel.points_table
+        self.ignore_table_changes = True
+        for row in updated + added:
+            point_data = [100 * x for x in self.ternary_graph.points[row]] + list(self.ternary_graph.scores[row])
+            if row < table.rowCount():
+                self.scores_panel.set_point_row(row, point_data)
+            else:
+                self.scores_panel.update_points_table(point_data)
+        self.ignore_table_changes = False
+        gui_logger.log(f"{source} : {len(added)} points ajoutés, {len(updated)} modifiés")
+
+    def show_evaluation_progress(self, done, total):
+        """Avancement de l'évaluation d'une grille fine dans la barre d'état (une grille d'un seul bloc n'est pas signalée)."""
+        if total <= 1:
+            return
+        status_bar = self.statusBar()
+        status_bar.showMessage(f"Évaluation du modèle : bloc {done}/{total}", 3000)
+        status_bar.repaint()
+
+    def on_responses_changed(self, names):
+        """Nouvelle liste de réponses : le graphe garde les valeurs des réponses conservées."""
+        self.record("Changement des réponses")
+        self.ternary_graph.set_responses(names)
+
+    def on_display_changed(self, text):
+        """Affiche une autre réponse, ou la désirabilité globale, sans réajuster le modèle."""
+        if not text:
+            return
+        names = self.scores_panel.response_names
+        display = self.ternary_graph.DESIRABILITY if text == DESIRABILITY_LABEL else names.index(text)
+        self.ternary_graph.set_display(display)
+
+    def edit_desirability(self):
+        """Ouvre la saisie des objectifs de désirabilité des réponses."""
+        dialog = DesirabilityDialog(
+            self.scores_panel.response_names, self.ternary_graph.desirability_function(), parent=self
+        )
+        if dialog.exec_():
+            self.ternary_graph.set_desirability(dialog.desirability)
+            gui_logger.log("Objectifs de désirabilité :", ", ".join(
+                f"{name} {goal} [{low:.4g}, {high:.4g}]" for name, goal, low, high in zip(
+                    self.scores_panel.response_names, dialog.desirability.goals,
+                    dialog.desirability.low, dialog.desirability.high,
+                )
+            ))
+
+    def export_grid(self):
+        """Exporte les réponses prédites sur une grille uniforme de la coupe courante."""
+        if self.ternary_graph.model is None:
+            gui_logger.log("Interpoler les points avant d'exporter la grille", level="warning")
+            return
+        level, ok = QInputDialog.getInt(
+            self, "Exporter la grille", "Nombre de divisions par côté du triangle :", 200, 10, 2000
+        )
+        if not ok:
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exporter la grille", "grille.csv", TABLE_FILE_FILTERS
+        )
+        if not file_path:
+            return
+        file_path = with_file_extension(file_path, selected_filter)
+        try:
+            n_rows = self.ternary_graph.export_grid(file_path, level)
+        except (ImportError, ValueError, OSError) as e:
+            QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite lors de l'exportation : {e}")
+            gui_logger.log(f"Erreur lors de l'exportation de la grille : {e}", level="error")
+            return
+        gui_logger.log(f"Grille exportée : {n_rows} points dans {file_path}")
+
+    def export_image(self):
+        """Exporte la heatmap en haute résolution ; le rendu se fait en arrière-plan."""
+        if self.ternary_graph.mesh is None:
+            gui_logger.log("Interpoler les points avant d'exporter une image", level="warning")
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exporter l'image", "heatmap.png", "PNG (*.png);;SVG (*.svg);;All Files (*)"
+        )
+        if not file_path:
+            return
+        file_path = with_file_extension(file_path, selected_filter)
+        self.ternary_graph.render_image(file_path)
+        gui_logger.log(f"Rendu de l'image en cours : {file_path}")
+
+    def update_surface_analysis(self):
+        """Applique le nombre d'isolignes et les seuils de la zone souhaitable au graphe."""
+        try:
+            desirable_range = self.scores_panel.get_desirable_range()
+        except ValueError:
+            gui_logger.log("Seuils de la zone souhaitable invalides", level="warning")
+            return
+        self.ternary_graph.set_analysis(self.scores_panel.iso_lines_input.value(), desirable_range)
+
+    def find_optimum(self, maximize=True):
+        """Cherche le maximum (ou le minimum) du modèle interpolé et l'affiche."""
+        result = self.ternary_graph.find_optimum(maximize)
+        if result is None:
+            return
+        composition, value = result
+        names = [self.ternary_graph.parameters[f"component_{i + 1}"]["name"] if self.ternary_graph.parameters
+                 else f"Comp{i + 1}" for i in range(len(composition))]
+        description = ", ".join(f"{name} {100 * x:.1f} %" for name, x in zip(names, composition))
+        kind = "Maximum" if maximize else "Minimum"
+        gui_logger.log(f"{kind} du modèle : {value:.4g} pour {description}")
+        # Pré-remplit la saisie d'un point avec la composition trouvée
+        self.update_score_inputs_from_graph_click(tuple(composition.tolist()))
 
     def update_graph_and_scores(self):
         """Met à jour le graphe ternaire et le panneau des scores en fonction des paramètres."""
         parameters = self.parameters_panel.get_parameters()
         gui_logger.log("Mise à jour avec les paramètres :", parameters)
-        polygon = self.ternary_graph.update_with_parameters(parameters)
+        self.ternary_graph.update_with_parameters(parameters)
         self.scores_panel.update_with_parameters(parameters)
-        self.update_hull(polygon)
+        self.update_hull(parameters)
+
+    def on_n_components_changed(self, k):
+        """Change le nombre de composants : le plan d'expérience en cours est réinitialisé."""
+        self.reset_experiment_plan()
+        # Les états précédents n'ont pas le même nombre de composants
+        self.history.clear()
+        self.update_history_actions()
+        self.update_graph_and_scores()
     
-    def update_score_inputs_from_graph_click(self, a, b, c):
-        """Met à jour les champs du ScoresPanel avec les coordonnées ternaires du clic."""
-        self.scores_panel.x_input.setText(f"{a*100:.1f}")
-        self.scores_panel.y_input.setText(f"{b*100:.1f}")
-        self.scores_panel.z_input.setText(f"{c*100:.1f}")
+    def update_score_inputs_from_graph_click(self, point):
+        """Met à jour les champs du ScoresPanel avec la composition du point cliqué."""
+        for component_input, value in zip(self.scores_panel.component_inputs, point):
+            component_input.setText(f"{value*100:.1f}")
         self.scores_panel.score_input.setFocus()
 
     def launch_plan(self):
@@ -105,62 +409,101 @@ class MainWindow(QMainWindow):
         selected_plan = self.parameters_panel.initial_points_selector.currentText()
         order = self.parameters_panel.plan_order.text()
         parameters = self.parameters_panel.get_parameters()
-        min_values = [parameters[f"component_{i}"]["min"] or 0 for i in range(1, 4)]
-        max_values = [parameters[f"component_{i}"]["max"] or 100 for i in range(1, 4)]
-        real_max_values = [min(max_values[i], 100 - min_values[(i+1)%3] - min_values[(i+2)%3]) for i in range(3)]
-        real_min_values = min_values # [min_values[i] + max_values[(i+1)%3] + max_values[(i+2)%3] for i in range(3)]
+        k = parameters["n_components"]
+        lower, upper = bounds_from_parameters(parameters)
         try:
             order = int(order) if order else 0
-            POINTS = POINTS_LISTS[selected_plan][3, order]
         except ValueError:
-            if POINTS_LISTS[selected_plan].order:
-                gui_logger.log("Ordre de configuration invalide", level="warning")
-                return
-        except AssertionError as e:
+            gui_logger.log("Ordre de configuration invalide", level="warning")
+            return
+        try:
+            with profiler.timed(f"design.{selected_plan}"):
+                POINTS = self.cached_design(selected_plan, k, order)
+                if selected_plan not in OPTIMAL_PLANS:
+                    # Plans du simplexe : les points sont des pseudo-composants
+                    transform = pseudo_components(lower, upper)
+        except (AssertionError, ValueError) as e:
             gui_logger.log("Erreur lors de la génération du plan d'expérience :", e, level="error")
             return
 
-        # update points coordinates with min and max values
-        points = [
-            [
-                (real_min_values[i] + (real_max_values[i] - real_min_values[i]) * p[i])/100 for i in range(3)
-            ]
-            for p in POINTS
-        ] if selected_plan != "Type III" else POINTS
-        points_data = [
-            (points[i][0], points[i][1], points[i][2], 0) for i in range(len(points))
-        ]
-        if selected_plan == "Type III":
-            X = np.array(points)
-            gui_logger.log("Score de l'algorithm de Fedorov (D-Optimality) :", np.linalg.det(X.T @ X))
+        # Passage des pseudo-composants aux proportions réelles (les points somment à 1)
+        points = transform.to_mixture(POINTS) if selected_plan not in OPTIMAL_PLANS else POINTS
+        if selected_plan in OPTIMAL_PLANS:
+            from src.algo.optimality import make_criterion, model_matrix
+            plan = self.design(selected_plan)
+            criterion = make_criterion(plan.criterion, plan.polygon, plan.degree)
+            gui_logger.log(
+                f"Score du plan {selected_plan} ({plan.criterion}-optimalité) :",
+                criterion.loss(model_matrix(points, plan.degree)),
+            )
+        self.record(f"Plan {selected_plan}")
         self.ternary_graph.set_initial_points(points)
         self.scores_panel.clear_scores_table()
-        for point in points_data:
-            point = (point[0] * 100, point[1] * 100, point[2] * 100, point[3])
-            self.scores_panel.update_points_table(point)
+        self.ignore_table_changes = True
+        for point in (points * 100).tolist():
+            self.scores_panel.update_points_table((*point, *[0] * self.scores_panel.n_responses))
+        self.ignore_table_changes = False
         gui_logger.log(f"Lancement du plan d'expérience : {selected_plan} avec ordre {order}")
         gui_logger.log("N'oubliez pas de modifier les scores dans le tableau !", level="user_action")
 
-    def update_hull(self, polygon):
-        self.polygon = polygon
-        # Si plus de 3 sommets, changer la liste de initial_points_selector du param_panel
-        if len(polygon) > 3:
-            POINTS_LISTS["Type III"] = TypeIIIPlan(polygon)
+    def design(self, name):
+        """
+        Plan d'expérience `name` du registre, importé et construit à la première utilisation.
+        Les plans optimaux sont construits pour les contraintes courantes (optimal_bounds).
+        """
+        if name not in self.designs:
+            factory = DESIGNS[name]
+            self.designs[name] = factory(*self.optimal_bounds) if name in OPTIMAL_PLANS else factory()
+        return self.designs[name]
+
+    def cached_design(self, selected_plan, k, order):
+        """
+        Plan d'expérience mémorisé dans le cache de plans.
+        Les plans optimaux (Type III) dépendent des contraintes et sont aussi conservés sur
+        disque d'une session à l'autre ; les autres ne dépendent que de (k, ordre).
+        """
+        plan = self.design(selected_plan)
+        if selected_plan in OPTIMAL_PLANS:
+            plan.criterion = self.parameters_panel.get_criterion()
+            key = design_cache.key(
+                f"{selected_plan} {plan.criterion}", k, bounds=plan.bounds, n_points=order, seed=plan.seed,
+                degree=plan.degree,
+            )
+            return design_cache.get(key, lambda: plan[k, order], persist=True)
+        key = design_cache.key(selected_plan, k, order=order if plan.order else None)
+        return design_cache.get(key, lambda: plan[k, order])
+
+    def update_hull(self, parameters):
+        k = parameters["n_components"]
+        lower, upper = bounds_from_parameters(parameters)
+        vertices = feasible_vertices(lower, upper)
+        self.polygon = vertices * 100
+        if len(vertices) == 0:
+            gui_logger.log("Les contraintes min/max ne laissent aucun mélange possible.", level="error")
+        # Si plus de k sommets (la zone n'est pas un simplexe), changer la liste de initial_points_selector du param_panel
+        if len(vertices) > k:
+            # Les plans optimaux ne sont reconstruits que si les contraintes ont changé
+            unchanged = (
+                self.optimal_bounds is not None and self.optimal_bounds[0].shape == lower.shape
+                and np.allclose(self.optimal_bounds, (lower, upper))
+            )
+            if not unchanged:
+                self.optimal_bounds = (lower, upper)
+                for name in OPTIMAL_PLANS:
+                    self.designs.pop(name, None)
             self.parameters_panel.initial_points_selector.clear()
-            self.parameters_panel.initial_points_selector.addItems(["Type III",])
+            self.parameters_panel.initial_points_selector.addItems(OPTIMAL_PLANS)
             self.parameters_panel.initial_points_selector.setCurrentText("Type III")
             self.parameters_panel.plan_order.setEnabled(True)
-            self.parameters_panel.initial_points_selector.setToolTip("Plan d'expérience Type III (D-optimalité)")
-            # Le champ d'ordre devient le nombre de points à garder grâce à l'algorithme de Fedorov
-            self.parameters_panel.plan_order.setPlaceholderText("Nombre de points à garder (algorithme de Fedorov)")
+            self.parameters_panel.initial_points_selector.setToolTip("Plan d'expérience Type III (plan optimal selon le critère choisi)")
+            # Le champ d'ordre devient le nombre de points du plan optimal
+            self.parameters_panel.plan_order.setPlaceholderText("Nombre de points du plan optimal")
             # Par défaut, on garde tous les points
         else:
-            # Revenir à la liste de points par défaut : remover Type III
-            if "Type III" in POINTS_LISTS:
-                del POINTS_LISTS["Type III"]
+            # Revenir aux plans du simplexe
             self.parameters_panel.plan_order.setEnabled(True)
             self.parameters_panel.initial_points_selector.clear()
-            self.parameters_panel.initial_points_selector.addItems(POINTS_LISTS.keys())
+            self.parameters_panel.initial_points_selector.addItems(SIMPLEX_PLANS)
     
     def open_context_menu(self, position):
         index = self.scores_panel.points_table.indexAt(position)
@@ -176,13 +519,17 @@ class MainWindow(QMainWindow):
 
     def on_point_deleted(self, index):
         gui_logger.log(f"Point supprimé (ligne {index})")
+        self.record(f"Suppression du point {index + 1}")
         self.ternary_graph.delete_point(index)
         self.scores_panel.delete_point(index)
     
     def reset_experiment_plan(self):
         """Réinitialise le plan d'expérience (vide le tableau et le graphique)."""
+        self.record("Réinitialisation du plan")
         self.ternary_graph.points = []
         self.ternary_graph.scores = []
+        self.ternary_graph.model = None
+        self.ternary_graph.mesh = None
         self.ternary_graph.update_graph()
         self.scores_panel.clear_scores_table()
         gui_logger.log("Plan d'expérience réinitialisé.", level="user_action")
\ No newline at end of file
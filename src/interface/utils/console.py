@@ -1,17 +1,49 @@
-from PyQt5.QtWidgets import QTextEdit
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor
+from PyQt5.QtCore import QTimer
 
-class SmartConsole(QTextEdit):
-    def __init__(self, parent=None):
+LEVEL_COLORS = {
+    "ERROR": "red",
+    "WARNING": "orange",
+    "INFO": "white",
+    "USER_ACTION": "yellow",  # pour clignotement
+}
+BACKGROUND_COLOR = "#1e1e1e"
+
+class SmartConsole(QPlainTextEdit):
+    """
+    Console en texte brut, bornée à `max_lines` lignes : les plus anciennes sont supprimées
+    automatiquement, de sorte que l'ajout d'un message reste en O(1) et la mémoire bornée.
+    """
+    def __init__(self, parent=None, max_lines=2000, blink_count=10, blink_interval=300):
         super().__init__(parent)
         self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+
+        self.formats = {}
+        for level, color in LEVEL_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self.formats[level] = text_format
+        self.hidden_format = QTextCharFormat()
+        self.hidden_format.setForeground(QColor(BACKGROUND_COLOR))
 
-        base_style = """
-            QTextEdit {
-                background-color: #1e1e1e;
+        # Un seul timer pour le clignotement du dernier message USER_ACTION
+        self.blink_count = blink_count
+        self._blink_block = None
+        self._blink_remaining = 0
+        self.blink_timer = QTimer(self)
+        self.blink_timer.setInterval(blink_interval)
+        self.blink_timer.timeout.connect(self._toggle_blink)
+
+        base_style = f"""
+            QPlainTextEdit {{
+                background-color: {BACKGROUND_COLOR};
                 color: white;
                 font-family: Consolas;
                 border: none;
-            }
+            }}
         """
 
         self.scrollbar_style_hidden = base_style + """
@@ -50,6 +82,60 @@ class SmartConsole(QTextEdit):
 
         self.setStyleSheet(self.scrollbar_style_hidden)
 
+    def append_records(self, records):
+        """
+        Ajoute un lot de messages [(message, niveau), ...] en une seule édition du document.
+        Le défilement suit la fin de la console uniquement si elle y était déjà.
+        """
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        blink_block = None
+        for message, level in records:
+            if not self.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(message, self.formats.get(level, self.formats["INFO"]))
+            if level == "USER_ACTION":
+                blink_block = cursor.block()
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+        if blink_block is not None:
+            self.blink(blink_block)
+
+    def blink(self, block):
+        """Fait clignoter un message en alternant sa couleur avec celle du fond."""
+        self._restore_blink_block()
+        self._blink_block = block
+        self._blink_remaining = self.blink_count
+        self.blink_timer.start()
+
+    def _toggle_blink(self):
+        block = self._blink_block
+        if block is None or not block.isValid() or self._blink_remaining <= 0:
+            # Fin du clignotement, ou ligne supprimée par la limite de taille
+            self._restore_blink_block()
+            self.blink_timer.stop()
+            return
+        visible = self._blink_remaining % 2 == 0
+        self._set_block_format(block, self.hidden_format if visible else self.formats["USER_ACTION"])
+        self._blink_remaining -= 1
+
+    def _restore_blink_block(self):
+        if self._blink_block is not None and self._blink_block.isValid():
+            self._set_block_format(self._blink_block, self.formats["USER_ACTION"])
+        self._blink_block = None
+
+    @staticmethod
+    def _set_block_format(block, text_format):
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        cursor.setCharFormat(text_format)
+
     def enterEvent(self, event):
         self.setStyleSheet(self.scrollbar_style_visible)
         super().enterEvent(event)
@@ -17,4 +17,26 @@ def cartesian_to_ternary(c_points):
     return np.column_stack((t1, t2, t3))
 
 def calculate_scores(points, weights):
-    return np.dot(points, weights)  # Example: weighted sum of points
\ No newline at end of file
+    return np.dot(points, weights)  # Example: weighted sum of points
+
+def bounds_from_parameters(parameters):
+    """
+    Bornes (min, max) des composants en proportions, à partir des paramètres du panneau.
+    Un min absent vaut 0 %, un max absent vaut 100 %.
+    """
+    k = parameters.get("n_components", 3)
+    lower = np.array([parameters[f"component_{i}"]["min"] or 0 for i in range(1, k + 1)], dtype=float)
+    upper = np.array([parameters[f"component_{i}"]["max"] or 100 for i in range(1, k + 1)], dtype=float)
+    return lower / 100, upper / 100
+
+def with_file_extension(path, selected_filter):
+    """
+    Ajoute au chemin choisi dans un QFileDialog l'extension du filtre sélectionné
+    (ex. "NumPy (*.npz)"), si l'utilisateur n'en a pas saisi.
+    """
+    import os
+    import re
+    if os.path.splitext(path)[1]:
+        return path
+    match = re.search(r"\*(\.\w+)", selected_filter or "")
+    return path + match.group(1) if match else path
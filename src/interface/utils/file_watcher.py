@@ -0,0 +1,59 @@
+import os
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from src.algo.watch import FolderTail
+from src.interface.utils.profiler import profiler
+
+__all__ = ["MeasurementWatcher"]
+
+
+class MeasurementWatcher(QObject):
+    """
+    Surveille un fichier CSV, ou les fichiers CSV d'un dossier, écrits par un instrument.
+
+    Les fichiers sont relus toutes les `interval` millisecondes, mais seules les lignes ajoutées
+    depuis la lecture précédente sont analysées (voir FolderTail). Les lignes de tous les fichiers
+    lus lors d'un même passage sont émises en un seul signal, de sorte que le modèle n'est
+    réajusté et le graphe redessiné qu'une fois par passage, quels que soient le débit d'écriture
+    et le nombre de fichiers du dossier.
+    """
+    # Lignes ajoutées lors d'un passage : liste de (chemin, en-tête, délimiteur, lignes), un par fichier
+    rows_read = pyqtSignal(list)
+    # Surveillance démarrée (chemin) ou arrêtée ("")
+    watching_changed = pyqtSignal(str)
+
+    def __init__(self, interval=1000, parent=None):
+        super().__init__(parent)
+        self.tail = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+
+    @property
+    def path(self):
+        return self.tail.path if self.tail is not None else ""
+
+    @property
+    def active(self):
+        return self.timer.isActive()
+
+    def start(self, path):
+        """Commence la surveillance : les lignes déjà présentes sont lues une fois, puis seules les nouvelles."""
+        self.tail = FolderTail(os.path.abspath(path))
+        self.timer.start()
+        self.watching_changed.emit(self.path)
+        self.poll()
+
+    def stop(self):
+        self.timer.stop()
+        self.tail = None
+        self.watching_changed.emit("")
+
+    def poll(self):
+        """Lit les lignes ajoutées depuis le passage précédent."""
+        if self.tail is None:
+            return
+        with profiler.timed("io.watch_poll"):
+            updates = self.tail.poll()
+        batches = [(tail.path, tail.header, tail.delimiter, rows) for tail, rows in updates if tail.header is not None]
+        if batches:
+            self.rows_read.emit(batches)
@@ -1,17 +1,46 @@
-from PyQt5.QtCore import QObject, pyqtSignal
+import threading
+from collections import deque
+from PyQt5.QtCore import QObject, QMetaObject, Qt, pyqtSignal, pyqtSlot
 
 __all__ = ["gui_logger"]
 
 class GuiLogger(QObject):
-    log_signal = pyqtSignal(str, str)
+    # Lot de messages [(message, niveau), ...], émis au plus une fois par tour de boucle d'événements
+    log_signal = pyqtSignal(list)
 
-    def __init__(self):
+    def __init__(self, max_pending=2000):
         super().__init__()
+        # Tampon circulaire : au-delà de max_pending messages en attente, les plus anciens sont perdus
+        self._pending = deque(maxlen=max_pending)
+        self._dropped = 0
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
 
     def log(self, *messages, level="INFO"):
         """Log messages to the GUI console."""
         message = " ".join(map(str, messages))
-        self.log_signal.emit(message, level.upper())
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((message, level.upper()))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        # Appel différé dans le thread du logger : tous les messages du tour courant sont regroupés
+        QMetaObject.invokeMethod(self, "flush", Qt.QueuedConnection)
+
+    @pyqtSlot()
+    def flush(self):
+        """Émet les messages en attente en un seul lot."""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._flush_scheduled = False
+        if dropped:
+            batch.insert(0, (f"... {dropped} messages non affichés", "WARNING"))
+        if batch:
+            self.log_signal.emit(batch)
 
 # Instance globale
-gui_logger = GuiLogger()
\ No newline at end of file
+gui_logger = GuiLogger()
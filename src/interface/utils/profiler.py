@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+__all__ = ["profiler"]
+
+
+class Profiler:
+    """
+    Mesure le temps des opérations critiques (ajustement, évaluation de grille, rendu,
+    génération de plans, entrées/sorties).
+
+    Les noms d'opérations sont hiérarchiques : la partie avant le premier point sert de
+    catégorie (ex. "fit.RBFInterpolator" -> catégorie "fit").
+    Pour chaque opération, les `window` dernières durées sont conservées pour calculer
+    les statistiques glissantes, et les `max_events` derniers événements sont gardés
+    pour l'export au format Chrome trace.
+    """
+
+    def __init__(self, window=200, max_events=10000):
+        self.window = window
+        self._durations = {}  # nom -> deque des dernières durées (s)
+        self._counts = {}  # nom -> nombre total d'appels
+        self._events = deque(maxlen=max_events)  # (nom, début, durée, thread)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.version = 0  # incrémenté à chaque mesure, pour rafraîchir l'affichage
+
+    @contextmanager
+    def timed(self, name):
+        """Gestionnaire de contexte mesurant la durée du bloc."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def timeit(self, name):
+        """Décorateur mesurant la durée de chaque appel de la fonction."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start, duration):
+        """Enregistre une mesure (début et durée en secondes, horloge perf_counter)."""
+        with self._lock:
+            if name not in self._durations:
+                self._durations[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+            self._durations[name].append(duration)
+            self._counts[name] += 1
+            self._events.append((name, start, duration, threading.get_ident()))
+            self.version += 1
+
+    def summary(self):
+        """
+        Statistiques par opération, triées par nom.
+
+        Returns:
+            dict: {nom: {"count", "last_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"}}
+            (les statistiques portent sur la fenêtre glissante, "count" sur tous les appels)
+        """
+        with self._lock:
+            snapshot = {name: (np.array(d), self._counts[name]) for name, d in self._durations.items()}
+        stats = {}
+        for name in sorted(snapshot):
+            durations, count = snapshot[name]
+            durations_ms = durations * 1000
+            p50, p95 = np.percentile(durations_ms, [50, 95])
+            stats[name] = {
+                "count": count,
+                "last_ms": float(durations_ms[-1]),
+                "mean_ms": float(durations_ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "max_ms": float(durations_ms.max()),
+            }
+        return stats
+
+    def reset(self):
+        """Efface toutes les mesures."""
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._events.clear()
+            self.version += 1
+
+    def export_json(self, path):
+        """Exporte les statistiques glissantes au format JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Exporte les derniers événements au format Chrome trace (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        trace = [
+            {
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in events
+        ]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+
+# Instance globale
+profiler = Profiler()
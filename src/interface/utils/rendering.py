@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from src.algo.surface import iso_lines, desirable_triangles
+from src.interface.utils.logger import gui_logger
+from src.interface.utils.profiler import profiler
+
+__all__ = [
+    "draw_mesh_heatmap",
+    "draw_iso_lines",
+    "draw_desirable_region",
+    "visible_labels",
+    "render_surface",
+    "render_in_background",
+]
+
+# Un seul thread de rendu : les exports d'images sont traités dans l'ordre, sans bloquer l'interface
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+
+
+def draw_mesh_heatmap(figure, ax, mesh, scale, colormap="viridis"):
+    """Dessine le maillage en un seul artiste (tripcolor), avec sa barre de couleurs."""
+    from matplotlib.tri import Triangulation
+    xy = mesh.cartesian(scale)
+    triangulation = Triangulation(xy[:, 0], xy[:, 1], mesh.triangles)
+    triangulation.set_mask(mesh.masked_triangles())
+    values = mesh.values[np.isfinite(mesh.values)]
+    if len(values) == 0:
+        return None
+    artist = ax.tripcolor(
+        triangulation, np.nan_to_num(mesh.values), shading="gouraud",
+        cmap=colormap, vmin=values.min(), vmax=values.max(),
+    )
+    figure.colorbar(artist, ax=ax)
+    return artist
+
+
+def draw_iso_lines(ax, mesh, scale, n_levels):
+    """Isolignes : tous les segments de tous les niveaux en un seul artiste."""
+    from matplotlib.collections import LineCollection
+    if not n_levels:
+        return None
+    segments, _ = iso_lines(mesh.cartesian(scale), mesh.triangles, mesh.values, n_levels)
+    if not len(segments):
+        return None
+    return ax.add_collection(LineCollection(segments, colors="black", linewidths=0.6, alpha=0.6, zorder=3))
+
+
+def draw_desirable_region(ax, mesh, scale, low=None, high=None):
+    """Zone souhaitable : triangles du maillage dont les sommets respectent les seuils, hachurés."""
+    from matplotlib.collections import PolyCollection
+    if low is None and high is None:
+        return None
+    inside = desirable_triangles(mesh.triangles, mesh.values, low, high)
+    if not inside.any():
+        return None
+    xy = mesh.cartesian(scale)
+    return ax.add_collection(PolyCollection(
+        xy[mesh.triangles[inside]], facecolors="none", edgecolors="none", hatch="///", zorder=3,
+    ))
+
+
+def visible_labels(xy, x_range, y_range, pixel_size, spacing):
+    """
+    Sélection des étiquettes de points à afficher (niveau de détail), sans boucle sur les points.
+
+    Seuls les points de la zone visible sont retenus, et au plus un par case de `spacing`
+    pixels : quand les points sont trop serrés à l'écran, le plus petit numéro de chaque case
+    est affiché et les autres sont masqués (ils réapparaissent en zoomant).
+    :param xy: Coordonnées des points dans le repère du graphe (N, 2).
+    :param x_range: Bornes (min, max) visibles en x ; `y_range` de même en y.
+    :param pixel_size: Taille d'un pixel écran, en unités du graphe.
+    :param spacing: Espacement minimal entre deux étiquettes, en pixels.
+    :return: Indices croissants des points à étiqueter.
+    """
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    inside = np.flatnonzero(
+        (xy[:, 0] >= min(x_range)) & (xy[:, 0] <= max(x_range)) &
+        (xy[:, 1] >= min(y_range)) & (xy[:, 1] <= max(y_range))
+    )
+    if len(inside) == 0 or not pixel_size > 0:
+        return inside
+    # Deuxième passe sur une grille décalée d'une demi-case : deux étiquettes proches de part
+    # et d'autre d'un bord de case ne restent pas toutes les deux
+    for offset in (0.0, 0.5):
+        cells = np.floor(xy[inside] / (spacing * pixel_size) + offset).astype(np.int64)
+        # np.unique renvoie la première occurrence de chaque case : le plus petit indice
+        _, first = np.unique(cells, axis=0, return_index=True)
+        inside = np.sort(inside[first])
+    return inside
+
+
+def render_surface(path, mesh, points=(), axis_labels=("Composant 1", "Composant 2", "Composant 3"),
+                   title=None, iso_levels=0, desirable_range=(None, None), colormap="viridis",
+                   dpi=300, size=(8, 7)):
+    """
+    Rendu hors écran d'une surface dans un fichier image (PNG, SVG, PDF selon l'extension).
+
+    La figure est créée avec le moteur Agg, indépendamment de la fenêtre Qt : la fonction
+    peut donc être appelée depuis un autre thread.
+    :param mesh: Maillage déjà évalué (AdaptiveMesh).
+    :param points: Points expérimentaux projetés sur la coupe, en pourcentages (N, 3).
+    :param axis_labels: Noms des 3 composants affichés (bas, droite, gauche).
+    :return: Chemin du fichier écrit.
+    """
+    import ternary
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=size)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    tax = ternary.TernaryAxesSubplot(ax=ax, scale=100)
+    tax.boundary(linewidth=2.0)
+    tax.gridlines(color="blue", multiple=10, linewidth=0.5)
+    tax.bottom_axis_label(f"{axis_labels[0]} (%)", fontsize=15)
+    tax.right_axis_label(f"{axis_labels[1]} (%)", fontsize=15)
+    tax.left_axis_label(f"{axis_labels[2]} (%)", fontsize=15)
+    tax.ticks(axis="lbr", linewidth=1, multiple=10)
+    tax.clear_matplotlib_ticks()
+    if title:
+        tax.set_title(title, fontsize=15)
+
+    scale = tax.get_scale()
+    draw_mesh_heatmap(figure, ax, mesh, scale, colormap)
+    draw_iso_lines(ax, mesh, scale, iso_levels)
+    draw_desirable_region(ax, mesh, scale, *desirable_range)
+    points = [tuple(p) for p in np.asarray(points, dtype=float).reshape(-1, 3).tolist()]
+    if points:
+        tax.scatter(points, marker="o", color="red")
+        for index, point in enumerate(points):
+            tax.annotate(str(index + 1), point, fontsize=12, ha="left", va="bottom", color="black")
+    # python-ternary ne place les noms d'axes qu'au dessin : à forcer avant l'enregistrement
+    tax._redraw_labels()
+    figure.savefig(path, dpi=dpi, format=os.path.splitext(path)[1][1:].lower() or "png")
+    return path
+
+
+def render_in_background(path, mesh, **kwargs):
+    """
+    Lance `render_surface` dans le thread de rendu ; la fin (ou l'échec) est signalée dans la console.
+    :return: Future du rendu.
+    """
+    def run():
+        with profiler.timed("io.render_image"):
+            return render_surface(path, mesh, **kwargs)
+
+    def done(future):
+        error = future.exception()
+        if error is not None:
+            gui_logger.log(f"Erreur lors du rendu de l'image {path} : {error}", level="error")
+        else:
+            gui_logger.log(f"Image exportée : {path}")
+
+    future = _render_executor.submit(run)
+    future.add_done_callback(done)
+    return future
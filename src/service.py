@@ -0,0 +1,425 @@
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from src.algo.model_cache import ModelCache
+from src.algo.registry import DESIGNS, INTERPOLATORS
+from src.algo.replicates import group_replicates
+
+__all__ = [
+    "MixPlanService",
+    "serve",
+    "main",
+]
+
+# Local JSON service: designs, fits and predictions over HTTP on the loopback interface,
+# for scripts and notebooks that do not need the GUI. Only the standard library is used
+# (asyncio streams), so the service runs offline with the application's own dependencies.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 2 ** 20
+# Largest grid returned by /grid (the response is one JSON document)
+MAX_GRID_POINTS = 1_000_000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+logger = logging.getLogger("mixplan.service")
+
+
+class RequestError(Exception):
+    """Invalid request, answered with an HTTP error status and a JSON {"error": message} body."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# Work run in the process pool: module-level functions, so that they can be pickled
+
+def generate_design(name, k, order, lower=None, upper=None, criterion="D"):
+    """
+    Points of a registered design, through the design cache (as in the GUI).
+
+    Constrained designs are built for the bounds; simplex designs are built in
+    pseudo-components and mapped back to the bounds when they are given, which requires the
+    bounded region to be a simplex (at most k vertices, as in the GUI).
+
+    Returns:
+        ndarray: (N, k) proportions, within the bounds
+
+    Raises:
+        ValueError: if the bounds leave no mixture, or are not a simplex for a simplex design
+    """
+    from src.algo.constraints import feasible_vertices, is_feasible
+    from src.algo.design_cache import design_cache
+    if lower is not None or upper is not None:
+        lower = np.zeros(k) if lower is None else np.asarray(lower, dtype=float)
+        upper = np.ones(k) if upper is None else np.asarray(upper, dtype=float)
+        vertices = feasible_vertices(lower, upper)
+        if len(vertices) == 0:
+            raise ValueError("The bounds leave no feasible mixture")
+        if len(vertices) > k and not DESIGNS.metadata(name).get("constrained"):
+            raise ValueError(
+                f"The bounds define a region with {len(vertices)} vertices, not a simplex: design {name!r} "
+                f"cannot cover it, use a constrained design ({', '.join(DESIGNS.names(constrained=True))})"
+            )
+    if DESIGNS.metadata(name).get("constrained"):
+        if lower is None or upper is None:
+            raise ValueError(f"Design {name!r} needs 'lower' and 'upper' bounds")
+        plan = DESIGNS[name](lower, upper)
+        plan.criterion = criterion
+        key = design_cache.key(f"{name} {plan.criterion}", k, bounds=plan.bounds, n_points=order, seed=plan.seed,
+                                degree=plan.degree)
+        points = np.array(design_cache.get(key, lambda: plan[k, order], persist=True))
+    else:
+        plan = DESIGNS[name]()
+        key = design_cache.key(name, k, order=order if plan.order else None)
+        points = np.array(design_cache.get(key, lambda: plan[k, order]), dtype=float)
+        if lower is not None:
+            from src.algo.pseudo_components import pseudo_components
+            points = pseudo_components(lower, upper).to_mixture(points)
+    if lower is not None and not is_feasible(points, lower, upper, tol=1e-6).all():
+        raise RuntimeError(f"Design {name!r} returned points outside the bounds")
+    return points
+
+
+def fit_model(name, points, scores):
+    """
+    Fit a registered interpolator.
+
+    Returns:
+        tuple: (fitted interpolator, R² of each response)
+    """
+    cls = INTERPOLATORS[name]
+    groups = group_replicates(points, scores)
+    if len(groups) < cls.min_points(points.shape[1]):
+        raise ValueError(f"{name} needs at least {cls.min_points(points.shape[1])} distinct compositions")
+    model = cls(points, scores, groups=groups)
+    model.prepare()
+    return model, np.atleast_1d(model.R2_score()).tolist()
+
+
+def _json_values(values):
+    """Array -> nested lists, with None where the value is not finite (JSON has no nan)."""
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def _array(payload, name, ndim, required=True):
+    if name not in payload:
+        if required:
+            raise RequestError(f"Missing field {name!r}")
+        return None
+    try:
+        array = np.asarray(payload[name], dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError(f"Field {name!r} must be numeric") from None
+    if array.ndim != ndim:
+        raise RequestError(f"Field {name!r} must have {ndim} dimension(s), got {array.ndim}")
+    return array
+
+
+class MixPlanService:
+    """
+    JSON endpoints of the service (HTTP/1.1, keep-alive):
+
+        GET  /health   status, cache statistics, available interpolators and designs
+        POST /design   {"design", "k", "order", "lower"?, "upper"?, "criterion"?} -> {"points"}
+        POST /fit      {"interpolator"?, "points", "scores"} -> {"model", "r2", "cached",
+                       "n_distinct", "metrics": {"adjusted_r2", "rmse", "mae", "press"},
+                       "lack_of_fit": {"f", "p_value", "df"}}
+        POST /predict  {"model", "points"} -> {"values"}; or the /fit fields plus
+                       {"at": points} to fit (or reuse) and predict in one request
+        POST /grid     {"model", "level", "lower"?, "upper"?} -> {"points", "values", "inside"}
+
+    Proportions are fractions (rows summing to 1). Predictions are batched: each request
+    evaluates all its points at once, and values are (P,) for one response or (P, R).
+    Designs and fits run in a process pool; predictions run in threads, on the warm models
+    of the ModelCache.
+
+    Parameters:
+        workers (int, optional): processes of the pool (default: one per core)
+        max_models (int): size of the model cache
+    """
+
+    def __init__(self, workers=None, max_models=32):
+        self.models = ModelCache(max_models)
+        # "spawn": worker processes do not inherit the event loop or its threads
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending_fits = {}  # key -> Future of a fit in progress (concurrent identical fits are merged)
+        self._connections = {}  # Task -> StreamWriter of the open connections
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/design"): self.design,
+            ("POST", "/fit"): self.fit,
+            ("POST", "/predict"): self.predict,
+            ("POST", "/grid"): self.grid,
+        }
+
+    async def close(self):
+        """Close the open connections (their handlers end normally), then the process pool."""
+        for writer in self._connections.values():
+            writer.close()
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=5)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def run_in_pool(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, partial(function, *args))
+
+    async def health(self, payload):
+        return {
+            "status": "ok",
+            "models": len(self.models),
+            "cache": {"hits": self.models.hits, "misses": self.models.misses},
+            "interpolators": {name: _jsonable(INTERPOLATORS.metadata(name)) for name in INTERPOLATORS.names()},
+            "designs": {name: _jsonable(DESIGNS.metadata(name)) for name in DESIGNS.names()},
+        }
+
+    async def design(self, payload):
+        name = payload.get("design")
+        if name not in DESIGNS:
+            raise RequestError(f"Unknown design {name!r}, expected one of {DESIGNS.names()}")
+        try:
+            k, order = int(payload.get("k", 3)), int(payload.get("order", 0))
+        except (TypeError, ValueError):
+            raise RequestError("Fields 'k' and 'order' must be integers") from None
+        lower, upper = _array(payload, "lower", 1, required=False), _array(payload, "upper", 1, required=False)
+        for bounds in (lower, upper):
+            if bounds is not None and len(bounds) != k:
+                raise RequestError(f"Bounds must have k = {k} values")
+        points = await self.run_in_pool(
+            generate_design, name, k, order,
+            None if lower is None else lower.tolist(), None if upper is None else upper.tolist(),
+            str(payload.get("criterion", "D")),
+        )
+        return {"design": name, "k": k, "points": _json_values(points)}
+
+    async def fitted(self, payload):
+        """Model of the dataset of `payload`, from the cache or fitted in the pool. Returns (key, model, r2, cached)."""
+        name = payload.get("interpolator", "RBF")
+        if name not in INTERPOLATORS:
+            raise RequestError(f"Unknown interpolator {name!r}, expected one of {INTERPOLATORS.names()}")
+        points = _array(payload, "points", 2)
+        scores = np.asarray(payload.get("scores"), dtype=float) if "scores" in payload else None
+        if scores is None or scores.ndim not in (1, 2) or len(scores) != len(points):
+            raise RequestError("Field 'scores' must hold one value (or one row of responses) per point")
+        key = ModelCache.key(name, points, scores)
+        entry = self.models.get(key)
+        if entry is not None:
+            return (key, *entry, True)
+        if key not in self._pending_fits:
+            self._pending_fits[key] = asyncio.ensure_future(self.run_in_pool(fit_model, name, points, scores))
+        try:
+            model, r2 = await asyncio.shield(self._pending_fits[key])
+        finally:
+            self._pending_fits.pop(key, None)
+        self.models.put(key, (model, r2))
+        return key, model, r2, False
+
+    async def fit(self, payload):
+        key, model, r2, cached = await self.fitted(payload)
+        test = model.lack_of_fit()
+        metrics = model.fit_metrics()
+        return {
+            "model": key, "r2": r2, "n_points": len(model.points), "n_distinct": len(model.groups), "cached": cached,
+            # One value per response (PRESS is null for the interpolating models)
+            "metrics": {name: _json_values(np.atleast_1d(metrics[name])) for name in ("adjusted_r2", "rmse", "mae", "press")},
+            # Lack-of-fit F-test against the pure error of the replicates (null when not defined)
+            "lack_of_fit": {
+                "f": _json_values(np.atleast_1d(test["f"])), "p_value": _json_values(np.atleast_1d(test["p_value"])),
+                "df": [test["df_lack_of_fit"], test["df_pure_error"]],
+            },
+        }
+
+    def cached_model(self, key):
+        entry = self.models.get(key)
+        if entry is None:
+            raise RequestError(f"Unknown model {key!r}: fit it first (POST /fit)", status=404)
+        return entry[0]
+
+    async def predict(self, payload):
+        if "model" in payload:
+            key, model = payload["model"], self.cached_model(payload["model"])
+            at = _array(payload, "points", 2)
+        else:
+            key, model, _, _ = await self.fitted(payload)
+            at = _array(payload, "at", 2)
+        if at.shape[1] != model.points.shape[1]:
+            raise RequestError(f"Points must have {model.points.shape[1]} components")
+        # Chunked evaluation on threads (NumPy releases the GIL): the model is not copied to another process
+        values = await asyncio.get_running_loop().run_in_executor(None, model.predict_chunked, at)
+        return {"model": key, "values": _json_values(values)}
+
+    async def grid(self, payload):
+        from src.algo.constraints import is_feasible
+        from src.algo.simplex import lattice_counts, lattice_size
+        model = self.cached_model(payload.get("model"))
+        k = model.points.shape[1]
+        try:
+            level = int(payload.get("level", 50))
+        except (TypeError, ValueError):
+            raise RequestError("Field 'level' must be an integer") from None
+        if level < 1 or lattice_size(k, level) > MAX_GRID_POINTS:
+            raise RequestError(f"Field 'level' must give between 1 and {MAX_GRID_POINTS} points")
+        lower = _array(payload, "lower", 1, required=False)
+        upper = _array(payload, "upper", 1, required=False)
+        lower = np.zeros(k) if lower is None else lower
+        upper = np.ones(k) if upper is None else upper
+
+        def evaluate():
+            points = lattice_counts(k, level) / level
+            inside = is_feasible(points, lower, upper)
+            values = np.full((len(points),) + ((model.n_responses,) if model.n_responses > 1 else ()), np.nan)
+            if inside.any():
+                values[inside] = model.predict_chunked(points[inside])
+            return points, values, inside
+
+        points, values, inside = await asyncio.get_running_loop().run_in_executor(None, evaluate)
+        return {"model": payload["model"], "level": level, "points": _json_values(points),
+                "values": _json_values(values), "inside": inside.tolist()}
+
+    async def dispatch(self, method, path, body):
+        """Run the endpoint of (method, path). Returns (status, JSON-serializable payload)."""
+        handler = self.routes.get((method, path))
+        if handler is None:
+            allowed = any(route_path == path for _, route_path in self.routes)
+            return (405, {"error": f"{method} not allowed on {path}"}) if allowed else \
+                (404, {"error": f"Unknown endpoint {path}"})
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise RequestError("The request body must be a JSON object")
+            return 200, await handler(payload)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+        except (ValueError, AssertionError, np.linalg.LinAlgError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            logger.exception("Error on %s %s", method, path)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle_connection(self, reader, writer):
+        """Minimal HTTP/1.1 server loop for one connection (JSON bodies with Content-Length)."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": f"Request body larger than {MAX_BODY_BYTES} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method.upper(), target.split("?")[0], body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Client gone or malformed request line: the connection is dropped
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+
+def _jsonable(metadata):
+    return {key: value for key, value in metadata.items() if isinstance(value, (str, int, float, bool, type(None)))}
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_models=32, ready=None):
+    """
+    Run the service until cancelled.
+
+    Parameters:
+        ready (callable, optional): called with the bound (host, port) once listening
+    """
+    service = MixPlanService(workers=workers, max_models=max_models)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    address = server.sockets[0].getsockname()[:2]
+    logger.info("MixPlan service listening on http://%s:%s", *address)
+    if ready is not None:
+        ready(address)
+    serving = asyncio.ensure_future(server.serve_forever())
+    try:
+        # SIGTERM stops the service like Ctrl+C, so that the worker processes are shut down too
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+    except (NotImplementedError, AttributeError):  # Windows
+        pass
+    try:
+        async with server:
+            await serving
+    except asyncio.CancelledError:
+        logger.info("MixPlan service stopped")
+    finally:
+        await service.close()
+
+
+def is_loopback(host):
+    """Whether every address that `host` resolves to is a loopback address."""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+
+def main(argv=None):
+    """Command line of `mixplan serve` (`python main.py serve`)."""
+    parser = argparse.ArgumentParser(prog="mixplan serve", description="Local JSON service of MixPlan (designs, fits, predictions)")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"listening address (default {DEFAULT_HOST}); must be a loopback address unless --allow-remote")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="allow a non-loopback --host: the service has no authentication, anyone who can reach "
+                             "the port can run designs and fits")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MIXPLAN_PORT", DEFAULT_PORT)),
+                        help=f"listening port (default {DEFAULT_PORT}, or MIXPLAN_PORT)")
+    parser.add_argument("--workers", type=int, default=None, help="processes for designs and fits (default: one per core)")
+    parser.add_argument("--max-models", type=int, default=32, help="fitted models kept in memory (default 32)")
+    arguments = parser.parse_args(argv)
+    remote = not is_loopback(arguments.host)
+    if remote and not arguments.allow_remote:
+        parser.error(f"--host {arguments.host} is not a loopback address: the service is local only "
+                     f"(pass --allow-remote to expose it anyway)")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if remote:
+        logger.warning("Listening on %s: the service has no authentication and is reachable from the network",
+                       arguments.host)
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.workers, arguments.max_models))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import pytest
+
+from src.algo.registry import INTERPOLATORS, Registry
+
+
+@pytest.mark.parametrize("name", INTERPOLATORS.names())
+def test_declared_point_counts_match_the_class(name):
+    """Les nombres de points déclarés (affichés sans importer la classe) sont ceux de la classe."""
+    declared = {key: INTERPOLATORS.metadata(name)[key] for key in ("min_points", "max_points")}
+    cls = INTERPOLATORS.entry(name).load()
+    assert declared == {"min_points": cls.min_points(3), "max_points": cls.max_num_points}
+
+
+def test_entries_are_imported_on_first_use():
+    registry = Registry("test")
+    entry = registry.register("Linear", "src.algo.interpolator:LinearInterpolator", min_points=3)
+    assert not entry.loaded and registry.metadata("Linear")["min_points"] == 3
+    assert registry["Linear"].__name__ == "LinearInterpolator" and entry.loaded
+    # Les métadonnées de la classe complètent et corrigent la déclaration
+    assert registry.metadata("Linear")["max_points"] is None
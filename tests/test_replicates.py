@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from src.algo.interpolator import LinearInterpolator, QuadraticInterpolator, RBFInterpolator
+from src.algo.replicates import group_replicates
+
+# Plan {3, 2} centré : 3 sommets, 3 milieux d'arêtes et le centre
+DESIGN = np.array([
+    [1, 0, 0], [0, 1, 0], [0, 0, 1],
+    [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5],
+    [1 / 3, 1 / 3, 1 / 3],
+])
+
+
+def replicated(design, repeats, seed=0):
+    """Plan dont le point i est mesuré repeats[i] fois, dans le désordre, avec une réponse bruitée."""
+    rng = np.random.default_rng(seed)
+    points = np.repeat(design, repeats, axis=0)
+    points = points[rng.permutation(len(points))]
+    scores = 3 * points[:, 0] + points[:, 1] * points[:, 2] * 8 + rng.normal(0, 0.1, len(points))
+    return points, scores
+
+
+def test_group_counts_and_means():
+    """Chaque composition forme un groupe : effectifs, moyennes et groupe de chaque observation."""
+    repeats = [3, 1, 2, 1, 1, 4, 2]
+    points, scores = replicated(DESIGN, repeats)
+    groups = group_replicates(points, scores)
+    assert len(groups) == len(DESIGN) and groups.n_observations == sum(repeats)
+    assert groups.df_pure_error == sum(repeats) - len(DESIGN) and groups.has_replicates
+    for g in range(len(groups)):
+        members = groups.inverse == g
+        assert members.sum() == groups.counts[g]
+        assert np.allclose(points[members], groups.points[g])
+        assert groups.means[g] == pytest.approx(scores[members].mean())
+    assert sorted(groups.counts) == sorted(repeats)
+    expected = sum(((scores[groups.inverse == g] - groups.means[g]) ** 2).sum() for g in range(len(groups)))
+    assert groups.ss_pure_error == pytest.approx(expected)
+
+
+def test_group_without_replicates_keeps_data():
+    points, scores = replicated(DESIGN, 1)
+    groups = group_replicates(points, scores)
+    assert not groups.has_replicates and groups.ss_pure_error == 0.0
+    assert groups.points is points and groups.means is scores
+    assert (groups.inverse == np.arange(len(points))).all()
+
+
+def test_near_duplicates_across_a_rounding_boundary():
+    """Deux compositions quasi identiques de part et d'autre d'un arrondi à 3 décimales sont un seul groupe."""
+    points = np.vstack(([[0.1004999, 0.4, 0.4995001], [0.1005001, 0.4, 0.4994999]], DESIGN[:3]))
+    scores = [1.0, 2.0, 3.0, 4.0, 5.0]
+    groups = group_replicates(points, scores)
+    assert len(groups) == 4 and sorted(groups.counts) == [1, 1, 1, 2]
+    # Sans points quasi confondus, le système RBF reste bien posé et passe par la moyenne
+    assert RBFInterpolator(points, scores)(points[0]) == pytest.approx(1.5)
+
+
+
+def test_chain_of_close_points_is_not_one_group():
+    """Six compositions espacées chacune de 0,7 tolérance ne forment pas un seul groupe large de 3,5 tolérances."""
+    step = 0.5e-3  # Distance entre voisins : step * sqrt(2)
+    chain = [[0.3 + i * step, 0.4, 0.3 - i * step] for i in range(6)]
+    points = np.vstack((chain, DESIGN[:3]))
+    groups = group_replicates(points, np.arange(len(points), dtype=float))
+    for g in range(len(groups)):
+        members = points[groups.inverse == g]
+        assert np.linalg.norm(members - members[0], axis=1).max() <= 1e-3
+    assert sorted(groups.counts) == [1, 1, 1, 2, 2, 2]
+
+
+def test_interpolator_reuses_given_groups():
+    points, scores = replicated(DESIGN, [3, 1, 2, 1, 1, 4, 2])
+    groups = group_replicates(points, scores)
+    assert LinearInterpolator(points, scores, groups=groups).groups is groups
+    assert RBFInterpolator(points, scores, groups=groups).groups is groups
+
+@pytest.mark.parametrize("cls", [LinearInterpolator, QuadraticInterpolator])
+def test_weighted_fit_on_means_equals_ols(cls):
+    """Les coefficients ajustés sur les moyennes pondérées sont ceux des moindres carrés sur toutes les mesures."""
+    points, scores = replicated(DESIGN, [3, 1, 2, 1, 1, 4, 2])
+    model = cls(points, scores)
+    ols = np.linalg.lstsq(model.model_matrix(points), scores, rcond=None)[0]
+    assert np.allclose(model.coeffs, ols)
+    # Plusieurs réponses : une colonne de coefficients par réponse
+    both = cls(points, np.column_stack((scores, 2 * scores)))
+    assert np.allclose(both.coeffs, np.column_stack((ols, 2 * ols)))
+
+
+def test_lack_of_fit_hand_computed():
+    """
+    Groupes A = {1, 3}, B = {4, 6, 8}, C = {5}, prédictions (2.5, 5, 5), 2 coefficients :
+    SS_pe = 2 + 8 = 10 (3 ddl), SS_lof = 2 * 0.5² + 3 * 1² = 3.5 (1 ddl), F = 3.5 / (10 / 3) = 1.05.
+    """
+    points = np.array([[1, 0, 0], [1, 0, 0], [0, 1, 0], [0, 1, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+    scores = np.array([1, 3, 4, 6, 8, 5], dtype=float)
+    groups = group_replicates(points, scores)
+    order = np.argsort(groups.means)  # A (2), C (5), B (6)
+    predictions = np.empty(3)
+    predictions[order] = [2.5, 5.0, 5.0]
+    test = groups.lack_of_fit(predictions, n_params=2)
+    assert test["ss_pure_error"] == pytest.approx(10.0) and test["df_pure_error"] == 3
+    assert test["ss_lack_of_fit"] == pytest.approx(3.5) and test["df_lack_of_fit"] == 1
+    assert test["f"] == pytest.approx(1.05)
+    # F(1, 3) est le carré d'une loi de Student à 3 ddl : p = P(|T| > sqrt(F)), de forme close
+    t = np.sqrt(1.05) / np.sqrt(3)
+    assert test["p_value"] == pytest.approx(1 - 2 / np.pi * (np.arctan(t) + t / (1 + t ** 2)))
+
+
+def test_lack_of_fit_splits_the_residuals():
+    """SS_res = SS_pe + SS_lof pour un modèle des moindres carrés, réponse par réponse."""
+    points, scores = replicated(DESIGN, [3, 1, 2, 1, 1, 4, 2])
+    responses = np.column_stack((scores, scores ** 2))
+    model = LinearInterpolator(points, responses)
+    test = model.lack_of_fit()
+    residuals = ((responses - model.predict(points)) ** 2).sum(axis=0)
+    assert np.allclose(residuals, test["ss_pure_error"] + test["ss_lack_of_fit"])
+    assert test["df_lack_of_fit"] == len(DESIGN) - 3 and test["f"].shape == (2,)
+    assert np.all((test["p_value"] >= 0) & (test["p_value"] <= 1))
+
+
+def test_lack_of_fit_undefined():
+    """Sans répétitions, ou pour un modèle qui passe par chaque composition, le test n'est pas défini."""
+    points, scores = replicated(DESIGN, 1)
+    assert np.isnan(QuadraticInterpolator(points, scores).lack_of_fit()["f"])
+    points, scores = replicated(DESIGN, 2)
+    test = RBFInterpolator(points, scores).lack_of_fit()
+    assert test["df_lack_of_fit"] == 0 and np.isnan(test["f"]) and np.isnan(test["p_value"])